@@ -11,8 +11,8 @@ st.set_page_config(
 st.title("🎾 Welcome to Tennis Player Management")
 st.markdown("### Your all-in-one solution for managing tennis players, training, and tournaments")
 
-# Create three columns for the main features
-col1, col2, col3 = st.columns(3)
+# Create four columns for the main features
+col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.markdown("### 👥 Player Management")
@@ -47,6 +47,17 @@ with col3:
     if st.button("Go to Tournament Calendar 🏆"):
         st.switch_page("pages/tournament.py")
 
+with col4:
+    st.markdown("### 📈 Load Monitoring")
+    st.write("""
+    - Track acute and chronic training load
+    - Monitor the acute:chronic workload ratio
+    - Spot monotony and strain peaks
+    - Review each player's load trend
+    """)
+    if st.button("Go to Load Monitoring 📈"):
+        st.switch_page("pages/load_monitoring.py")
+
 # Footer with additional information
 st.markdown("---")
 st.markdown("""
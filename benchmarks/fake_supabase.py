@@ -0,0 +1,50 @@
+"""In-process stand-in for the Supabase client, backed by SQLite.
+
+The app's queries go through the real postgrest-py request builder; only the
+HTTP transport is replaced (see :mod:`services.sqlite_postgrest`). Responses
+are capped at 1000 rows as on Supabase, and every request is recorded.
+"""
+import time
+from typing import NamedTuple
+
+from services.sqlite_postgrest import SQLiteClient, create_database, install_triggers, rebuild_training_summary
+
+# Supabase returns at most this many rows per request (PostgREST db-max-rows)
+MAX_ROWS = 1000
+
+__all__ = ['FakeSupabase', 'QueryRecord', 'create_database', 'install_triggers', 'rebuild_training_summary']
+
+
+class QueryRecord(NamedTuple):
+    method: str
+    table: str
+    rows: int
+    bytes: int
+    seconds: float
+
+
+class FakeSupabase(SQLiteClient):
+    """SQLite-backed client recording every request in ``requests``.
+
+    ``latency`` adds a fixed delay per request to model the round-trip to a
+    hosted database.
+    """
+
+    def __init__(self, conn=None, latency=0.0, max_rows=MAX_ROWS):
+        self.latency = latency
+        self.requests = []
+        super().__init__(conn or create_database(), max_rows)
+
+    def _handle(self, request):
+        started = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        response, rows = self._respond(request)
+        self.requests.append(QueryRecord(
+            request.method,
+            request.url.path.split('/rest/v1/', 1)[1],
+            rows,
+            len(response.content),
+            time.perf_counter() - started,
+        ))
+        return response
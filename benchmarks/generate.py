@@ -0,0 +1,181 @@
+"""Seeded synthetic data at realistic volumes for the benchmark database."""
+import json
+import uuid
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+
+from benchmarks.fake_supabase import create_database, install_triggers, rebuild_training_summary
+from services.repository import AGE_GROUPS, PLAYER_LEVELS
+
+
+class Tier(NamedTuple):
+    players: int
+    sessions: int
+    pse_scores: int
+    tournaments: int
+
+
+TIERS = {
+    'small': Tier(players=500, sessions=2_500, pse_scores=25_000, tournaments=250),
+    'medium': Tier(players=2_000, sessions=10_000, pse_scores=100_000, tournaments=1_000),
+    'large': Tier(players=10_000, sessions=50_000, pse_scores=500_000, tournaments=5_000),
+}
+
+# Data spans three years of history and the next three months
+HISTORY_DAYS = 3 * 365
+FUTURE_DAYS = 90
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Diogo', 'Eva', 'Filipe', 'Gabriela', 'Hugo', 'Ines', 'Joao',
+               'Lara', 'Miguel', 'Nuno', 'Olivia', 'Pedro', 'Rita', 'Sofia', 'Tiago', 'Vera', 'Xavier']
+LAST_NAMES = ['Silva', 'Santos', 'Ferreira', 'Pereira', 'Oliveira', 'Costa', 'Rodrigues', 'Martins',
+              'Jesus', 'Sousa', 'Fernandes', 'Goncalves', 'Gomes', 'Lopes', 'Marques', 'Alves']
+# Age in years at the middle of each age group
+AGE_GROUP_AGES = [9, 11, 13, 15, 17, 25]
+SESSION_TIMES = ['08:00:00', '10:00:00', '14:00:00', '16:00:00', '18:00:00', '19:30:00']
+FOCUS_AREAS = ['Technique', 'Fitness', 'Strategy', 'Mental Game', 'Match Practice']
+TOURNAMENT_TYPES = ['Singles', 'Doubles', 'Mixed']
+TOURNAMENT_LEVELS = ['Local', 'Regional', 'National', 'International']
+LOCATIONS = ['Lisboa', 'Porto', 'Braga', 'Coimbra', 'Faro', 'Funchal']
+
+# Share of the PSE scores recorded on individual training reports
+INDIVIDUAL_SHARE = 0.1
+REGISTRATIONS_PER_TOURNAMENT = 4
+
+
+def _ids(rng, count):
+    raw = rng.bytes(16 * count)
+    return [str(uuid.UUID(bytes=raw[start:start + 16], version=4)) for start in range(0, 16 * count, 16)]
+
+
+def _dates(start, offsets):
+    return [str(start + timedelta(days=int(offset))) for offset in offsets]
+
+
+def _insert(conn, table, columns, rows):
+    placeholders = ','.join('?' * len(columns))
+    conn.executemany(f'INSERT INTO "{table}" ({",".join(columns)}) VALUES ({placeholders})', rows)
+
+
+def populate(conn, tier: Tier, seed=0, today=None):
+    """Fill ``conn`` with ``tier`` volumes of players, sessions, reports, scores and tournaments.
+
+    The same ``seed`` and ``today`` always produce the same rows.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    first_day = today - timedelta(days=HISTORY_DAYS)
+    created_at = f'{first_day}T09:00:00+00:00'
+
+    # Players
+    player_ids = _ids(rng, tier.players)
+    first_names = rng.choice(FIRST_NAMES, tier.players)
+    last_names = rng.choice(LAST_NAMES, tier.players)
+    player_levels = rng.choice(PLAYER_LEVELS, tier.players, p=[0.35, 0.35, 0.2, 0.1])
+    age_group_codes = rng.integers(0, len(AGE_GROUPS), tier.players)
+    birth_offsets = np.array(AGE_GROUP_AGES)[age_group_codes] * 365 + rng.integers(0, 365, tier.players)
+    display_names = [f'{first} {last}' for first, last in zip(first_names, last_names)]
+    _insert(conn, 'players', ['id', 'first_name', 'last_name', 'birth_date', 'email', 'phone', 'level', 'age_group', 'notes', 'created_at'], [
+        (player_id, first, last, str(today - timedelta(days=int(offset))),
+         f'{first.lower()}.{last.lower()}.{index}@example.com', f'+351 9{index:08d}',
+         level, AGE_GROUPS[code], f'Joined the {level.lower()} programme', created_at)
+        for index, (player_id, first, last, offset, level, code)
+        in enumerate(zip(player_ids, first_names, last_names, birth_offsets, player_levels, age_group_codes))
+    ])
+
+    # Group sessions, most of them in the past
+    session_ids = _ids(rng, tier.sessions)
+    session_offsets = np.sort(rng.integers(0, HISTORY_DAYS + FUTURE_DAYS, tier.sessions))
+    session_dates = _dates(first_day, session_offsets)
+    session_levels = rng.choice(PLAYER_LEVELS, tier.sessions)
+    _insert(conn, 'group_training_sessions', ['id', 'date', 'time', 'level', 'max_participants', 'notes', 'created_at'], [
+        (session_id, session_date, time, level, int(capacity), '', created_at)
+        for session_id, session_date, time, level, capacity
+        in zip(session_ids, session_dates, rng.choice(SESSION_TIMES, tier.sessions), session_levels, rng.integers(6, 13, tier.sessions))
+    ])
+
+    # One individual plan for every other player
+    plan_count = tier.players // 2
+    plan_ids = _ids(rng, plan_count)
+    plan_players = rng.choice(tier.players, plan_count, replace=False)
+    plan_offsets = rng.integers(0, HISTORY_DAYS, plan_count)
+    _insert(conn, 'training_plans', ['id', 'player_id', 'start_date', 'end_date', 'focus_area', 'intensity', 'technical_goal', 'fitness_goal', 'tactical_goal', 'schedule', 'notes', 'created_at'], [
+        (plan_id, player_ids[player], str(first_day + timedelta(days=int(offset))), str(first_day + timedelta(days=int(offset) + 84)),
+         focus, int(intensity), 'Consistent backhand', 'Endurance', 'Net approaches', json.dumps({'days': ['Mon', 'Thu']}), '', created_at)
+        for plan_id, player, offset, focus, intensity
+        in zip(plan_ids, plan_players, plan_offsets, rng.choice(FOCUS_AREAS, plan_count), rng.integers(1, 6, plan_count))
+    ])
+
+    # A group report for every past session, with PSE scores from players of its level
+    past_sessions = np.flatnonzero(session_offsets <= HISTORY_DAYS)
+    group_scores = int(tier.pse_scores * (1 - INDIVIDUAL_SHARE))
+    report_ids = _ids(rng, len(past_sessions))
+    attendee_counts = rng.multinomial(group_scores, np.full(len(past_sessions), 1 / len(past_sessions)))
+    players_by_level = {level: np.flatnonzero(player_levels == level) for level in PLAYER_LEVELS}
+
+    ratings = rng.integers(1, 6, len(past_sessions))
+
+    score_rows, attendance_rows, report_rows = [], [], []
+    for report_id, session, count, rating in zip(report_ids, past_sessions, attendee_counts, ratings):
+        candidates = players_by_level[session_levels[session]]
+        # Drawn with replacement and deduplicated; the rare shortfall goes to individual reports
+        attendees = np.unique(candidates[rng.integers(0, len(candidates), count)]) if len(candidates) else candidates
+        report_rows.append((report_id, 'Group', session_ids[session], None, session_dates[session], int(rating),
+                            json.dumps([display_names[player] for player in attendees]), 'Good rally tolerance', '', '', created_at))
+        scores = rng.integers(1, 11, len(attendees))
+        score_rows.extend((player_ids[player], report_id, int(score), created_at) for player, score in zip(attendees, scores))
+        attendance_rows.extend((session_ids[session], player_ids[player], 'Present', created_at) for player in attendees)
+
+    # Individual reports, one score each, during their plan
+    individual_count = tier.pse_scores - len(score_rows)
+    individual_ids = _ids(rng, individual_count)
+    individual_plans = rng.integers(0, plan_count, individual_count)
+    individual_offsets = np.minimum(plan_offsets[individual_plans] + rng.integers(0, 84, individual_count), HISTORY_DAYS)
+    individual_ratings = rng.integers(1, 6, individual_count)
+    for report_id, plan, offset, score, rating in zip(individual_ids, individual_plans, individual_offsets, rng.integers(1, 11, individual_count), individual_ratings):
+        report_rows.append((report_id, 'Individual', None, plan_ids[plan], str(first_day + timedelta(days=int(offset))), int(rating),
+                            None, 'Improved serve toss', '', '', created_at))
+        score_rows.append((player_ids[plan_players[plan]], report_id, int(score), created_at))
+
+    _insert(conn, 'training_reports', ['id', 'training_type', 'session_id', 'training_plan_id', 'report_date', 'performance_rating', 'attendance', 'achievements', 'areas_for_improvement', 'coach_notes', 'created_at'], report_rows)
+    score_ids = _ids(rng, len(score_rows))
+    _insert(conn, 'player_pse_scores', ['id', 'player_id', 'report_id', 'pse_score', 'created_at'],
+            [(score_id, *row) for score_id, row in zip(score_ids, score_rows)])
+    attendance_ids = _ids(rng, len(attendance_rows))
+    _insert(conn, 'group_training_attendance', ['id', 'session_id', 'player_id', 'attendance_status', 'created_at'],
+            [(attendance_id, *row) for attendance_id, row in zip(attendance_ids, attendance_rows)])
+
+    # Tournaments of one to four days, with a few registrations each
+    tournament_ids = _ids(rng, tier.tournaments)
+    tournament_offsets = rng.integers(0, HISTORY_DAYS + FUTURE_DAYS, tier.tournaments)
+    durations = rng.integers(0, 4, tier.tournaments)
+    _insert(conn, 'tournaments', ['id', 'name', 'start_date', 'end_date', 'location', 'type', 'level', 'age_group', 'description', 'created_at'], [
+        (tournament_id, f'{location} Open {index}', str(first_day + timedelta(days=int(offset))), str(first_day + timedelta(days=int(offset + duration))),
+         location, kind, level, age_group, '', created_at)
+        for index, (tournament_id, offset, duration, location, kind, level, age_group) in enumerate(zip(
+            tournament_ids, tournament_offsets, durations, rng.choice(LOCATIONS, tier.tournaments),
+            rng.choice(TOURNAMENT_TYPES, tier.tournaments), rng.choice(TOURNAMENT_LEVELS, tier.tournaments), rng.choice(AGE_GROUPS, tier.tournaments)
+        ))
+    ])
+    registration_rows = [
+        (tournament_id, player_ids[player], created_at)
+        for tournament_id in tournament_ids
+        for player in rng.choice(tier.players, REGISTRATIONS_PER_TOURNAMENT, replace=False)
+    ]
+    registration_ids = _ids(rng, len(registration_rows))
+    _insert(conn, 'tournament_registrations', ['id', 'tournament_id', 'player_id', 'registration_date'],
+            [(registration_id, *row) for registration_id, row in zip(registration_ids, registration_rows)])
+    conn.commit()
+
+
+def build_database(tier: Tier, seed=0, today=None):
+    """A populated benchmark database, with the training summary built once after the bulk load."""
+    conn = create_database(with_triggers=False)
+    # Generated rows reference each other consistently; skip the per-row key checks
+    conn.execute('PRAGMA foreign_keys = OFF')
+    populate(conn, tier, seed, today)
+    conn.execute('PRAGMA foreign_keys = ON')
+    rebuild_training_summary(conn)
+    install_triggers(conn)
+    return conn
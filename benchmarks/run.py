@@ -0,0 +1,142 @@
+"""Benchmark app.py and every page against the SQLite stand-in at each scale tier.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --tier small --tier medium --page pages/players.py --latency 0.05
+
+For every page it reports the wall time of a cold run (empty caches) and of a
+warm rerun, the number of requests and rows each sent to the database, the
+requests a cold run left to prefetch in the background, and the peak Python
+memory of a cold run.
+"""
+import argparse
+import importlib
+import json
+import pkgutil
+import time
+import tracemalloc
+from pathlib import Path
+from typing import NamedTuple
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import services
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.generate import TIERS, build_database
+from services.page_data import wait_for_prefetch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PAGES = ['app.py', *sorted(f'pages/{path.name}' for path in (REPO_ROOT / 'pages').glob('*.py'))]
+
+# Large tiers can take a while on a cold run; AppTest defaults to 3 seconds
+RUN_TIMEOUT = 600
+
+
+class PageResult(NamedTuple):
+    tier: str
+    page: str
+    cold_seconds: float
+    warm_seconds: float
+    cold_queries: int
+    warm_queries: int
+    prefetch_queries: int
+    rows: int
+    kilobytes: float
+    peak_mb: float
+    errors: list
+
+
+def use_client(client):
+    # Every services module calls get_client through its own imported name
+    for module_info in pkgutil.iter_modules(services.__path__):
+        module = importlib.import_module(f'services.{module_info.name}')
+        if hasattr(module, 'get_client'):
+            module.get_client = lambda: client
+
+
+def _timed_run(app_test):
+    started = time.perf_counter()
+    app_test.run()
+    return time.perf_counter() - started
+
+
+def benchmark_page(tier_name, page, client) -> PageResult:
+    st.cache_data.clear()
+    app_test = AppTest.from_file(str(REPO_ROOT / page), default_timeout=RUN_TIMEOUT)
+    first_request = len(client.requests)
+    cold_seconds = _timed_run(app_test)
+    cold_requests = client.requests[first_request:]
+
+    # Background reads are not part of the cold run, nor should they land in the warm one
+    wait_for_prefetch()
+    prefetch_queries = len(client.requests) - first_request - len(cold_requests)
+
+    warm_request = len(client.requests)
+    warm_seconds = _timed_run(app_test)
+    warm_queries = len(client.requests) - warm_request
+    errors = [str(element.value) for element in [*app_test.exception, *app_test.error]]
+
+    # Memory is measured on a separate cold run, as tracing slows everything down
+    st.cache_data.clear()
+    tracemalloc.start()
+    try:
+        AppTest.from_file(str(REPO_ROOT / page), default_timeout=RUN_TIMEOUT).run()
+        wait_for_prefetch()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return PageResult(
+        tier_name,
+        page,
+        cold_seconds,
+        warm_seconds,
+        len(cold_requests),
+        warm_queries,
+        prefetch_queries,
+        sum(request.rows for request in cold_requests),
+        sum(request.bytes for request in cold_requests) / 1024,
+        peak / 1024 ** 2,
+        errors,
+    )
+
+
+def print_results(results):
+    header = f"{'tier':8} {'page':28} {'cold s':>8} {'warm s':>8} {'queries':>8} {'warm q':>7} {'bg q':>5} {'rows':>8} {'kB':>9} {'peak MB':>8}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        print(
+            f"{result.tier:8} {result.page:28} {result.cold_seconds:8.2f} {result.warm_seconds:8.2f} "
+            f"{result.cold_queries:8} {result.warm_queries:7} {result.prefetch_queries:5} {result.rows:8} {result.kilobytes:9.1f} {result.peak_mb:8.1f}"
+        )
+        for error in result.errors:
+            print(f"{'':8} ! {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pages against synthetic data.")
+    parser.add_argument('--tier', action='append', choices=list(TIERS), help="scale tier to run (repeatable, default all)")
+    parser.add_argument('--page', action='append', choices=PAGES, help="page to run (repeatable, default all)")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every database request")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for tier_name in args.tier or list(TIERS):
+        started = time.perf_counter()
+        client = FakeSupabase(build_database(TIERS[tier_name], args.seed), latency=args.latency)
+        print(f"{tier_name}: built {TIERS[tier_name]} in {time.perf_counter() - started:.1f}s")
+        use_client(client)
+        for page in args.page or PAGES:
+            results.append(benchmark_page(tier_name, page, client))
+
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([result._asdict() for result in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
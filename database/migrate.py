@@ -0,0 +1,151 @@
+"""Apply the numbered SQL migrations in database/migrations.
+
+Usage:
+    python database/migrate.py [status|up] [--target VERSION] [--database-url URL]
+
+The connection string is read from --database-url or the DATABASE_URL
+environment variable (a local .env file is loaded). Applied versions are
+recorded in the schema_migrations table, and each migration runs in its own
+transaction.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Arbitrary key for pg_advisory_lock so that two runners never interleave
+MIGRATION_LOCK_ID = 7_240_118
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(4) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class Migration:
+    def __init__(self, path):
+        match = MIGRATION_FILE.match(path.name)
+        self.path = path
+        self.version = match.group(1)
+        self.name = match.group(2)
+        self.sql = path.read_text()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def __repr__(self):
+        return f"{self.version}_{self.name}"
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    migrations = [Migration(path) for path in sorted(directory.glob('*.sql')) if MIGRATION_FILE.match(path.name)]
+    versions = [migration.version for migration in migrations]
+    duplicates = sorted({version for version in versions if versions.count(version) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate migration versions: {', '.join(duplicates)}")
+    return migrations
+
+
+def applied_migrations(conn):
+    """Checksums of the applied migrations keyed by version."""
+    with conn, conn.cursor() as cur:
+        cur.execute(CREATE_MIGRATIONS_TABLE)
+        cur.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(cur.fetchall())
+
+
+def pending_migrations(conn, migrations, target=None):
+    applied = applied_migrations(conn)
+    for migration in migrations:
+        if migration.version in applied and applied[migration.version] != migration.checksum:
+            print(f"warning: {migration} changed after it was applied", file=sys.stderr)
+    return [
+        migration for migration in migrations
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(conn, migrations, target=None):
+    """Apply pending migrations up to ``target`` (inclusive) and return them."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+    conn.commit()
+    try:
+        pending = pending_migrations(conn, migrations, target)
+        for migration in pending:
+            # `with conn` commits on success and rolls back the whole file on error
+            with conn, conn.cursor() as cur:
+                cur.execute(migration.sql)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum)
+                )
+            print(f"applied {migration}")
+        return pending
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+
+
+def print_status(conn, migrations):
+    applied = applied_migrations(conn)
+    for migration in migrations:
+        if migration.version not in applied:
+            state = 'pending'
+        elif applied[migration.version] != migration.checksum:
+            state = 'changed'
+        else:
+            state = 'applied'
+        print(f"{state:8} {migration}")
+
+
+def rebuild_training_summary(conn):
+    # Recomputes player_training_summary from the raw scores (migration 0004)
+    with conn, conn.cursor() as cur:
+        cur.execute("SELECT rebuild_player_training_summary()")
+        bucket_rows = cur.fetchone()[0]
+    print(f"rebuilt player_training_summary: {bucket_rows} rows")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the numbered SQL migrations.")
+    parser.add_argument('command', nargs='?', choices=['status', 'up', 'rebuild-summary'], default='up')
+    parser.add_argument('--target', help="last version to apply, e.g. 0002")
+    parser.add_argument('--database-url', help="Postgres connection string (defaults to DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    database_url = args.database_url or os.getenv('DATABASE_URL')
+    if not database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    try:
+        import psycopg2
+    except ImportError:
+        parser.error("the migration runner needs psycopg2 (pip install psycopg2-binary)")
+
+    migrations = discover_migrations()
+    conn = psycopg2.connect(database_url)
+    try:
+        if args.command == 'status':
+            print_status(conn, migrations)
+        elif args.command == 'rebuild-summary':
+            rebuild_training_summary(conn)
+        elif not migrate(conn, migrations, args.target):
+            print("database is up to date")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+-- Indexes for the foreign keys the app filters on
+CREATE INDEX IF NOT EXISTS idx_training_reports_session_id ON training_reports (session_id);
+CREATE INDEX IF NOT EXISTS idx_training_reports_training_plan_id ON training_reports (training_plan_id);
+CREATE INDEX IF NOT EXISTS idx_player_pse_scores_report_id ON player_pse_scores (report_id);
+CREATE INDEX IF NOT EXISTS idx_player_pse_scores_player_id ON player_pse_scores (player_id);
+
+-- tournament_id lookups are served by the UNIQUE(tournament_id, player_id) index
+CREATE INDEX IF NOT EXISTS idx_tournament_registrations_player_id ON tournament_registrations (player_id);
+CREATE INDEX IF NOT EXISTS idx_group_training_attendance_player_id ON group_training_attendance (player_id);
+CREATE INDEX IF NOT EXISTS idx_training_plans_player_id ON training_plans (player_id);
+
+-- Date window scans for the Upcoming Group Sessions feed, in display order
+CREATE INDEX IF NOT EXISTS idx_group_training_sessions_date_time ON group_training_sessions (date, time);
+
+-- Keyset pagination of the Player List
+CREATE INDEX IF NOT EXISTS idx_players_name_keyset ON players (last_name, first_name, id);
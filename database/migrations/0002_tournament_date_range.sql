@@ -0,0 +1,6 @@
+-- Inclusive date range of each tournament, so the calendar can ask for
+-- tournaments overlapping its visible range with a single indexed operator
+ALTER TABLE tournaments ADD COLUMN IF NOT EXISTS date_range DATERANGE
+    GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_tournaments_date_range ON tournaments USING GIST (date_range);
@@ -0,0 +1,38 @@
+-- Enable trigram matching for substring and fuzzy search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Add generated search columns covering names, email, phone and notes
+ALTER TABLE players ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+    lower(
+        coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' ||
+        coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(notes, '')
+    )
+) STORED;
+
+ALTER TABLE players ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(notes, '')), 'C')
+) STORED;
+
+-- Create GIN indexes for full-text and trigram lookups
+CREATE INDEX IF NOT EXISTS idx_players_search_vector ON players USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_players_search_text_trgm ON players USING GIN (search_text gin_trgm_ops);
+
+-- Ranked player search used by the Player List search box
+CREATE OR REPLACE FUNCTION search_players(search_query TEXT, result_limit INTEGER DEFAULT 50)
+RETURNS TABLE (id UUID, rank REAL) AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('simple', search_query) AS ts_query,
+               lower(search_query) AS pattern,
+               '%' || replace(replace(replace(lower(search_query), '\', '\\'), '%', '\%'), '_', '\_') || '%' AS like_pattern
+    )
+    SELECT p.id,
+           (ts_rank(p.search_vector, query.ts_query) + similarity(p.search_text, query.pattern))::REAL AS rank
+    FROM players p, query
+    WHERE p.search_vector @@ query.ts_query
+       OR p.search_text LIKE query.like_pattern
+       OR p.search_text % query.pattern
+    ORDER BY rank DESC, p.last_name, p.first_name
+    LIMIT result_limit;
+$$ LANGUAGE sql STABLE;
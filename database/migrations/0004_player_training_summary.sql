@@ -0,0 +1,137 @@
+-- Per-player training load in daily and weekly buckets, kept current by triggers
+CREATE TABLE IF NOT EXISTS player_training_summary (
+    player_id UUID REFERENCES players(id) ON DELETE CASCADE,
+    bucket VARCHAR(4) CHECK (bucket IN ('day', 'week')),
+    bucket_start DATE NOT NULL,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    total_pse INTEGER NOT NULL DEFAULT 0,
+    last_training_date DATE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, bucket, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_training_summary_bucket ON player_training_summary (bucket, bucket_start);
+
+-- Add (or with negative counts, remove) one PSE score in the day and week buckets
+CREATE OR REPLACE FUNCTION apply_player_training_delta(
+    p_player_id UUID,
+    p_report_date DATE,
+    p_sessions INTEGER,
+    p_pse INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_player_id IS NULL OR p_report_date IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO player_training_summary AS s (player_id, bucket, bucket_start, session_count, total_pse, last_training_date)
+    VALUES
+        (p_player_id, 'day', p_report_date, p_sessions, p_pse, p_report_date),
+        (p_player_id, 'week', date_trunc('week', p_report_date)::DATE, p_sessions, p_pse, p_report_date)
+    ON CONFLICT (player_id, bucket, bucket_start) DO UPDATE SET
+        session_count = s.session_count + EXCLUDED.session_count,
+        total_pse = s.total_pse + EXCLUDED.total_pse,
+        last_training_date = GREATEST(s.last_training_date, EXCLUDED.last_training_date),
+        updated_at = CURRENT_TIMESTAMP;
+
+    IF p_sessions < 0 THEN
+        DELETE FROM player_training_summary
+        WHERE player_id = p_player_id
+          AND ((bucket = 'day' AND bucket_start = p_report_date)
+            OR (bucket = 'week' AND bucket_start = date_trunc('week', p_report_date)::DATE))
+          AND session_count <= 0;
+
+        -- The removed score may have been the latest one of its week
+        UPDATE player_training_summary s
+        SET last_training_date = (
+            SELECT max(d.bucket_start) FROM player_training_summary d
+            WHERE d.player_id = p_player_id
+              AND d.bucket = 'day'
+              AND d.bucket_start >= s.bucket_start
+              AND d.bucket_start < s.bucket_start + 7
+        )
+        WHERE s.player_id = p_player_id
+          AND s.bucket = 'week'
+          AND s.bucket_start = date_trunc('week', p_report_date)::DATE;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_player_training_summary()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_player_training_delta(
+            OLD.player_id,
+            (SELECT report_date FROM training_reports WHERE id = OLD.report_id),
+            -1,
+            -coalesce(OLD.pse_score, 0)
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_player_training_delta(
+            NEW.player_id,
+            (SELECT report_date FROM training_reports WHERE id = NEW.report_id),
+            1,
+            coalesce(NEW.pse_score, 0)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS update_player_training_summary ON player_pse_scores;
+CREATE TRIGGER update_player_training_summary
+    AFTER INSERT OR UPDATE OR DELETE ON player_pse_scores
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_training_summary();
+
+-- Moving a report to another date moves its scores to the matching buckets
+CREATE OR REPLACE FUNCTION move_player_training_summary()
+RETURNS TRIGGER AS $$
+DECLARE
+    score RECORD;
+BEGIN
+    FOR score IN SELECT player_id, pse_score FROM player_pse_scores WHERE report_id = NEW.id LOOP
+        PERFORM apply_player_training_delta(score.player_id, OLD.report_date, -1, -coalesce(score.pse_score, 0));
+        PERFORM apply_player_training_delta(score.player_id, NEW.report_date, 1, coalesce(score.pse_score, 0));
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS move_player_training_summary ON training_reports;
+CREATE TRIGGER move_player_training_summary
+    AFTER UPDATE OF report_date ON training_reports
+    FOR EACH ROW
+    WHEN (OLD.report_date IS DISTINCT FROM NEW.report_date)
+    EXECUTE FUNCTION move_player_training_summary();
+
+-- Recompute every bucket from the raw scores (backfill, or repair after bulk loads)
+CREATE OR REPLACE FUNCTION rebuild_player_training_summary()
+RETURNS INTEGER AS $$
+DECLARE
+    bucket_rows INTEGER;
+BEGIN
+    -- Block concurrent score writes so no delta is lost between delete and insert
+    LOCK TABLE player_pse_scores IN SHARE MODE;
+    DELETE FROM player_training_summary;
+
+    INSERT INTO player_training_summary (player_id, bucket, bucket_start, session_count, total_pse, last_training_date)
+    SELECT p.player_id, b.bucket, b.bucket_start, count(*), sum(coalesce(p.pse_score, 0)), max(r.report_date)
+    FROM player_pse_scores p
+    JOIN training_reports r ON r.id = p.report_id
+    CROSS JOIN LATERAL (VALUES
+        ('day', r.report_date),
+        ('week', date_trunc('week', r.report_date)::DATE)
+    ) AS b (bucket, bucket_start)
+    WHERE p.player_id IS NOT NULL
+    GROUP BY p.player_id, b.bucket, b.bucket_start;
+
+    GET DIAGNOSTICS bucket_rows = ROW_COUNT;
+    RETURN bucket_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_player_training_summary();
@@ -0,0 +1,46 @@
+-- Insert training reports together with their PSE scores in one request.
+-- reports is a JSON array of training_reports objects, each with an optional
+-- "pse_scores" array of {"player_id", "pse_score"} objects. The function runs
+-- in the request's transaction, so either every report and score is stored or
+-- none is. Returns one {"training_report": {...}, "player_pse_scores": [...]}
+-- object per report, in input order, holding the inserted rows.
+CREATE OR REPLACE FUNCTION submit_training_reports(reports JSONB)
+RETURNS SETOF JSONB AS $$
+DECLARE
+    report JSONB;
+    inserted_report training_reports;
+    report_scores JSONB;
+BEGIN
+    FOR report IN SELECT value FROM jsonb_array_elements(reports) LOOP
+        INSERT INTO training_reports (
+            training_type, session_id, training_plan_id, report_date, performance_rating,
+            attendance, achievements, areas_for_improvement, coach_notes
+        )
+        VALUES (
+            report->>'training_type',
+            (report->>'session_id')::UUID,
+            (report->>'training_plan_id')::UUID,
+            (report->>'report_date')::DATE,
+            (report->>'performance_rating')::INTEGER,
+            CASE WHEN jsonb_typeof(report->'attendance') = 'array'
+                 THEN ARRAY(SELECT jsonb_array_elements_text(report->'attendance'))
+            END,
+            report->>'achievements',
+            report->>'areas_for_improvement',
+            report->>'coach_notes'
+        )
+        RETURNING * INTO inserted_report;
+
+        -- The summary triggers from migration 0004 fire on these inserts
+        WITH scores AS (
+            INSERT INTO player_pse_scores (player_id, report_id, pse_score)
+            SELECT (score->>'player_id')::UUID, inserted_report.id, (score->>'pse_score')::INTEGER
+            FROM jsonb_array_elements(coalesce(report->'pse_scores', '[]'::JSONB)) AS score
+            RETURNING *
+        )
+        SELECT coalesce(jsonb_agg(to_jsonb(scores)), '[]'::JSONB) INTO report_scores FROM scores;
+
+        RETURN NEXT jsonb_build_object('training_report', to_jsonb(inserted_report), 'player_pse_scores', report_scores);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
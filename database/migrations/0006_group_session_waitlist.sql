@@ -0,0 +1,15 @@
+-- Ordered waitlists of full group sessions, written by the session allocator.
+-- Rows are never deleted: a player who is no longer waiting keeps the row
+-- with a NULL position, so that replicas pick the change up from updated_at.
+CREATE TABLE IF NOT EXISTS group_session_waitlist (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    session_id UUID REFERENCES group_training_sessions(id) ON DELETE CASCADE,
+    player_id UUID REFERENCES players(id) ON DELETE CASCADE,
+    position INTEGER CHECK (position > 0),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (session_id, player_id)
+);
+
+-- session_id lookups are served by the UNIQUE(session_id, player_id) index
+CREATE INDEX IF NOT EXISTS idx_group_session_waitlist_player_id ON group_session_waitlist (player_id);
@@ -0,0 +1,22 @@
+-- Keep tournaments from ending before they start with a named constraint, so
+-- such a write fails with a clear error instead of one from the date_range
+-- column of migration 0002. Rows that already break the rule stop the
+-- migration and are listed; correct their dates and run it again.
+DO $$
+DECLARE
+    bad_rows TEXT;
+BEGIN
+    SELECT string_agg(format('%s "%s" (%s - %s)', id, name, start_date, end_date), E'\n' ORDER BY start_date, id)
+    INTO bad_rows
+    FROM tournaments
+    WHERE end_date < start_date;
+
+    IF bad_rows IS NOT NULL THEN
+        RAISE EXCEPTION E'Tournaments ending before they start:\n%', bad_rows
+            USING HINT = 'Correct their start_date or end_date, then apply this migration again.';
+    END IF;
+END
+$$;
+
+ALTER TABLE tournaments DROP CONSTRAINT IF EXISTS tournaments_end_after_start;
+ALTER TABLE tournaments ADD CONSTRAINT tournaments_end_after_start CHECK (end_date >= start_date);
@@ -0,0 +1,128 @@
+import os
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+from services.export import EXPORT_DATASETS, EXPORT_FORMATS, export_to_file
+from services.repository import empty_players, load_players, load_training_summary
+from services.page_data import load_page_data, query
+from services.query_log import begin_rerun, end_rerun
+from services.training_load import CHRONIC_DAYS, compute_training_load, load_status
+
+# Load Monitoring Page
+st.title("📈 Training Load Monitoring")
+# Record the queries of this rerun; add ?perf=1 to the URL for the performance panel
+begin_rerun("load_monitoring")
+st.write("Acute:chronic workload ratio, monotony and strain computed from the daily PSE totals of every player.")
+
+col1, col2 = st.columns(2)
+with col1:
+    end_date = st.date_input("Up to", value=date.today(), key="load_end_date")
+with col2:
+    weeks = st.selectbox("Period", [4, 8, 12, 26, 52], index=1, format_func=lambda w: f"Last {w} weeks", key="load_weeks")
+
+start_date = end_date - timedelta(weeks=weeks) + timedelta(days=1)
+# Chronic load needs four weeks of history before the first displayed day
+history_start = start_date - timedelta(days=CHRONIC_DAYS - 1)
+
+# Daily buckets are pre-aggregated in the database, one row per player and training day
+page_data = load_page_data(
+    daily=query(load_training_summary, 'day', history_start, end_date),
+    players=query(load_players, empty=empty_players()),
+)
+scores_df = page_data['daily'].rename(columns={'bucket_start': 'report_date', 'total_pse': 'pse_score'})
+players_df = page_data['players']
+
+if scores_df.empty:
+    st.info("No PSE scores recorded in this period.")
+else:
+    load_df = compute_training_load(scores_df, history_start, end_date)
+    player_names = players_df['display_name'] if not players_df.empty else pd.Series(dtype=str)
+
+    # Squad overview on the last day of the period
+    st.subheader("Squad Overview")
+    latest = load_df.xs(pd.Timestamp(end_date), level='date').round(2)
+    latest.insert(0, 'player', latest.index.map(player_names).fillna('Unknown player'))
+    latest.insert(1, 'status', load_status(latest['acwr']))
+    st.dataframe(
+        latest[['player', 'status', 'acute_load', 'chronic_load', 'acwr', 'monotony', 'strain']].sort_values('acwr', ascending=False),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'player': "Player",
+            'status': "Status",
+            'acute_load': "Acute (7d)",
+            'chronic_load': "Chronic (28d weekly avg)",
+            'acwr': "ACWR",
+            'monotony': "Monotony",
+            'strain': "Strain",
+        }
+    )
+
+    # Trend for a single player
+    st.subheader("Player Trend")
+    player_id = st.selectbox(
+        "Select Player",
+        latest.index,
+        format_func=lambda player_id: player_names.get(player_id, 'Unknown player'),
+        key="load_player"
+    )
+    if player_id:
+        trend = load_df.xs(player_id, level='player_id').loc[pd.Timestamp(start_date):]
+        st.line_chart(trend[['acute_load', 'chronic_load']])
+        st.line_chart(trend[['acwr']])
+        st.bar_chart(trend[['daily_load']])
+
+# Season data for the sports scientists, streamed to a file page by page
+st.subheader("Export Season Data")
+with st.form("export_form"):
+    col1, col2 = st.columns(2)
+    with col1:
+        export_dataset = st.selectbox("Data", list(EXPORT_DATASETS), format_func=EXPORT_DATASETS.get)
+        export_start = st.date_input("From", value=start_date, key="export_start")
+        export_player = st.selectbox(
+            "Player",
+            [None, *players_df.index] if not players_df.empty else [None],
+            format_func=lambda player_id: "All players" if player_id is None else players_df.loc[player_id, 'display_name'],
+        )
+    with col2:
+        export_format = st.selectbox("Format", EXPORT_FORMATS, format_func=str.upper)
+        export_end = st.date_input("To", value=end_date, key="export_end")
+    export_submitted = st.form_submit_button("Prepare Export")
+
+if export_submitted:
+    if export_end < export_start:
+        st.error("The export end date is before its start date.")
+    else:
+        # Replace the previous export file
+        previous = st.session_state.pop('export_file', None)
+        if previous and os.path.exists(previous['path']):
+            os.remove(previous['path'])
+        status = st.empty()
+        try:
+            path, rows = export_to_file(
+                export_dataset, export_format, export_start, export_end, export_player,
+                players_df['display_name'] if not players_df.empty else None,
+                progress=lambda rows: status.caption(f"{rows} rows exported…"),
+            )
+            st.session_state.export_file = {
+                'path': path,
+                'rows': rows,
+                'name': f"{export_dataset}_{export_start}_{export_end}.{export_format}",
+            }
+        except Exception as e:
+            st.error(f"Error exporting {EXPORT_DATASETS[export_dataset].lower()}: {str(e)}")
+        status.empty()
+
+export_file = st.session_state.get('export_file')
+if export_file and os.path.exists(export_file['path']):
+    st.caption(f"{export_file['rows']} rows ready.")
+    # download_button reads the whole file into memory on each rerun that draws it
+    with open(export_file['path'], 'rb') as f:
+        st.download_button(
+            f"Download {export_file['name']}",
+            f,
+            file_name=export_file['name'],
+            mime='text/csv' if export_file['name'].endswith('.csv') else 'application/octet-stream',
+        )
+
+end_rerun()
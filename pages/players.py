@@ -1,102 +1,71 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-from supabase import create_client
-import os
-from dotenv import load_dotenv
-
-# Initialize Supabase client
-# Check if running on Streamlit Cloud
-if 'SUPABASE_URL' in st.secrets:
-    supabase_url = st.secrets['SUPABASE_URL']
-    supabase_key = st.secrets['SUPABASE_KEY']
-else:
-    # Load local environment variables
-    load_dotenv()
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_KEY')
-
-supabase = create_client(supabase_url, supabase_key)
-
-def load_players():
-    try:
-        response = supabase.table('players').select('*').execute()
-        return pd.DataFrame(response.data)
-    except Exception as e:
-        st.error(f"Error loading players: {str(e)}")
-        return pd.DataFrame()
-
-def save_player(player_data):
-    try:
-        supabase.table('players').insert(player_data).execute()
-        st.success("Player added successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error saving player: {str(e)}")
-        return False
-
-def update_player(player_id, player_data):
-    try:
-        supabase.table('players').update(player_data).eq('id', player_id).execute()
-        st.success("Player updated successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error updating player: {str(e)}")
-        return False
+from datetime import datetime, timedelta
+from services.repository import (
+    AGE_GROUPS,
+    PLAYER_LEVELS,
+    PLAYER_PAGE_SIZE,
+    count_players,
+    load_player_page,
+    load_record_text,
+    load_training_summary,
+    page_cursor,
+    save_player,
+    update_player,
+)
+from services.bulk_import import show_import_form
+from services.page_data import load_page_data, query
+from services.query_log import begin_rerun, end_rerun, fragment_rerun
+from services.search import search_players
 
-# Player Management UI
-st.title("🎾 Player Management")
+SUMMARY_WEEKS = 12
 
-# Add New Player Form
-with st.expander("Add New Player"):
-    with st.form("new_player_form"):
-        col1, col2 = st.columns(2)
-        with col1:
-            first_name = st.text_input("First Name", key="add_first_name")
-            birth_date = st.date_input("Birth Date", key="add_birth_date")
-            phone = st.text_input("Phone Number", key="add_phone")
-        with col2:
-            last_name = st.text_input("Last Name", key="add_last_name")
-            email = st.text_input("Email", key="add_email")
-            level = st.selectbox("Player Level", ["Beginner", "Intermediate", "Advanced", "Professional"], key="add_level")
-            age_group = st.selectbox("Age Group", ["U10", "U12", "U14", "U16", "U18", "Senior"], key="add_age_group")
-        
-        notes = st.text_area("Notes", key="add_notes")
-        submitted = st.form_submit_button("Add Player")
-        
-        if submitted and first_name and last_name:  # Basic validation
-            player_data = {
-                'first_name': first_name,
-                'last_name': last_name,
-                'birth_date': birth_date.strftime('%Y-%m-%d'),  # Convert date to string in correct format
-                'email': email,
-                'phone': phone,
-                'level': level,
-                'age_group': age_group,
-                'notes': notes,
-                'created_at': datetime.now().isoformat()
-            }
-            if save_player(player_data):
-                st.rerun()
+# The add and edit forms are fragments: using them reruns only the form, and
+# the roster is re-read only after a save
 
-# Display Players
-st.subheader("Player List")
-players_df = load_players()
 
-if not players_df.empty:
-    # Add search functionality
-    search_term = st.text_input("Search Players", "")
-    if search_term:
-        players_df = players_df[players_df.apply(lambda x: search_term.lower() in str(x).lower(), axis=1)]
-    
-    # Display player data in an interactive table
-    st.dataframe(
-        players_df[["first_name", "last_name", "email", "phone", "level", "age_group"]],
-        hide_index=True,
-        use_container_width=True
-    )
-    
-    # Player Details Section - Using button instead of checkbox
+def hide_edit_form():
+    st.session_state.edit_form_visible = False
+
+
+@st.fragment
+@fragment_rerun("players")
+def add_player_form():
+    with st.expander("Add New Player"):
+        with st.form("new_player_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                first_name = st.text_input("First Name", key="add_first_name")
+                birth_date = st.date_input("Birth Date", key="add_birth_date")
+                phone = st.text_input("Phone Number", key="add_phone")
+            with col2:
+                last_name = st.text_input("Last Name", key="add_last_name")
+                email = st.text_input("Email", key="add_email")
+                level = st.selectbox("Player Level", PLAYER_LEVELS, key="add_level")
+                age_group = st.selectbox("Age Group", AGE_GROUPS, key="add_age_group")
+            
+            notes = st.text_area("Notes", key="add_notes")
+            submitted = st.form_submit_button("Add Player")
+            
+            if submitted and first_name and last_name:  # Basic validation
+                player_data = {
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'birth_date': birth_date.strftime('%Y-%m-%d'),  # Convert date to string in correct format
+                    'email': email,
+                    'phone': phone,
+                    'level': level,
+                    'age_group': age_group,
+                    'notes': notes,
+                    'created_at': datetime.now().isoformat()
+                }
+                if save_player(player_data):
+                    st.rerun()
+
+
+@st.fragment
+@fragment_rerun("players")
+def player_details(players_df):
+    # Using button instead of checkbox
     col1, col2 = st.columns([1, 3])
     with col1:
         show_edit = st.button("View/Edit Player Details")
@@ -110,34 +79,44 @@ if not players_df.empty:
         st.session_state.edit_form_visible = True
     
     if st.session_state.edit_form_visible:
-        selected_player = st.selectbox(
+        selected_player_id = st.selectbox(
             "Select Player",
-            players_df.apply(lambda x: f"{x['first_name']} {x['last_name']}", axis=1)
+            players_df['id'],
+            format_func=players_df['display_name'].get
         )
         
-        if selected_player:
-            player_idx = players_df.apply(
-                lambda x: f"{x['first_name']} {x['last_name']}" == selected_player, 
-                axis=1
-            ).idxmax()
-            player = players_df.loc[player_idx]
+        if selected_player_id:
+            player = players_df.loc[selected_player_id]
+            # Widgets expect None rather than pd.NA for missing values
+            player = player.astype(object).where(player.notna(), None)
+
+            # Recent training from the weekly summary buckets
+            summary_start = datetime.now().date() - timedelta(weeks=SUMMARY_WEEKS)
+            weekly_df = load_training_summary('week', summary_start, datetime.now().date(), selected_player_id)
+            if weekly_df.empty:
+                st.caption(f"No training recorded in the last {SUMMARY_WEEKS} weeks.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Last Training", weekly_df['last_training_date'].max())
+                col2.metric(f"Sessions ({SUMMARY_WEEKS} weeks)", int(weekly_df['session_count'].sum()))
+                col3.metric("Avg Weekly PSE", round(weekly_df['total_pse'].sum() / SUMMARY_WEEKS, 1))
+                st.bar_chart(weekly_df.set_index('bucket_start')[['total_pse']])
             
             with st.form("edit_player_form"):
                 col1, col2 = st.columns(2)
                 with col1:
                     first_name = st.text_input("First Name", player['first_name'])
-                    # Convert the string date to datetime object for the date_input
-                    birth_date = st.date_input("Birth Date", datetime.strptime(player['birth_date'], '%Y-%m-%d'))
+                    birth_date = st.date_input("Birth Date", player['birth_date'].date())
                     phone = st.text_input("Phone Number", player['phone'])
                 with col2:
                     last_name = st.text_input("Last Name", player['last_name'])
                     email = st.text_input("Email", player['email'])
                     level = st.selectbox("Player Level", 
-                                        ["Beginner", "Intermediate", "Advanced", "Professional"],
-                                        index=["Beginner", "Intermediate", "Advanced", "Professional"].index(player['level']))
+                                        PLAYER_LEVELS,
+                                        index=PLAYER_LEVELS.index(player['level']))
                     
                     # Fix for the "None is not in list" error - handle None values in age_group
-                    age_group_options = ["U10", "U12", "U14", "U16", "U18", "Senior"]
+                    age_group_options = AGE_GROUPS
                     if player['age_group'] in age_group_options:
                         age_group_index = age_group_options.index(player['age_group'])
                     else:
@@ -145,12 +124,14 @@ if not players_df.empty:
                     
                     age_group = st.selectbox("Age Group", age_group_options, index=age_group_index)
                 
-                notes = st.text_area("Notes", player['notes'])
+                # Notes are not part of the list payload; load them for this player only
+                notes = st.text_area("Notes", load_record_text('players', selected_player_id).get('notes'))
                 col1, col2 = st.columns([1, 3])
                 with col1:
                     update_submitted = st.form_submit_button("Update Player")
                 with col2:
-                    cancel_button = st.form_submit_button("Cancel")
+                    # The callback hides the form before this fragment reruns
+                    st.form_submit_button("Cancel", on_click=hide_edit_form)
                 
                 if update_submitted:
                     player_data = {
@@ -167,9 +148,77 @@ if not players_df.empty:
                     if update_player(player['id'], player_data):
                         st.session_state.edit_form_visible = False
                         st.rerun()
-                
-                if cancel_button:
-                    st.session_state.edit_form_visible = False
-                    st.rerun()
+
+
+# Player Management UI
+st.title("🎾 Player Management")
+# Record the queries of this rerun; add ?perf=1 to the URL for the performance panel
+begin_rerun("players")
+
+# Add New Player Form
+add_player_form()
+
+show_import_form('players', "Players")
+
+# Display Players
+st.subheader("Player List")
+
+# Add search functionality
+search_term = st.text_input("Search Players", "")
+if search_term:
+    players_df = search_players(search_term)
+else:
+    # Server-side filters and sort order for the paged list
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        level_filter = st.selectbox("Level", ["All"] + PLAYER_LEVELS, key="list_level")
+    with col2:
+        age_group_filter = st.selectbox("Age Group", ["All"] + AGE_GROUPS, key="list_age_group")
+    with col3:
+        sort_order = st.selectbox("Sort", ["Last name A-Z", "Last name Z-A"], key="list_sort")
+    
+    list_level = None if level_filter == "All" else level_filter
+    list_age_group = None if age_group_filter == "All" else age_group_filter
+    descending = sort_order == "Last name Z-A"
+    
+    # Keep a stack of page cursors and restart from the first page when the filters change
+    list_filters = (list_level, list_age_group, descending)
+    if st.session_state.get('player_list_filters') != list_filters:
+        st.session_state.player_list_filters = list_filters
+        st.session_state.player_list_cursors = [None]
+    cursors = st.session_state.player_list_cursors
+    
+    page_data = load_page_data(
+        total_players=query(count_players, list_level, list_age_group, empty=0),
+        players=query(load_player_page, list_level, list_age_group, cursors[-1], PLAYER_PAGE_SIZE, descending),
+    )
+    total_players = page_data['total_players']
+    players_df = page_data['players']
+    page_count = max(1, -(-total_players // PLAYER_PAGE_SIZE))
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("Next", disabled=len(cursors) >= page_count or players_df.empty):
+            cursors.append(page_cursor(players_df))
+            st.rerun()
+    with col3:
+        st.caption(f"Page {len(cursors)} of {page_count} · {total_players} players")
+
+if not players_df.empty:
+    # Display player data in an interactive table
+    st.dataframe(
+        players_df[["first_name", "last_name", "email", "phone", "level", "age_group"]],
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Player Details Section; selecting, editing and cancelling rerun only this panel
+    player_details(players_df)
 else:
-    st.info("No players found. Add a new player to get started!")
\ No newline at end of file
+    st.info("No players found. Add a new player to get started!")
+
+end_rerun()
@@ -1,60 +1,72 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-from supabase import create_client
-import os
-from dotenv import load_dotenv
+from datetime import date, datetime, timedelta
 from streamlit_calendar import calendar
+from services.repository import (
+    AGE_GROUPS,
+    empty_players,
+    load_players,
+    load_record_text,
+    load_tournaments_in_range,
+    load_registrations,
+    load_schedule,
+    save_tournament,
+    register_players,
+)
+from services.bulk_import import show_import_form
+from services.page_data import load_page_data, query
+from services.query_log import begin_rerun, end_rerun, fragment_rerun
+from services.schedule_conflicts import describe_conflicts, find_conflicts, registration_conflicts
+from services.tournament_calendar import CALENDAR_VIEWS, build_calendar_events, shift_anchor, visible_range
 
-# Initialize Supabase client
-# Check if running on Streamlit Cloud
-if 'SUPABASE_URL' in st.secrets:
-    supabase_url = st.secrets['SUPABASE_URL']
-    supabase_key = st.secrets['SUPABASE_KEY']
-else:
-    # Load local environment variables
-    load_dotenv()
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_KEY')
+CONFLICT_REPORT_DAYS = 90
+
+
+@st.fragment
+@fragment_rerun("tournament")
+def show_description(tournament_id):
+    # Descriptions are left out of the calendar payload and fetched per tournament
+    description_key = f"tournament_description_{tournament_id}"
+    if not st.session_state.get(description_key):
+        if not st.button("Show description", key=f"show_{description_key}"):
+            return
+        st.session_state[description_key] = True
+    
+    description = load_record_text('tournaments', tournament_id).get('description')
+    if description:
+        st.write(f"**Description:** {description}")
+    else:
+        st.caption("No description.")
+
+
+@st.fragment
+@fragment_rerun("tournament")
+def conflict_report(player_names):
+    # Squad-wide check of every registered player over a date window
+    with st.expander("Scheduling Conflicts"):
+        col1, col2 = st.columns(2)
+        with col1:
+            report_start = st.date_input("From", value=date.today(), key="conflicts_start")
+        with col2:
+            report_end = st.date_input("To", value=date.today() + timedelta(days=CONFLICT_REPORT_DAYS), key="conflicts_end")
+        if not st.button("Check Conflicts", key="conflicts_check"):
+            return
+        if report_end < report_start:
+            st.error("The end date is before the start date.")
+            return
+        
+        conflicts = describe_conflicts(find_conflicts(load_schedule(report_start, report_end)), player_names)
+        if conflicts.empty:
+            st.success("No scheduling conflicts in this period.")
+        else:
+            st.warning(f"{len(conflicts)} conflicts for {conflicts['Player'].nunique()} players.")
+            st.dataframe(conflicts, hide_index=True, use_container_width=True)
 
-supabase = create_client(supabase_url, supabase_key)
 
 # Tournament Calendar Page
 st.title("🎾 Tournament Calendar")
-
-def load_players():
-    try:
-        response = supabase.table('players').select('*').execute()
-        return pd.DataFrame(response.data)
-    except Exception as e:
-        st.error(f"Error loading players: {str(e)}")
-        return pd.DataFrame()
-
-def load_tournaments():
-    try:
-        response = supabase.table('tournaments').select('*').execute()
-        return pd.DataFrame(response.data)
-    except Exception as e:
-        st.error(f"Error loading tournaments: {str(e)}")
-        return pd.DataFrame()
-
-def save_tournament(tournament_data):
-    try:
-        supabase.table('tournaments').insert(tournament_data).execute()
-        st.success("Tournament added successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error saving tournament: {str(e)}")
-        return False
-
-def register_player(registration_data):
-    try:
-        supabase.table('tournament_registrations').insert(registration_data).execute()
-        st.success("Player registered successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error registering player: {str(e)}")
-        return False
+# Record the queries of this rerun; add ?perf=1 to the URL for the performance panel
+begin_rerun("tournament")
 
 # Add Tournament Section
 with st.expander("Add New Tournament"):
@@ -68,12 +80,14 @@ with st.expander("Add New Tournament"):
             tournament_type = st.selectbox("Tournament Type", ["Singles", "Doubles", "Mixed"])
             end_date = st.date_input("End Date")
             level = st.selectbox("Tournament Level", ["Local", "Regional", "National", "International"])
-            age_group = st.selectbox("Age Group", ["U10", "U12", "U14", "U16", "U18", "Senior"])
+            age_group = st.selectbox("Age Group", AGE_GROUPS)
         
         description = st.text_area("Tournament Description")
         submitted = st.form_submit_button("Add Tournament")
         
-        if submitted:
+        if submitted and end_date < start_date:
+            st.error("The tournament ends before it starts.")
+        elif submitted:
             tournament_data = {
                 'name': tournament_name,
                 'start_date': str(start_date),
@@ -88,115 +102,127 @@ with st.expander("Add New Tournament"):
             if save_tournament(tournament_data):
                 st.rerun()
 
+show_import_form('tournaments', "Tournaments")
+
 # Calendar View
 st.subheader("Tournament Schedule")
-tournaments_df = load_tournaments()
 
-if not tournaments_df.empty:
-    # Define age group colors
-    age_group_colors = {
-        "U10": "#FF9999",  # Light red
-        "U12": "#99FF99",  # Light green
-        "U14": "#9999FF",  # Light blue
-        "U16": "#FFFF99",  # Light yellow
-        "U18": "#FF99FF",  # Light purple
-        "Senior": "#99FFFF"  # Light cyan
-    }
-
-    # Prepare calendar events
-    calendar_events = []
-    for _, tournament in tournaments_df.iterrows():
-        calendar_events.append({
-            'title': tournament['name'],
-            'start': tournament['start_date'],
-            'end': tournament['end_date'],
-            'description': f"Type: {tournament['type']}\nLevel: {tournament['level']}\nLocation: {tournament['location']}",
-            'backgroundColor': age_group_colors[tournament['age_group']],
-            'borderColor': age_group_colors[tournament['age_group']]
-        })
-    
-    # Calendar configuration
-    calendar_config = {
-        "events": calendar_events,
-        "initialView": "dayGridMonth",
-        "headerToolbar": {
-            "left": "prev,next today",
-            "center": "title",
-            "right": "dayGridMonth,timeGridWeek,timeGridDay"
-        },
-        "selectable": True,
-        "editable": False
-    }
-    
-    # Display calendar
-    calendar(calendar_config)
+# The page owns calendar navigation so it knows the visible range and only
+# loads the tournaments overlapping it
+if 'calendar_anchor' not in st.session_state:
+    st.session_state.calendar_anchor = date.today()
+
+col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+with col1:
+    calendar_view = st.radio("View", list(CALENDAR_VIEWS), horizontal=True, key="calendar_view", label_visibility="collapsed")
+with col2:
+    if st.button("◀ Previous", use_container_width=True):
+        st.session_state.calendar_anchor = shift_anchor(calendar_view, st.session_state.calendar_anchor, -1)
+with col3:
+    if st.button("Today", use_container_width=True):
+        st.session_state.calendar_anchor = date.today()
+with col4:
+    if st.button("Next ▶", use_container_width=True):
+        st.session_state.calendar_anchor = shift_anchor(calendar_view, st.session_state.calendar_anchor, 1)
+
+calendar_anchor = st.session_state.calendar_anchor
+range_start, range_end = visible_range(calendar_view, calendar_anchor)
+page_data = load_page_data(
+    tournaments=query(load_tournaments_in_range, range_start, range_end),
+    players=query(load_players, empty=empty_players()),
+)
+tournaments_df = page_data['tournaments']
+players_df = page_data['players']
+
+# Calendar configuration
+calendar_options = {
+    "initialView": CALENDAR_VIEWS[calendar_view],
+    "initialDate": str(calendar_anchor),
+    "headerToolbar": {
+        "left": "",
+        "center": "title",
+        "right": ""
+    },
+    "selectable": True,
+    "editable": False
+}
+
+# Display calendar; the key remounts it on the newly selected period
+calendar(
+    events=build_calendar_events(tournaments_df),
+    options=calendar_options,
+    key=f"tournament_calendar_{calendar_view}_{calendar_anchor}"
+)
 
 # Tournament Registration Section
 st.subheader("Tournament Registration")
-players_df = load_players()
 
 if not tournaments_df.empty and not players_df.empty:
     with st.form("tournament_registration_form"):
         # Select tournament
-        selected_tournament = st.selectbox(
+        tournament_names = dict(zip(tournaments_df['id'], tournaments_df['name']))
+        tournament_id = st.selectbox(
             "Select Tournament",
-            tournaments_df['name']
+            tournaments_df['id'],
+            format_func=tournament_names.get
         )
         
         # Select players
-        selected_players = st.multiselect(
+        selected_player_ids = st.multiselect(
             "Select Players to Register",
-            players_df.apply(lambda x: f"{x['first_name']} {x['last_name']}", axis=1)
+            players_df['id'],
+            format_func=players_df['display_name'].get
         )
         
         registration_submitted = st.form_submit_button("Register Players")
         
-        if registration_submitted and selected_players:
-            tournament_id = tournaments_df[tournaments_df['name'] == selected_tournament]['id'].iloc[0]
-            
-            for player_name in selected_players:
-                player_idx = players_df.apply(
-                    lambda x: f"{x['first_name']} {x['last_name']}" == player_name,
-                    axis=1
-                ).idxmax()
-                player_id = players_df.loc[player_idx, 'id']
-                
-                registration_data = {
-                    'tournament_id': tournament_id,
-                    'player_id': player_id,
-                    'registration_date': datetime.now().isoformat()
-                }
-                register_player(registration_data)
+        if registration_submitted and selected_player_ids:
+            # Checked against the schedule as it was before this registration
+            tournament = tournaments_df[tournaments_df['id'] == tournament_id].iloc[0]
+            conflicts = registration_conflicts(
+                load_schedule(tournament['start_date'].date(), tournament['end_date'].date(), selected_player_ids),
+                tournament,
+                selected_player_ids
+            )
+            result = register_players(tournament_id, selected_player_ids)
+            if result:
+                registered, already_registered = result
+                if registered:
+                    st.success(f"Registered {len(registered)} player(s): " + ", ".join(players_df.loc[registered, 'display_name']))
+                if already_registered:
+                    st.info("Already registered: " + ", ".join(players_df.loc[already_registered, 'display_name']))
+                if not conflicts.empty:
+                    st.warning(f"{len(conflicts)} scheduling conflicts for the registered players:")
+                    st.dataframe(describe_conflicts(conflicts, players_df['display_name']), hide_index=True, use_container_width=True)
+
+if not players_df.empty:
+    conflict_report(players_df['display_name'])
 
 # View Tournament Details
 if not tournaments_df.empty:
     st.subheader("Tournament Details")
+    # One registrations query for every displayed tournament
+    registrations = load_registrations(tournaments_df['id'])
+    player_names = players_df['display_name'] if not players_df.empty else pd.Series(dtype=str)
+    
     for _, tournament in tournaments_df.iterrows():
-        with st.expander(f"{tournament['name']} ({tournament['start_date']} - {tournament['end_date']})"): 
+        with st.expander(f"{tournament['name']} ({tournament['start_date']:%Y-%m-%d} - {tournament['end_date']:%Y-%m-%d})"): 
             st.write(f"**Type:** {tournament['type']}")
             st.write(f"**Level:** {tournament['level']}")
             st.write(f"**Age Group:** {tournament['age_group']}")
             st.write(f"**Location:** {tournament['location']}")
-            if tournament['description']:
-                st.write(f"**Description:** {tournament['description']}")
+            show_description(tournament['id'])
             
             # Show registered players
-            try:
-                registrations = supabase.table('tournament_registrations')\
-                    .select('*')\
-                    .eq('tournament_id', tournament['id'])\
-                    .execute()
-                
-                if registrations.data:
-                    reg_df = pd.DataFrame(registrations.data)
-                    registered_players = players_df[players_df['id'].isin(reg_df['player_id'])]
-                    
-                    st.write("**Registered Players:**")
-                    for _, player in registered_players.iterrows():
-                        st.write(f"- {player['first_name']} {player['last_name']}")
-                else:
-                    st.info("No players registered yet.")
-            except Exception as e:
-                st.error(f"Error loading registrations: {str(e)}")
+            registered_ids = [player_id for player_id in registrations.get(tournament['id'], []) if player_id in player_names]
+            
+            if registered_ids:
+                st.write("**Registered Players:**")
+                for player_id in registered_ids:
+                    st.write(f"- {player_names[player_id]}")
+            else:
+                st.info("No players registered yet.")
 else:
-    st.info("No tournaments found. Add a tournament to get started!")
\ No newline at end of file
+    st.info("No tournaments in the displayed period. Add a tournament or move the calendar to get started!")
+
+end_rerun()
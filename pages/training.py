@@ -1,86 +1,124 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-from supabase import create_client
-import os
-from dotenv import load_dotenv
-
-# Initialize Supabase client
-# Check if running on Streamlit Cloud
-if 'SUPABASE_URL' in st.secrets:
-    supabase_url = st.secrets['SUPABASE_URL']
-    supabase_key = st.secrets['SUPABASE_KEY']
-else:
-    # Load local environment variables
-    load_dotenv()
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_KEY')
-
-supabase = create_client(supabase_url, supabase_key)
+from datetime import date, datetime, timedelta
+from services.repository import (
+    PLAYER_LEVELS,
+    SESSION_PAGE_SIZE,
+    empty_players,
+    load_allocation_inputs,
+    load_players,
+    load_group_sessions,
+    load_training_plans,
+    load_session_window,
+    load_session_details,
+    load_session_slots,
+    save_training_plan,
+    save_group_session,
+    save_allocation,
+    save_group_sessions,
+    submit_training_reports,
+)
+from services.bulk_import import show_import_form
+from services.page_data import load_page_data, prefetch, query
+from services.query_log import begin_rerun, end_rerun, fragment_rerun
+from services.session_allocation import allocate, allocation_summary, slot_preferences
+from services.session_scheduler import WEEKDAYS, expand_occurrences, mark_existing, session_rows
 
-# Training Dynamics Page
-st.title("🎾 Training Dynamics")
+SESSION_WINDOW_OPTIONS = [7, 30, 90, 365]
+DEFAULT_SESSION_WINDOW = 30
+SEASON_WEEKS = 40
 
-# Helper functions
-def load_players():
-    try:
-        response = supabase.table('players').select('*').execute()
-        return pd.DataFrame(response.data)
-    except Exception as e:
-        st.error(f"Error loading players: {str(e)}")
-        return pd.DataFrame()
-
-def save_training_plan(plan_data):
-    try:
-        supabase.table('training_plans').insert(plan_data).execute()
-        st.success("Training plan saved successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error saving training plan: {str(e)}")
-        return False
-
-def save_group_session(session_data):
-    try:
-        supabase.table('group_training_sessions').insert(session_data).execute()
-        st.success("Group training session added successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error saving group session: {str(e)}")
-        return False
-
-def save_training_report(report_data):
-    try:
-        response = supabase.table('training_reports').insert(report_data).execute()
-        report_id = response.data[0]['id']
-        st.success("Training report saved successfully!")
-        return report_id
-    except Exception as e:
-        st.error(f"Error saving training report: {str(e)}")
-        return None
-
-def save_pse_scores(pse_data_list):
-    try:
-        supabase.table('player_pse_scores').insert(pse_data_list).execute()
-        st.success("PSE scores saved successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error saving PSE scores: {str(e)}")
-        return False
+SECTIONS = ["Group Training Schedule", "Individual Training Plans", "Group Training Reports", "Individual Training Reports"]
 
-# Initialize session state to avoid duplicate submissions
-if 'form_submitted' not in st.session_state:
-    st.session_state.form_submitted = False
+# Each form and panel below is a fragment: interacting with it reruns only the
+# fragment, which reads nothing but its own data. Saves still rerun the whole
+# page so that the other tabs show the new rows.
 
-# Load players for selection
-players_df = load_players()
 
-# Tabs for different sections
-tab1, tab2, tab3, tab4 = st.tabs(["Group Training Schedule", "Individual Training Plans", "Group Training Reports", "Individual Training Reports"])
+def session_window_args():
+    """``load_session_window`` arguments for the window chosen in the first tab."""
+    # Read from the widget state so that the page can load the window together
+    # with its other reads before the widgets are drawn
+    window_start = st.session_state.get('session_window_start', date.today())
+    window_days = st.session_state.get('session_window_days', DEFAULT_SESSION_WINDOW)
+    
+    # Restart from the first page whenever the window changes
+    session_window = (window_start, window_days)
+    if st.session_state.get('session_window') != session_window:
+        st.session_state.session_window = session_window
+        st.session_state.session_offset = 0
+    
+    return window_start, window_start + timedelta(days=window_days), st.session_state.session_offset, SESSION_PAGE_SIZE
 
-with tab1:
-    st.header("Group Training Schedule")
+
+def section_queries(section):
+    """The reads ``section`` of the page needs, by name."""
+    queries = {'players': query(load_players, empty=empty_players())}
+    if section == "Group Training Schedule":
+        queries['session_window'] = query(load_session_window, *session_window_args(), empty=(pd.DataFrame(), 0))
+    elif section == "Group Training Reports":
+        queries['group_sessions'] = query(load_group_sessions)
+    elif section == "Individual Training Reports":
+        queries['training_plans'] = query(load_training_plans)
+    return queries
+
+
+# Button callbacks run before the fragment reruns, so these need no st.rerun()
+def set_session_offset(offset):
+    st.session_state.session_offset = offset
+
+
+def discard_recurring_plan():
+    st.session_state.pop('recurring_plan', None)
+
+
+def discard_allocation_plan():
+    st.session_state.pop('allocation_plan', None)
+
+
+@st.fragment
+@fragment_rerun("training")
+def show_session_details(session_id, players_df):
+    # Reports and PSE scores are only fetched once requested, and the
+    # "Load" click reruns this fragment instead of the whole page
+    details_key = f"session_details_{session_id}"
+    if not st.session_state.get(details_key):
+        if not st.button("Load training reports", key=f"load_{details_key}"):
+            return
+        st.session_state[details_key] = True
     
-    # Add new group training session
+    reports_df, pse_by_report = load_session_details(session_id)
+    
+    if not reports_df.empty:
+        st.markdown("---")
+        st.markdown("### Training Reports")
+        for _, report in reports_df.iterrows():
+            st.markdown(f"**Report Date:** {report['report_date']}")
+            st.markdown(f"**Performance Rating:** {'⭐' * report['performance_rating']}")
+            if report['achievements']:
+                st.markdown(f"**Key Achievements:**\n{report['achievements']}")
+            if report['areas_for_improvement']:
+                st.markdown(f"**Areas for Improvement:**\n{report['areas_for_improvement']}")
+            if report['coach_notes']:
+                st.markdown(f"**Coach Notes:**\n{report['coach_notes']}")
+            
+            # Display PSE scores
+            pse_scores_df = pse_by_report.get(report['id'])
+            
+            if pse_scores_df is not None:
+                st.markdown("**PSE Scores:**")
+                for _, pse in pse_scores_df.iterrows():
+                    player_name = players_df['display_name'].get(pse['player_id'], 'Unknown player') if not players_df.empty else 'Unknown player'
+                    st.markdown(f"*{player_name}:*")
+                    st.markdown(f"PSE Score: {'⭐' * pse['pse_score']}")
+            st.markdown("---")
+    else:
+        st.info("No training reports available for this session.")
+
+
+@st.fragment
+@fragment_rerun("training")
+def new_session_form():
     with st.expander("Add New Group Training Session"):
         with st.form("new_group_session"):
             col1, col2 = st.columns(2)
@@ -88,7 +126,7 @@ with tab1:
                 session_date = st.date_input("Date")
                 session_time = st.time_input("Time")
             with col2:
-                level = st.selectbox("Training Level", ["Beginner", "Intermediate", "Advanced", "Professional"])
+                level = st.selectbox("Training Level", PLAYER_LEVELS)
                 max_participants = st.number_input("Maximum Participants", min_value=1, value=8)
             
             notes = st.text_area("Session Notes")
@@ -107,320 +145,435 @@ with tab1:
                 if save_group_session(session_data):
                     st.rerun()
     
-    # Reset form submitted state when the form is not being submitted
-    if not st.session_state.form_submitted:
-        st.session_state.form_submitted = False
-    
-    # View upcoming group sessions
-    st.subheader("Upcoming Group Sessions")
-    try:
-        sessions = supabase.table('group_training_sessions').select('*').execute()
-        sessions_df = pd.DataFrame(sessions.data)
+    # A fragment rerun does not reach the reset at the end of the page
+    st.session_state.form_submitted = False
+
+
+@st.fragment
+@fragment_rerun("training")
+def recurring_sessions_panel():
+    # Schedule a whole season of weekly sessions in one request
+    with st.expander("Schedule Recurring Sessions"):
+        with st.form("recurring_sessions_form"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                season_start = st.date_input("Season Start", value=date.today(), key="recurring_start")
+            with col2:
+                season_end = st.date_input("Season End", value=date.today() + timedelta(weeks=SEASON_WEEKS), key="recurring_end")
+            with col3:
+                every_weeks = st.number_input("Every N Weeks", min_value=1, max_value=8, value=1, key="recurring_every")
+            
+            st.write("Weekly slots, one row per level, weekday and time:")
+            templates = st.data_editor(
+                pd.DataFrame({
+                    'level': [PLAYER_LEVELS[0]],
+                    'weekday': ["Monday"],
+                    'time': [datetime.strptime("18:00", "%H:%M").time()],
+                    'max_participants': [8],
+                    'notes': [""],
+                }),
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                key="recurring_templates",
+                column_config={
+                    'level': st.column_config.SelectboxColumn("Level", options=PLAYER_LEVELS, required=True),
+                    'weekday': st.column_config.SelectboxColumn("Weekday", options=WEEKDAYS, required=True),
+                    'time': st.column_config.TimeColumn("Time", format="HH:mm", required=True),
+                    'max_participants': st.column_config.NumberColumn("Max Participants", min_value=1, step=1),
+                    'notes': st.column_config.TextColumn("Notes"),
+                }
+            )
+            excluded_text = st.text_area("Excluded Dates (one YYYY-MM-DD per line)", key="recurring_excluded")
+            preview_submitted = st.form_submit_button("Preview Sessions")
         
-        if not sessions_df.empty:
-            for _, session in sessions_df.iterrows():
-                with st.expander(f"{session['date']} - {session['time']} ({session['level']})"): 
-                    st.write(f"**Maximum Participants:** {session['max_participants']}")
-                    if session['notes']:
-                        st.write(f"**Notes:** {session['notes']}")
-                    
-                    # Display associated training reports
-                    try:
-                        reports = supabase.table('training_reports')\
-                            .select('*')\
-                            .eq('training_type', 'Group')\
-                            .eq('session_id', session['id'])\
-                            .execute()
-                        
-                        reports_df = pd.DataFrame(reports.data)
-                        
-                        if not reports_df.empty:
-                            st.markdown("---")
-                            st.markdown("### Training Reports")
-                            for _, report in reports_df.iterrows():
-                                st.markdown(f"**Report Date:** {report['report_date']}")
-                                st.markdown(f"**Performance Rating:** {'⭐' * report['performance_rating']}")
-                                if report['achievements']:
-                                    st.markdown(f"**Key Achievements:**\n{report['achievements']}")
-                                if report['areas_for_improvement']:
-                                    st.markdown(f"**Areas for Improvement:**\n{report['areas_for_improvement']}")
-                                if report['coach_notes']:
-                                    st.markdown(f"**Coach Notes:**\n{report['coach_notes']}")
-                                
-                                # Display PSE scores
-                                try:
-                                    pse_scores = supabase.table('player_pse_scores')\
-                                        .select('*')\
-                                        .eq('report_id', report['id'])\
-                                        .execute()
-                                    
-                                    if pse_scores.data:
-                                        st.markdown("**PSE Scores:**")
-                                        for pse in pse_scores.data:
-                                            player = players_df[players_df['id'] == pse['player_id']].iloc[0]
-                                            st.markdown(f"*{player['first_name']} {player['last_name']}:*")
-                                            st.markdown(f"PSE Score: {'⭐' * pse['pse_score']}")
-                                except Exception as e:
-                                    st.error(f"Error loading PSE scores: {str(e)}")
-                                st.markdown("---")
-                        else:
-                            st.info("No training reports available for this session.")
-                    except Exception as e:
-                        st.error(f"Error loading training reports: {str(e)}")
-        else:
-            st.info("No upcoming group training sessions scheduled.")
-    except Exception as e:
-        st.error(f"Error loading group sessions: {str(e)}")
-
-with tab2:
-    st.header("Individual Training Plans")
-    
-    if not players_df.empty:
-        # Create individual training plan
-        with st.expander("Create Individual Training Plan"):
-            with st.form("training_plan_form"):
-                selected_player = st.selectbox(
-                    "Select Player",
-                    players_df.apply(lambda x: f"{x['first_name']} {x['last_name']}", axis=1)
+        if preview_submitted:
+            excluded_lines = [line.strip() for line in excluded_text.splitlines() if line.strip()]
+            excluded_dates = pd.to_datetime(pd.Series(excluded_lines, dtype=str), format='ISO8601', errors='coerce')
+            invalid_lines = [line for line, parsed in zip(excluded_lines, excluded_dates) if pd.isna(parsed)]
+            if season_end < season_start:
+                st.error("The season end is before its start.")
+            elif invalid_lines:
+                st.error(f"Not a YYYY-MM-DD date: {', '.join(invalid_lines)}")
+            else:
+                occurrences = expand_occurrences(templates, season_start, season_end, every_weeks, excluded_dates.dropna())
+                existing = load_session_slots(season_start, season_end)
+                if existing is not None:
+                    occurrences['exists'] = mark_existing(occurrences, existing)
+                    st.session_state.recurring_plan = occurrences
+        
+        plan = st.session_state.get('recurring_plan')
+        if plan is not None:
+            new_sessions = plan[~plan['exists']]
+            st.caption(f"{len(new_sessions)} new sessions · {int(plan['exists'].sum())} already scheduled and skipped")
+            st.dataframe(
+                plan.assign(status=plan['exists'].map({True: "Already scheduled", False: "New"})).drop(columns='exists'),
+                hide_index=True,
+                use_container_width=True
+            )
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                create_clicked = st.button(f"Create {len(new_sessions)} Sessions", disabled=new_sessions.empty)
+            with col2:
+                st.button("Discard", on_click=discard_recurring_plan)
+            if create_clicked and save_group_sessions(session_rows(new_sessions)) is not None:
+                del st.session_state.recurring_plan
+                st.rerun()
+
+
+@st.fragment
+@fragment_rerun("training")
+def session_allocation_panel():
+    # Fill a week's group sessions with players of their level in one batch
+    with st.expander("Allocate Players to Sessions"):
+        with st.form("allocation_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                week_of = st.date_input("Week Of", value=date.today() + timedelta(weeks=1), key="allocation_week")
+            with col2:
+                sessions_per_player = st.number_input("Sessions per Player", min_value=1, max_value=7, value=1, key="allocation_sessions_per_player")
+            preview_submitted = st.form_submit_button("Preview Allocation")
+        
+        if preview_submitted:
+            week_start = week_of - timedelta(days=week_of.weekday())
+            inputs = load_allocation_inputs(week_start, week_start + timedelta(days=6))
+            if inputs is not None and inputs['sessions'].empty:
+                st.info(f"No group sessions scheduled in the week of {week_start:%Y-%m-%d}.")
+                discard_allocation_plan()
+            elif inputs is not None:
+                allocation = allocate(
+                    inputs['players'],
+                    inputs['sessions'],
+                    inputs['booked'],
+                    slot_preferences(inputs['history']),
+                    inputs['history']['player_id'].value_counts(),
+                    sessions_per_player,
+                    inputs['waitlist'],
                 )
+                st.session_state.allocation_plan = {
+                    'week_start': week_start,
+                    'allocation': allocation,
+                    'previous_waitlist': inputs['waitlist'],
+                    'summary': allocation_summary(inputs['sessions'], inputs['booked'], allocation),
+                }
+        
+        plan = st.session_state.get('allocation_plan')
+        if plan is not None:
+            allocation = plan['allocation']
+            st.caption(
+                f"Week of {plan['week_start']:%Y-%m-%d} · {len(allocation.assignments)} new seats · "
+                f"{len(allocation.waitlist)} players on waitlists"
+            )
+            st.dataframe(plan['summary'], hide_index=True, use_container_width=True)
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                book_clicked = st.button(
+                    "Save Allocation",
+                    disabled=allocation.assignments.empty and allocation.waitlist.empty and plan['previous_waitlist'].empty
+                )
+            with col2:
+                st.button("Discard", key="allocation_discard", on_click=discard_allocation_plan)
+            if book_clicked and save_allocation(allocation.assignments, allocation.waitlist, plan['previous_waitlist']) is not None:
+                del st.session_state.allocation_plan
+                st.rerun()
+
+
+@st.fragment
+@fragment_rerun("training")
+def upcoming_sessions(players_df):
+    st.subheader("Upcoming Group Sessions")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.date_input("From", value=date.today(), key="session_window_start")
+    with col2:
+        st.selectbox(
+            "Window",
+            SESSION_WINDOW_OPTIONS,
+            index=SESSION_WINDOW_OPTIONS.index(DEFAULT_SESSION_WINDOW),
+            format_func=lambda days: f"Next {days} days",
+            key="session_window_days"
+        )
+    
+    # Already cached by the page's reads unless only this fragment is rerunning
+    sessions_df, total_sessions = load_session_window(*session_window_args())
+    
+    if not sessions_df.empty:
+        for _, session in sessions_df.iterrows():
+            with st.expander(f"{session['date']:%Y-%m-%d} - {session['time']} ({session['level']})"):
+                st.write(f"**Maximum Participants:** {session['max_participants']}")
+                if pd.notna(session['notes']) and session['notes']:
+                    st.write(f"**Notes:** {session['notes']}")
                 
-                col1, col2 = st.columns(2)
-                with col1:
-                    start_date = st.date_input("Start Date")
-                    duration_weeks = st.number_input("Duration (weeks)", min_value=1, max_value=52, value=4)
-                with col2:
-                    focus_area = st.selectbox(
-                        "Focus Area",
-                        ["Technique", "Fitness", "Strategy", "Mental Game", "Match Practice"]
-                    )
-                    intensity = st.slider("Training Intensity", 1, 5, 3)
-                
-                technical_goal = st.text_area("Technical Goals")
-                fitness_goal = st.text_area("Fitness Goals")
-                tactical_goal = st.text_area("Tactical Goals")
-                notes = st.text_area("Additional Notes")
+                # Display associated training reports on demand
+                show_session_details(session['id'], players_df)
+        
+        offset = st.session_state.session_offset
+        col1, col2, col3 = st.columns([1, 1, 4])
+        with col1:
+            st.button(
+                "Previous", key="sessions_previous", disabled=offset == 0,
+                on_click=set_session_offset, args=(max(0, offset - SESSION_PAGE_SIZE),)
+            )
+        with col2:
+            st.button(
+                "Next", key="sessions_next", disabled=offset + SESSION_PAGE_SIZE >= total_sessions,
+                on_click=set_session_offset, args=(offset + SESSION_PAGE_SIZE,)
+            )
+        with col3:
+            st.caption(f"Sessions {offset + 1}-{offset + len(sessions_df)} of {total_sessions}")
+    else:
+        st.info("No upcoming group training sessions scheduled.")
+
+
+@st.fragment
+@fragment_rerun("training")
+def training_plan_form(players_df):
+    with st.expander("Create Individual Training Plan"):
+        with st.form("training_plan_form"):
+            player_id = st.selectbox(
+                "Select Player",
+                players_df['id'],
+                format_func=players_df['display_name'].get
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Start Date")
+                duration_weeks = st.number_input("Duration (weeks)", min_value=1, max_value=52, value=4)
+            with col2:
+                focus_area = st.selectbox(
+                    "Focus Area",
+                    ["Technique", "Fitness", "Strategy", "Mental Game", "Match Practice"]
+                )
+                intensity = st.slider("Training Intensity", 1, 5, 3)
+            
+            technical_goal = st.text_area("Technical Goals")
+            fitness_goal = st.text_area("Fitness Goals")
+            tactical_goal = st.text_area("Tactical Goals")
+            notes = st.text_area("Additional Notes")
+            
+            submitted = st.form_submit_button("Save Training Plan")
+            
+            if submitted and not st.session_state.form_submitted:
+                st.session_state.form_submitted = True
                 
-                submitted = st.form_submit_button("Save Training Plan")
+                plan_data = {
+                    'player_id': player_id,
+                    'start_date': str(start_date),
+                    'end_date': str(start_date + timedelta(weeks=duration_weeks)),
+                    'focus_area': focus_area,
+                    'intensity': intensity,
+                    'technical_goal': technical_goal,
+                    'fitness_goal': fitness_goal,
+                    'tactical_goal': tactical_goal,
+                    'notes': notes,
+                    'created_at': datetime.now().isoformat()
+                }
                 
-                if submitted and not st.session_state.form_submitted:
-                    st.session_state.form_submitted = True
-                    player_idx = players_df.apply(
-                        lambda x: f"{x['first_name']} {x['last_name']}" == selected_player,
-                        axis=1
-                    ).idxmax()
-                    player_id = players_df.loc[player_idx, 'id']
-                    
-                    plan_data = {
-                        'player_id': player_id,
-                        'start_date': str(start_date),
-                        'end_date': str(start_date + timedelta(weeks=duration_weeks)),
-                        'focus_area': focus_area,
-                        'intensity': intensity,
-                        'technical_goal': technical_goal,
-                        'fitness_goal': fitness_goal,
-                        'tactical_goal': tactical_goal,
-                        'notes': notes,
-                        'created_at': datetime.now().isoformat()
-                    }
-                    
-                    if save_training_plan(plan_data):
-                        st.rerun()
+                if save_training_plan(plan_data):
+                    st.rerun()
+    
+    st.session_state.form_submitted = False
 
-# Modification for tab3 (Group Training Reports)
-# Replace the current form handling in tab3 with this:
 
-with tab3:
-    st.header("Group Training Reports")
-    
-    # Add new group training report
+@st.fragment
+@fragment_rerun("training")
+def group_report_form(players_df, sessions_df):
     with st.expander("Add Group Training Report"):
-        # Check if we are in PSE score entry mode
-        if 'report_id' in st.session_state and 'attendees' in st.session_state:
-            st.subheader("Enter PSE Scores")
-            
-            with st.form("pse_scores_form"):
-                pse_scores = {}
-                for player in st.session_state.attendees:
-                    st.write(f"**{player}**")
-                    pse_score = st.slider("PSE Score", 1, 10, 5, key=f"pse_{player}")
-                    pse_scores[player] = {
-                        "pse_score": pse_score
-                    }
-                
-                pse_submitted = st.form_submit_button("Save PSE Scores")
+        try:
+            if not sessions_df.empty:
+                # Chosen outside the form so that a PSE slider is shown for every
+                # attendee; changing it reruns only this fragment
+                attendee_ids = st.multiselect(
+                    "Select Attendees",
+                    players_df['id'],
+                    format_func=players_df['display_name'].get,
+                    key="group_report_attendees"
+                )
                 
-                if pse_submitted:
-                    # Save PSE scores for each attendee as a batch
-                    pse_data_list = []
-                    for player in st.session_state.attendees:
-                        player_idx = players_df.apply(
-                            lambda x: f"{x['first_name']} {x['last_name']}" == player,
-                            axis=1
-                        ).idxmax()
-                        player_id = players_df.loc[player_idx, 'id']
-                        
-                        pse_data_list.append({
-                            'player_id': player_id,
-                            'report_id': st.session_state.report_id,
-                            'pse_score': pse_scores[player]['pse_score'],
-                            'created_at': datetime.now().isoformat()
-                        })
+                with st.form("group_report_form"):
+                    session_labels = dict(zip(
+                        sessions_df['id'],
+                        sessions_df['date'].dt.strftime('%Y-%m-%d') + ' - ' + sessions_df['time']
+                        + ' (' + sessions_df['level'].astype('string') + ')'
+                    ))
+                    session_id = st.selectbox(
+                        "Select Training Session",
+                        sessions_df['id'],
+                        format_func=session_labels.get
+                    )
                     
-                    if pse_data_list and save_pse_scores(pse_data_list):
-                        # Clear the session state
-                        del st.session_state.report_id
-                        del st.session_state.attendees
-                        st.rerun()
-        else:
-            # Original form for report creation
-            with st.form("group_report_form"):
-                # Load group sessions for selection
-                try:
-                    sessions = supabase.table('group_training_sessions').select('*').execute()
-                    sessions_df = pd.DataFrame(sessions.data)
+                    report_date = st.date_input("Report Date")
+                    performance = st.slider("Overall Performance Rating", 1, 5, 3)
                     
-                    if not sessions_df.empty:
-                        session = st.selectbox(
-                            "Select Training Session",
-                            sessions_df.apply(lambda x: f"{x['date']} - {x['time']} ({x['level']})", axis=1)
+                    pse_scores = {}
+                    if attendee_ids:
+                        st.subheader("PSE Scores")
+                    for player_id in attendee_ids:
+                        pse_scores[player_id] = st.slider(
+                            f"PSE Score - {players_df.loc[player_id, 'display_name']}", 1, 10, 5, key=f"pse_{player_id}"
                         )
+                    
+                    achievements = st.text_area("Key Achievements")
+                    improvements = st.text_area("Areas for Improvement")
+                    notes = st.text_area("Coach Notes")
+                    
+                    submitted = st.form_submit_button("Save Report")
+                    
+                    if submitted and not st.session_state.form_submitted:
+                        st.session_state.form_submitted = True
                         
-                        report_date = st.date_input("Report Date")
-                        performance = st.slider("Overall Performance Rating", 1, 5, 3)
-                        attendance = st.multiselect(
-                            "Select Attendees",
-                            players_df.apply(lambda x: f"{x['first_name']} {x['last_name']}", axis=1)
-                        )
-                        
-                        achievements = st.text_area("Key Achievements")
-                        improvements = st.text_area("Areas for Improvement")
-                        notes = st.text_area("Coach Notes")
-                        
-                        submitted = st.form_submit_button("Save Report and Continue to PSE Scores")
+                        # The report and its PSE scores are stored together in one request
+                        report_data = {
+                            'training_type': 'Group',
+                            'session_id': session_id,
+                            'report_date': str(report_date),
+                            'performance_rating': performance,
+                            'attendance': players_df.loc[attendee_ids, 'display_name'].tolist(),
+                            'achievements': achievements,
+                            'areas_for_improvement': improvements,
+                            'coach_notes': notes,
+                            'pse_scores': [
+                                {'player_id': player_id, 'pse_score': pse_score}
+                                for player_id, pse_score in pse_scores.items()
+                            ]
+                        }
                         
-                        if submitted and not st.session_state.form_submitted:
-                            st.session_state.form_submitted = True
-                            session_idx = sessions_df.apply(
-                                lambda x: f"{x['date']} - {x['time']} ({x['level']})" == session,
-                                axis=1
-                            ).idxmax()
-                            session_id = sessions_df.loc[session_idx, 'id']
-                            
-                            report_data = {
-                                'training_type': 'Group',
-                                'session_id': session_id,
-                                'report_date': str(report_date),
-                                'performance_rating': performance,
-                                'attendance': attendance,
-                                'achievements': achievements,
-                                'areas_for_improvement': improvements,
-                                'coach_notes': notes,
-                                'created_at': datetime.now().isoformat()
-                            }
-                            
-                            report_id = save_training_report(report_data)
-                            if report_id and attendance:
-                                # Store the report ID and attendees in session state
-                                st.session_state.report_id = report_id
-                                st.session_state.attendees = attendance
-                                st.rerun()
-                    else:
-                        st.info("No group training sessions available for reporting.")
-                except Exception as e:
-                    st.error(f"Error loading group sessions: {str(e)}")
-
-# Modification for tab4 (Individual Training Reports)
-# Replace the current form handling in tab4 with this:
-
-with tab4:
-    st.header("Individual Training Reports")
+                        if submit_training_reports([report_data]):
+                            del st.session_state.group_report_attendees
+                            st.rerun()
+            else:
+                st.info("No group training sessions available for reporting.")
+        except Exception as e:
+            st.error(f"Error loading group sessions: {str(e)}")
     
-    # Add new individual training report
+    st.session_state.form_submitted = False
+
+
+@st.fragment
+@fragment_rerun("training")
+def individual_report_form(players_df, plans_df):
     with st.expander("Add Individual Training Report"):
-        # Check if we are in PSE score entry mode
-        if 'individual_report_id' in st.session_state and 'player_id' in st.session_state:
-            st.subheader("Enter PSE Score")
-            
-            with st.form("individual_pse_form"):
-                pse_score = st.slider("PSE Score", 1, 10, 5, key="pse_individual")
-                
-                pse_submitted = st.form_submit_button("Save PSE Score")
-                
-                if pse_submitted:
-                    # Save PSE score
-                    pse_data = [{
-                        'player_id': st.session_state.player_id,
-                        'report_id': st.session_state.individual_report_id,
-                        'pse_score': pse_score,
-                        'created_at': datetime.now().isoformat()
-                    }]
+        with st.form("individual_report_form"):
+            try:
+                if not plans_df.empty:
+                    # Merge with player data
+                    plans_df = plans_df.merge(
+                        players_df[['id', 'display_name']],
+                        left_on='player_id',
+                        right_on='id',
+                        suffixes=('', '_player')
+                    ).set_index('id', drop=False)
+                    plans_df.index.name = None
+                    plan_labels = (
+                        plans_df['display_name'] + ' - ' + plans_df['focus_area'].astype('string')
+                        + ' (' + plans_df['start_date'].dt.strftime('%Y-%m-%d')
+                        + ' to ' + plans_df['end_date'].dt.strftime('%Y-%m-%d') + ')'
+                    )
                     
-                    if save_pse_scores(pse_data):
-                        # Clear the session state
-                        del st.session_state.individual_report_id
-                        del st.session_state.player_id
-                        st.rerun()
-        else:
-            # Original form for report creation
-            with st.form("individual_report_form"):
-                # Load training plans for selection
-                try:
-                    plans = supabase.table('training_plans').select('*').execute()
-                    plans_df = pd.DataFrame(plans.data)
+                    plan_id = st.selectbox(
+                        "Select Training Plan",
+                        plans_df['id'],
+                        format_func=plan_labels.get
+                    )
                     
-                    if not plans_df.empty:
-                        # Merge with player data
-                        plans_df = plans_df.merge(
-                            players_df[['id', 'first_name', 'last_name']],
-                            left_on='player_id',
-                            right_on='id',
-                            suffixes=('', '_player')
-                        )
-                        
-                        plan = st.selectbox(
-                            "Select Training Plan",
-                            plans_df.apply(lambda x: f"{x['first_name']} {x['last_name']} - {x['focus_area']} ({x['start_date']} to {x['end_date']})", axis=1)
-                        )
-                        
-                        report_date = st.date_input("Report Date")
-                        performance = st.slider("Performance Rating", 1, 5, 3)
-                        achievements = st.text_area("Key Achievements")
-                        improvements = st.text_area("Areas for Improvement")
-                        notes = st.text_area("Coach Notes")
+                    report_date = st.date_input("Report Date")
+                    performance = st.slider("Performance Rating", 1, 5, 3)
+                    pse_score = st.slider("PSE Score", 1, 10, 5, key="pse_individual")
+                    achievements = st.text_area("Key Achievements")
+                    improvements = st.text_area("Areas for Improvement")
+                    notes = st.text_area("Coach Notes")
+                    
+                    submitted = st.form_submit_button("Save Report")
+                    
+                    if submitted and not st.session_state.form_submitted:
+                        st.session_state.form_submitted = True
                         
-                        submitted = st.form_submit_button("Save Report and Continue to PSE Score")
+                        report_data = {
+                            'training_type': 'Individual',
+                            'training_plan_id': plan_id,
+                            'report_date': str(report_date),
+                            'performance_rating': performance,
+                            'achievements': achievements,
+                            'areas_for_improvement': improvements,
+                            'coach_notes': notes,
+                            'pse_scores': [
+                                {'player_id': plans_df.loc[plan_id, 'player_id'], 'pse_score': pse_score}
+                            ]
+                        }
                         
-                        if submitted and not st.session_state.form_submitted:
-                            st.session_state.form_submitted = True
-                            plan_idx = plans_df.apply(
-                                lambda x: f"{x['first_name']} {x['last_name']} - {x['focus_area']} ({x['start_date']} to {x['end_date']})" == plan,
-                                axis=1
-                            ).idxmax()
-                            plan_id = plans_df.loc[plan_idx, 'id']
-                            player_id = plans_df.loc[plan_idx, 'player_id']
-                            
-                            report_data = {
-                                'training_type': 'Individual',
-                                'training_plan_id': plan_id,
-                                'report_date': str(report_date),
-                                'performance_rating': performance,
-                                'achievements': achievements,
-                                'areas_for_improvement': improvements,
-                                'coach_notes': notes,
-                                'created_at': datetime.now().isoformat()
-                            }
-                            
-                            report_id = save_training_report(report_data)
-                            if report_id:
-                                # Store the report ID and player ID in session state
-                                st.session_state.individual_report_id = report_id
-                                st.session_state.player_id = player_id
-                                st.rerun()
-                    else:
-                        st.info("No individual training plans available for reporting.")
-                except Exception as e:
-                    st.error(f"Error loading training plans: {str(e)}")
+                        if submit_training_reports([report_data]):
+                            st.rerun()
+                else:
+                    st.info("No individual training plans available for reporting.")
+            except Exception as e:
+                st.error(f"Error loading training plans: {str(e)}")
+    
+    st.session_state.form_submitted = False
+
+
+# Training Dynamics Page
+st.title("🎾 Training Dynamics")
+# Record the queries of this rerun; add ?perf=1 to the URL for the performance panel
+begin_rerun("training")
+
+# Initialize session state to avoid duplicate submissions
+if 'form_submitted' not in st.session_state:
+    st.session_state.form_submitted = False
+
+# Only the open section is loaded and drawn; unlike st.tabs, the other
+# sections cost nothing until they are opened
+section = st.radio("Section", SECTIONS, horizontal=True, key="training_section", label_visibility="collapsed")
+
+# The section's reads are issued at once on a full rerun; its fragments get
+# their data from here, or from the cache when only they rerun
+page_data = load_page_data(**section_queries(section))
+players_df = page_data['players']
+
+if section == "Group Training Schedule":
+    st.header("Group Training Schedule")
+    
+    # Add new group training session
+    new_session_form()
+    
+    show_import_form('group_training_sessions', "Group Sessions")
+    
+    recurring_sessions_panel()
+    
+    session_allocation_panel()
+    
+    # View upcoming group sessions
+    upcoming_sessions(players_df)
+
+elif section == "Individual Training Plans":
+    st.header("Individual Training Plans")
+    
+    if not players_df.empty:
+        # Create individual training plan
+        training_plan_form(players_df)
+
+elif section == "Group Training Reports":
+    st.header("Group Training Reports")
+    
+    # Add new group training report
+    group_report_form(players_df, page_data['group_sessions'])
+
+elif section == "Individual Training Reports":
+    st.header("Individual Training Reports")
+    
+    # Add new individual training report
+    individual_report_form(players_df, page_data['training_plans'])
+
+# With the section drawn, warm the caches of the others in the background so
+# that switching to them does not wait for the database
+prefetch(*(
+    page_query
+    for other in SECTIONS if other != section
+    for page_query in section_queries(other).values()
+))
 
 # Reset the form_submitted state if we're not in the middle of a form submission
 if st.session_state.form_submitted:
-    st.session_state.form_submitted = False
\ No newline at end of file
+    st.session_state.form_submitted = False
+
+end_rerun()
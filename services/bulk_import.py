@@ -0,0 +1,280 @@
+"""Bulk import of players, group sessions and tournaments from CSV or Excel.
+
+Files are read in chunks of IMPORT_CHUNK_SIZE rows. Each chunk is validated
+with vectorized checks mirroring the CHECK constraints of
+``database/database_setup.sql``, and its valid rows are inserted in batches of
+``batch_size``. Invalid rows, and rows Supabase rejects, go to a per-row error
+report instead of aborting the file.
+"""
+import io
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import pandas as pd
+import streamlit as st
+
+from services.repository import AGE_GROUPS, PLAYER_LEVELS, get_client, invalidate, mirror_write
+
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_BATCH_SIZE = 500
+
+# Header row plus 1-based numbering, so reported rows match the spreadsheet
+FIRST_DATA_ROW = 2
+
+# Accepted time formats; anything else, such as a bare date, is rejected
+TIME_FORMATS = ('%H:%M:%S', '%H:%M')
+
+
+class ImportSpec(NamedTuple):
+    table: str
+    required: tuple
+    optional: tuple = ()
+    # Allowed values per column
+    choices: Optional[dict] = None
+    dates: tuple = ()
+    times: tuple = ()
+    integers: tuple = ()
+    # (earlier, later) date columns that must not be out of order
+    ordered: tuple = ()
+    unique: tuple = ()
+
+
+IMPORT_SPECS = {
+    'players': ImportSpec(
+        table='players',
+        required=('first_name', 'last_name', 'birth_date'),
+        optional=('email', 'phone', 'level', 'age_group', 'notes'),
+        choices={'level': PLAYER_LEVELS, 'age_group': AGE_GROUPS},
+        dates=('birth_date',),
+        unique=('email',),
+    ),
+    'group_training_sessions': ImportSpec(
+        table='group_training_sessions',
+        required=('date', 'time'),
+        optional=('level', 'max_participants', 'notes'),
+        choices={'level': PLAYER_LEVELS},
+        dates=('date',),
+        times=('time',),
+        integers=('max_participants',),
+    ),
+    'tournaments': ImportSpec(
+        table='tournaments',
+        required=('name', 'start_date', 'end_date', 'location'),
+        optional=('type', 'level', 'age_group', 'description'),
+        choices={
+            'type': ['Singles', 'Doubles', 'Mixed'],
+            'level': ['Local', 'Regional', 'National', 'International'],
+            'age_group': AGE_GROUPS,
+        },
+        dates=('start_date', 'end_date'),
+        ordered=(('start_date', 'end_date'),),
+    ),
+}
+
+
+class ImportReport(NamedTuple):
+    inserted: int
+    errors: pd.DataFrame
+
+    @property
+    def failed(self):
+        return self.errors['row'].nunique() if not self.errors.empty else 0
+
+
+def read_chunks(file, filename, chunk_size=IMPORT_CHUNK_SIZE):
+    """Yield the rows of a CSV or Excel file as string DataFrames of up to ``chunk_size`` rows."""
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        yield from _read_excel_chunks(file, chunk_size)
+    else:
+        yield from pd.read_csv(file, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+
+def _read_excel_chunks(file, chunk_size):
+    # openpyxl's read-only mode streams rows instead of loading the whole workbook
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else '' for value in next(rows, ())]
+        batch = []
+        for row in rows:
+            batch.append(['' if value is None else _cell_text(value) for value in row])
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def _cell_text(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    return str(value)
+
+
+def validate_chunk(chunk: pd.DataFrame, spec: ImportSpec, first_row: int):
+    """Split a chunk into insertable records and a DataFrame of ``(row, column, error)``.
+
+    Every check runs on whole columns; a row with several problems gets one
+    error line per problem.
+    """
+    chunk = chunk.rename(columns=lambda column: str(column).strip().lower().replace(' ', '_'))
+    rows = pd.RangeIndex(first_row, first_row + len(chunk))
+    chunk = chunk.set_axis(rows)
+    errors = []
+
+    def reject(mask, column, message):
+        # Comparisons involving missing values are left to the required checks
+        mask = mask.fillna(False).astype(bool)
+        if mask.any():
+            errors.append(pd.DataFrame({'row': rows[mask.to_numpy()], 'column': column, 'error': message}))
+
+    missing = [column for column in spec.required if column not in chunk.columns]
+    if missing:
+        message = f"missing column{'s' if len(missing) > 1 else ''}: {', '.join(missing)}"
+        return [], pd.DataFrame({'row': rows, 'column': ', '.join(missing), 'error': message})
+
+    columns = [column for column in (*spec.required, *spec.optional) if column in chunk.columns]
+    values = chunk[columns].apply(lambda column: column.astype('string').str.strip()).replace('', pd.NA)
+
+    for column in spec.required:
+        reject(values[column].isna(), column, "required")
+    for column, allowed in (spec.choices or {}).items():
+        if column in values:
+            reject(values[column].notna() & ~values[column].isin(allowed), column, f"must be one of {', '.join(allowed)}")
+    for column in spec.dates:
+        parsed = pd.to_datetime(values[column], format='ISO8601', errors='coerce')
+        reject(values[column].notna() & parsed.isna(), column, "not a YYYY-MM-DD date")
+        values[column] = parsed.dt.strftime('%Y-%m-%d').astype('string')
+    for column in spec.times:
+        parsed = pd.Series(pd.NaT, index=values.index)
+        for time_format in TIME_FORMATS:
+            parsed = parsed.fillna(pd.to_datetime(values[column], format=time_format, errors='coerce'))
+        reject(values[column].notna() & parsed.isna(), column, "not an HH:MM time")
+        values[column] = parsed.dt.strftime('%H:%M:%S').astype('string')
+    for column in spec.integers:
+        if column in values:
+            parsed = pd.to_numeric(values[column], errors='coerce')
+            reject(values[column].notna() & (parsed.isna() | (parsed % 1 != 0) | (parsed < 1)), column, "must be a positive whole number")
+            values[column] = parsed.where(parsed % 1 == 0).astype('Int64')
+    for earlier, later in spec.ordered:
+        reject(values[later] < values[earlier], later, f"before {earlier}")
+    for column in spec.unique:
+        if column in values:
+            key = values[column].str.lower()
+            reject(key.notna() & key.duplicated(keep='first'), column, "duplicated in the file")
+
+    errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=['row', 'column', 'error'])
+    valid = values.loc[~values.index.isin(errors['row'])]
+    # NA becomes None so the JSON payload carries nulls
+    records = valid.astype(object).where(valid.notna(), None).reset_index(names='row').to_dict('records')
+    return records, errors
+
+
+def _insert_rows(table, rows):
+    response = get_client().table(table).insert(rows).execute()
+    mirror_write(table, response.data)
+    return len(rows)
+
+
+def _insert_batch(table, records):
+    # One request per batch; if Supabase rejects it, retry row by row to find the culprits
+    rows = [{key: value for key, value in record.items() if key != 'row'} for record in records]
+    if len(rows) > 1:
+        try:
+            return _insert_rows(table, rows), []
+        except Exception:
+            pass
+    inserted, errors = 0, []
+    for record, row in zip(records, rows):
+        try:
+            inserted += _insert_rows(table, [row])
+        except Exception as e:
+            errors.append({'row': record['row'], 'column': '', 'error': getattr(e, 'message', None) or str(e)})
+    return inserted, errors
+
+
+def import_file(file, filename, kind, batch_size=IMPORT_BATCH_SIZE, progress=None) -> ImportReport:
+    """Validate and insert every row of ``file`` into the table of ``kind``.
+
+    ``progress`` is called with the number of rows processed so far.
+    """
+    spec = IMPORT_SPECS[kind]
+    created_at = datetime.now().isoformat()
+    inserted, processed, errors = 0, 0, []
+    seen = {column: set() for column in spec.unique}
+    for chunk in read_chunks(file, filename):
+        records, chunk_errors = validate_chunk(chunk, spec, FIRST_DATA_ROW + processed)
+        processed += len(chunk)
+        errors.append(chunk_errors)
+
+        # Values repeated across chunks are caught here; within a chunk by validate_chunk
+        for column, values in seen.items():
+            kept = []
+            for record in records:
+                value = record.get(column)
+                if value is not None and value.lower() in values:
+                    errors.append(pd.DataFrame([{'row': record['row'], 'column': column, 'error': "duplicated in the file"}]))
+                    continue
+                if value is not None:
+                    values.add(value.lower())
+                kept.append(record)
+            records = kept
+
+        for record in records:
+            record['created_at'] = created_at
+        for start in range(0, len(records), batch_size):
+            added, batch_errors = _insert_batch(spec.table, records[start:start + batch_size])
+            inserted += added
+            if batch_errors:
+                errors.append(pd.DataFrame(batch_errors))
+        if progress:
+            progress(processed)
+
+    if inserted:
+        invalidate(spec.table)
+    errors = [frame for frame in errors if not frame.empty]
+    error_df = pd.concat(errors, ignore_index=True).sort_values('row', kind='stable') if errors else pd.DataFrame(columns=['row', 'column', 'error'])
+    return ImportReport(inserted, error_df)
+
+
+def show_import_form(kind, label):
+    """File uploader, batch size and error report for importing ``kind`` rows."""
+    spec = IMPORT_SPECS[kind]
+    with st.expander(f"Import {label} from CSV/Excel"):
+        st.caption(
+            f"Required columns: {', '.join(spec.required)}. "
+            f"Optional: {', '.join(spec.optional)}. Dates as YYYY-MM-DD."
+        )
+        uploaded = st.file_uploader("File", type=['csv', 'xlsx'], key=f"import_{kind}_file")
+        batch_size = st.number_input(
+            "Rows per request", min_value=1, max_value=5000, value=IMPORT_BATCH_SIZE, key=f"import_{kind}_batch"
+        )
+        if uploaded is None or not st.button(f"Import {label}", key=f"import_{kind}_button"):
+            return None
+
+        status = st.empty()
+        try:
+            report = import_file(
+                uploaded, uploaded.name, kind, int(batch_size),
+                progress=lambda rows: status.caption(f"{rows} rows processed…"),
+            )
+        except Exception as e:
+            st.error(f"Error reading {uploaded.name}: {str(e)}")
+            return None
+
+        status.empty()
+        st.success(f"Imported {report.inserted} {label.lower()}.")
+        if not report.errors.empty:
+            st.warning(f"{report.failed} rows were not imported.")
+            st.dataframe(report.errors, hide_index=True, use_container_width=True)
+            buffer = io.StringIO()
+            report.errors.to_csv(buffer, index=False)
+            st.download_button(
+                "Download error report", buffer.getvalue(), file_name=f"{kind}_import_errors.csv",
+                mime='text/csv', key=f"import_{kind}_errors"
+            )
+        return report
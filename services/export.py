@@ -0,0 +1,246 @@
+"""Streaming export of training reports, PSE scores and attendance.
+
+Reports and sessions in the date window are read one range-request page at a
+time, the scores or attendance of each page are fetched by id, and every
+joined page is written out before the next one is read. Memory therefore
+depends on the page size, not on the size of the export while it is written.
+Serving the file is another matter: Streamlit 1.40's download_button only
+takes the whole payload, so the finished file is read into memory to offer it.
+"""
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from services.repository import iter_pages, order_by, read_client, select_in
+
+# Export files live in one directory per browser session under this one
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'training_exports')
+
+EXPORT_PAGE_SIZE = 1000
+
+# Parquet row groups are filled up to this many rows before being written
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+EXPORT_DATASETS = {
+    'pse_scores': "PSE scores",
+    'training_reports': "Training reports",
+    'attendance': "Attendance",
+}
+
+# Output columns and their pandas dtypes, fixed so every page shares one Parquet schema
+EXPORT_COLUMNS = {
+    'pse_scores': {
+        'report_date': 'string',
+        'training_type': 'string',
+        'session_id': 'string',
+        'training_plan_id': 'string',
+        'report_id': 'string',
+        'performance_rating': 'Int64',
+        'player_id': 'string',
+        'player_name': 'string',
+        'pse_score': 'Int64',
+    },
+    'training_reports': {
+        'id': 'string',
+        'report_date': 'string',
+        'training_type': 'string',
+        'session_id': 'string',
+        'training_plan_id': 'string',
+        'performance_rating': 'Int64',
+        'attendance': 'string',
+        'achievements': 'string',
+        'areas_for_improvement': 'string',
+        'coach_notes': 'string',
+        'created_at': 'string',
+    },
+    'attendance': {
+        'session_date': 'string',
+        'session_time': 'string',
+        'session_level': 'string',
+        'session_id': 'string',
+        'player_id': 'string',
+        'player_name': 'string',
+        'attendance_status': 'string',
+    },
+}
+
+REPORT_COLUMNS = ','.join(EXPORT_COLUMNS['training_reports'])
+
+
+def _typed(frame, dataset):
+    columns = EXPORT_COLUMNS[dataset]
+    return frame.reindex(columns=list(columns)).astype(columns)
+
+
+def _report_pages(start_date, end_date, page_size):
+    def build_query():
+        query = read_client().table('training_reports')\
+            .select(REPORT_COLUMNS)\
+            .gte('report_date', start_date)\
+            .lte('report_date', end_date)
+        return order_by(query, ('report_date', 'id'))
+
+    for rows in iter_pages(build_query, page_size):
+        yield pd.DataFrame(rows)
+
+
+def _player_filter(player_id):
+    return {'player_id': player_id} if player_id else {}
+
+
+def _pse_score_pages(start_date, end_date, player_id, player_names, page_size):
+    for reports_df in _report_pages(start_date, end_date, page_size):
+        scores_df = select_in(
+            'player_pse_scores', 'report_id', reports_df['id'], 'report_id,player_id,pse_score',
+            **_player_filter(player_id)
+        )
+        if scores_df.empty:
+            continue
+        page_df = scores_df.merge(reports_df.rename(columns={'id': 'report_id'}), on='report_id')
+        page_df['player_name'] = page_df['player_id'].map(player_names)
+        yield page_df.sort_values(['report_date', 'report_id'], kind='stable')
+
+
+def _training_report_pages(start_date, end_date, player_id, page_size):
+    for reports_df in _report_pages(start_date, end_date, page_size):
+        if player_id:
+            # A player took part in a report if they have a PSE score on it
+            scored = select_in('player_pse_scores', 'report_id', reports_df['id'], 'report_id', player_id=player_id)
+            reports_df = reports_df[reports_df['id'].isin(scored.get('report_id', []))]
+        if reports_df.empty:
+            continue
+        reports_df = reports_df.assign(attendance=reports_df['attendance'].map(
+            lambda names: '; '.join(names) if isinstance(names, list) else names
+        ))
+        yield reports_df
+
+
+def _attendance_pages(start_date, end_date, player_id, player_names, page_size):
+    def build_query():
+        query = read_client().table('group_training_sessions')\
+            .select('id,date,time,level')\
+            .gte('date', start_date)\
+            .lte('date', end_date)
+        return order_by(query, ('date', 'time', 'id'))
+
+    for rows in iter_pages(build_query, page_size):
+        sessions_df = pd.DataFrame(rows).rename(columns={
+            'id': 'session_id', 'date': 'session_date', 'time': 'session_time', 'level': 'session_level',
+        })
+        attendance_df = select_in(
+            'group_training_attendance', 'session_id', sessions_df['session_id'],
+            'session_id,player_id,attendance_status', **_player_filter(player_id)
+        )
+        if attendance_df.empty:
+            continue
+        page_df = attendance_df.merge(sessions_df, on='session_id')
+        page_df['player_name'] = page_df['player_id'].map(player_names)
+        yield page_df.sort_values(['session_date', 'session_time', 'session_id'], kind='stable')
+
+
+def export_pages(dataset, start_date, end_date, player_id=None, player_names=None, page_size=EXPORT_PAGE_SIZE):
+    """Yield the rows of ``dataset`` dated within ``[start_date, end_date]`` as typed DataFrames.
+
+    ``player_names`` maps player ids to the names written to the ``player_name`` column.
+    """
+    start_date, end_date = str(start_date), str(end_date)
+    player_names = player_names if player_names is not None else pd.Series(dtype='string')
+    if dataset == 'pse_scores':
+        pages = _pse_score_pages(start_date, end_date, player_id, player_names, page_size)
+    elif dataset == 'training_reports':
+        pages = _training_report_pages(start_date, end_date, player_id, page_size)
+    elif dataset == 'attendance':
+        pages = _attendance_pages(start_date, end_date, player_id, player_names, page_size)
+    else:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+    for page_df in pages:
+        yield _typed(page_df, dataset)
+
+
+def write_csv(pages, path, dataset):
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        _typed(pd.DataFrame(), dataset).to_csv(f, index=False)
+        for page_df in pages:
+            page_df.to_csv(f, index=False, header=False)
+            rows += len(page_df)
+    return rows
+
+
+def write_parquet(pages, path, dataset, row_group_size=PARQUET_ROW_GROUP_SIZE):
+    # pyarrow comes with Streamlit
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(_typed(pd.DataFrame(), dataset), preserve_index=False)
+    rows, buffered, buffered_rows = 0, [], 0
+    with pq.ParquetWriter(path, schema) as writer:
+        def flush():
+            if buffered:
+                writer.write_table(pa.Table.from_pandas(pd.concat(buffered), schema=schema, preserve_index=False))
+                buffered.clear()
+
+        for page_df in pages:
+            buffered.append(page_df)
+            buffered_rows += len(page_df)
+            rows += len(page_df)
+            if buffered_rows >= row_group_size:
+                flush()
+                buffered_rows = 0
+        flush()
+    return rows
+
+
+def export_directory():
+    """This session's directory for export files.
+
+    The directories of sessions that have ended are removed first, so files
+    left behind when a browser tab closes are cleaned up by the next export.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    session_id = ctx.session_id if ctx else 'bare'
+    if runtime.exists() and os.path.isdir(EXPORT_DIR):
+        for name in os.listdir(EXPORT_DIR):
+            if name != session_id and not runtime.get_instance().is_active_session(name):
+                shutil.rmtree(os.path.join(EXPORT_DIR, name), ignore_errors=True)
+    directory = os.path.join(EXPORT_DIR, session_id)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def export_to_file(dataset, file_format, start_date, end_date, player_id=None, player_names=None, progress=None):
+    """Write an export to a file in :func:`export_directory`; returns ``(path, rows)``.
+
+    ``progress`` is called with the number of rows read so far. The caller
+    should delete the file once it is replaced; files of ended sessions are
+    removed by the next export.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+
+    def counted(pages):
+        rows = 0
+        for page_df in pages:
+            rows += len(page_df)
+            if progress:
+                progress(rows)
+            yield page_df
+
+    pages = counted(export_pages(dataset, start_date, end_date, player_id, player_names))
+    fd, path = tempfile.mkstemp(prefix=f'{dataset}_', suffix=f'.{file_format}', dir=export_directory())
+    os.close(fd)
+    try:
+        if file_format == 'csv':
+            rows = write_csv(pages, path, dataset)
+        else:
+            rows = write_parquet(pages, path, dataset)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, rows
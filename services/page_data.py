@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait
+from typing import Any, Callable, NamedTuple
+
+import pandas as pd
+
+from services.query_log import current_log, recording
+from services.repository import collect_errors, get_client, get_replica, report_error
+
+# A page's independent reads run side by side on a small pool shared by all sessions
+QUERY_WORKERS = 8
+QUERY_TIMEOUT = 20
+
+# Background reads get a pool of their own, so that however many sessions are
+# prefetching, they never queue ahead of a page's blocking reads
+PREFETCH_WORKERS = 2
+
+_executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='page-query')
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='page-prefetch')
+
+# Background reads still running, by (loader, args), so that a page waits for
+# them instead of issuing the same read again. Reentrant because a done
+# callback runs on the submitting thread if the read has already finished
+_prefetching = {}
+_prefetching_lock = threading.RLock()
+
+
+class Query(NamedTuple):
+    loader: Callable
+    args: tuple
+    empty: Any
+
+
+def query(loader, *args, empty=None) -> Query:
+    """Declare one read of a page: ``loader(*args)``.
+
+    ``empty`` is returned if the read fails or times out, an empty DataFrame by default.
+    """
+    return Query(loader, args, empty)
+
+
+def _empty(page_query):
+    return pd.DataFrame() if page_query.empty is None else page_query.empty
+
+
+def _run(page_query, log):
+    with collect_errors() as errors, recording(log):
+        return page_query.loader(*page_query.args), errors
+
+
+def _page_future(page_query, log):
+    # Join a background read that has started; one still queued behind other
+    # prefetches is cancelled and run on the page pool instead
+    prefetched = _prefetching.get((page_query.loader, page_query.args))
+    if prefetched is not None and not prefetched.cancel():
+        return prefetched
+    return _executor.submit(_run, page_query, log)
+
+
+def load_page_data(timeout=QUERY_TIMEOUT, **queries) -> dict:
+    """Run a page's independent reads concurrently and return the results by name.
+
+    The page waits for its slowest read instead of the sum of all of them. Each
+    read is isolated: one that fails or takes longer than ``timeout`` seconds
+    shows its error and yields its empty value, and the others still return.
+    """
+    # Create the shared clients here rather than racing to do it on the workers
+    get_client()
+    get_replica()
+    log = current_log()
+    with _prefetching_lock:
+        futures = {name: _page_future(page_query, log) for name, page_query in queries.items()}
+    deadline = time.monotonic() + timeout
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name], errors = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            future.cancel()
+            report_error(f"Error loading {name}: no response after {timeout} seconds")
+            results[name] = _empty(queries[name])
+            continue
+        except Exception as e:
+            report_error(f"Error loading {name}: {str(e)}")
+            results[name] = _empty(queries[name])
+            continue
+        for message in errors:
+            report_error(message)
+    return results
+
+
+def prefetch(*queries):
+    """Start ``queries`` in the background and return without waiting for them.
+
+    Meant for reads the user is likely to need next: their results land in the
+    loaders' caches, and a later load_page_data of the same read waits for the
+    running one. Errors are dropped; the read is retried when it is needed.
+    """
+    get_client()
+    get_replica()
+    with _prefetching_lock:
+        for page_query in queries:
+            key = (page_query.loader, page_query.args)
+            if key in _prefetching:
+                continue
+            future = _prefetch_executor.submit(_run, page_query, None)
+            _prefetching[key] = future
+            future.add_done_callback(lambda _, key=key: _forget(key))
+
+
+def _forget(key):
+    with _prefetching_lock:
+        _prefetching.pop(key, None)
+
+
+def wait_for_prefetch(timeout=QUERY_TIMEOUT):
+    """Block until the background reads started so far have finished, e.g. in benchmarks."""
+    with _prefetching_lock:
+        futures = list(_prefetching.values())
+    wait(futures, timeout=timeout)
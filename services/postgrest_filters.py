@@ -0,0 +1,22 @@
+"""PostgREST filter expressions shared by the repository and the replica."""
+
+
+def quote(value):
+    # PostgREST accepts reserved characters such as , . ( ) inside double quotes
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def after_key(columns, cursor, descending=False):
+    """Logic-tree condition for rows strictly after ``cursor`` in ``columns`` order.
+
+    (a > x) or (a = x and b > y) or (a = x and b = y and c > z), as one
+    condition that can be nested in an ``and(...)`` tree.
+    """
+    operator = 'lt' if descending else 'gt'
+    branches = []
+    for position, column in enumerate(columns):
+        terms = [f"{key}.eq.{quote(value)}" for key, value in zip(columns[:position], cursor)]
+        terms.append(f"{column}.{operator}.{quote(cursor[position])}")
+        branches.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return branches[0] if len(branches) == 1 else f"or({','.join(branches)})"
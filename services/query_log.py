@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# The same query shape this many times in one rerun is reported as a likely N+1 pattern
+N_PLUS_ONE_THRESHOLD = 3
+SLOWEST_QUERIES = 10
+FILTERS_DISPLAY_LENGTH = 120
+
+# Query parameters that describe the result rather than which rows are read
+SHAPE_IGNORED_PARAMS = {'select', 'order', 'limit', 'offset'}
+
+# The log of the rerun running on this thread
+_active = threading.local()
+
+
+class QueryRecord(NamedTuple):
+    method: str
+    table: str
+    filters: str
+    range: str
+    shape: str
+    rows: int
+    bytes: int
+    started: float
+    seconds: float
+
+
+class RerunLog:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.records = []
+
+    def db_wall_seconds(self):
+        # Concurrent queries overlap, so merge their intervals instead of summing latencies
+        total, covered_until = 0.0, 0.0
+        for record in sorted(self.records, key=lambda record: record.started):
+            end = record.started + record.seconds
+            if end > covered_until:
+                total += end - max(record.started, covered_until)
+                covered_until = end
+        return total
+
+    def repeated_queries(self):
+        """``(shape, count, identical)`` for likely N+1 patterns in this rerun.
+
+        A shape is reported when it ran with N_PLUS_ONE_THRESHOLD or more
+        different filter values, or when the exact same query ran more than
+        once. Pages of one range-paged read count as a single query.
+        """
+        requests_by_shape = defaultdict(list)
+        for record in self.records:
+            requests_by_shape[record.shape].append((record.filters, record.range))
+        repeated = []
+        for shape, requests in requests_by_shape.items():
+            identical = len(set(requests)) < len(requests)
+            variants = len({filters for filters, _ in requests})
+            if identical or variants >= N_PLUS_ONE_THRESHOLD:
+                repeated.append((shape, len(requests), identical))
+        return repeated
+
+
+def _describe(request):
+    path = request.url.path
+    table = path.split('/rest/v1/', 1)[-1]
+    params = list(request.url.params.multi_items())
+    filters = '&'.join(f'{key}={value}' for key, value in params if key != 'select')
+    # Filter names and operators without their values, e.g. "GET training_reports session_id=eq"
+    shape_terms = sorted(
+        f"{key}={value.split('.', 1)[0]}" if key not in ('or', 'and') else key
+        for key, value in params
+        if key not in SHAPE_IGNORED_PARAMS
+    )
+    return table, filters, f"{request.method} {table} {' '.join(shape_terms)}".rstrip()
+
+
+def _row_count(response):
+    # "0-49/120" or "*/0"; writes return a JSON array of the affected rows
+    content_range = response.headers.get('content-range', '')
+    if '-' in content_range.split('/')[0]:
+        first, last = content_range.split('/')[0].split('-')
+        return int(last) - int(first) + 1
+    if response.content.startswith(b'['):
+        return len(response.json())
+    return 0
+
+
+def _on_request(request):
+    request.extensions['query_started'] = time.perf_counter()
+
+
+def _on_response(response):
+    log = getattr(_active, 'log', None)
+    response.read()
+    request = response.request
+    started = request.extensions.get('query_started', time.perf_counter())
+    table, filters, shape = _describe(request)
+    record = QueryRecord(
+        request.method,
+        table,
+        filters,
+        request.headers.get('range', ''),
+        shape,
+        _row_count(response),
+        len(response.content),
+        started,
+        time.perf_counter() - started,
+    )
+    if log is not None:
+        log.records.append(record)
+    logger.debug(json.dumps({
+        'event': 'query',
+        'page': log.page if log else None,
+        'method': record.method,
+        'table': record.table,
+        'filters': record.filters,
+        'rows': record.rows,
+        'bytes': record.bytes,
+        'ms': round(record.seconds * 1000, 1),
+        'status': response.status_code,
+    }))
+
+
+def instrument_client(client):
+    """Record every PostgREST request made through ``client`` in the active rerun log."""
+    hooks = client.postgrest.session.event_hooks
+    hooks['request'].append(_on_request)
+    hooks['response'].append(_on_response)
+    return client
+
+
+def current_log():
+    return getattr(_active, 'log', None)
+
+
+@contextmanager
+def recording(log):
+    """Attribute the queries made on this thread to ``log``, e.g. from a worker thread."""
+    previous = getattr(_active, 'log', None)
+    _active.log = log
+    try:
+        yield log
+    finally:
+        _active.log = previous
+
+
+def begin_rerun(page):
+    """Start a new query log for this run of ``page``; call before its first query."""
+    _active.log = RerunLog(page)
+    return _active.log
+
+
+@contextmanager
+def fragment_rerun(page):
+    """Log the queries of a fragment on their own when only the fragment reruns.
+
+    Use as a decorator below ``@st.fragment``. During a full rerun the
+    fragment's queries are part of the page's log. The performance panel is not
+    shown for fragment reruns because fragments cannot write to the sidebar.
+    """
+    if current_log() is not None:
+        yield current_log()
+        return
+    log = begin_rerun(page)
+    try:
+        yield log
+    finally:
+        end_rerun(show_panel=False)
+
+
+def panel_enabled():
+    # Opt in per browser with ?perf=1, or for every session with PERFORMANCE_PANEL=1
+    return os.getenv('PERFORMANCE_PANEL') == '1' or st.query_params.get('perf') == '1'
+
+
+def end_rerun(show_panel=True):
+    """Log the rerun summary and, if enabled, show the performance panel in the sidebar."""
+    log = getattr(_active, 'log', None)
+    if log is None:
+        return
+    _active.log = None
+
+    total_seconds = time.perf_counter() - log.started
+    db_seconds = log.db_wall_seconds()
+    repeated = log.repeated_queries()
+    logger.info(json.dumps({
+        'event': 'rerun',
+        'page': log.page,
+        'queries': len(log.records),
+        'rows': sum(record.rows for record in log.records),
+        'bytes': sum(record.bytes for record in log.records),
+        'total_ms': round(total_seconds * 1000, 1),
+        'db_ms': round(db_seconds * 1000, 1),
+    }))
+    for shape, count, identical in repeated:
+        logger.warning(json.dumps({
+            'event': 'repeated_query',
+            'page': log.page,
+            'shape': shape,
+            'count': count,
+            'identical': identical,
+        }))
+
+    if show_panel and panel_enabled():
+        _show_panel(log, total_seconds, db_seconds, repeated)
+
+
+def _show_panel(log, total_seconds, db_seconds, repeated):
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rerun", f"{total_seconds * 1000:.0f} ms")
+        col2.metric("Database", f"{db_seconds * 1000:.0f} ms")
+        col3.metric("Rendering", f"{max(total_seconds - db_seconds, 0) * 1000:.0f} ms")
+        st.caption(
+            f"{len(log.records)} queries · {sum(record.rows for record in log.records)} rows · "
+            f"{sum(record.bytes for record in log.records) / 1024:.1f} kB"
+        )
+
+        for shape, count, identical in repeated:
+            kind = "identical" if identical else "same-shaped"
+            st.warning(f"{count} {kind} queries, likely N+1: `{shape}`")
+
+        if log.records:
+            slowest = pd.DataFrame(log.records).nlargest(SLOWEST_QUERIES, 'seconds')
+            slowest['ms'] = (slowest['seconds'] * 1000).round(1)
+            slowest['kB'] = (slowest['bytes'] / 1024).round(1)
+            slowest['filters'] = slowest['filters'].str.slice(0, FILTERS_DISPLAY_LENGTH)
+            st.dataframe(
+                slowest[['table', 'method', 'ms', 'rows', 'kB', 'filters']],
+                hide_index=True,
+                use_container_width=True
+            )
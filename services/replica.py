@@ -0,0 +1,199 @@
+"""Optional local SQLite replica of the Supabase tables.
+
+Once the first sync has completed, every loader reads from the replica instead
+of Supabase, so page loads no longer wait on the network. A background thread
+keeps it current by pulling, for each table, the rows whose timestamps are at
+or after the table's watermark. Writes still go to Supabase; the rows it
+returns are applied to the replica immediately.
+
+Deletes are not mirrored, as the app never deletes rows; remove the replica
+file to rebuild it from scratch.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from services.postgrest_filters import after_key, quote
+from services.query_log import instrument_client
+from services.sqlite_postgrest import SQLiteClient, create_database
+
+logger = logging.getLogger(__name__)
+
+# Tables in sync order, with the timestamp columns a change shows up in
+REPLICA_TABLES = {
+    'players': ('created_at', 'updated_at'),
+    'tournaments': ('created_at',),
+    'training_plans': ('created_at',),
+    'group_training_sessions': ('created_at',),
+    'training_reports': ('created_at',),
+    'player_pse_scores': ('created_at', 'updated_at'),
+    'group_training_attendance': ('created_at',),
+    'tournament_registrations': ('registration_date',),
+    'player_training_summary': ('updated_at',),
+    'group_session_waitlist': ('created_at', 'updated_at'),
+}
+PRIMARY_KEYS = {
+    'player_training_summary': ('player_id', 'bucket', 'bucket_start'),
+}
+
+SYNC_PAGE_SIZE = 1000
+SYNC_INTERVAL = 60
+
+# Rows committed slightly out of timestamp order are caught by re-reading a
+# window before the watermark; re-applying a row is harmless
+SYNC_OVERLAP = timedelta(minutes=5)
+
+CREATE_WATERMARKS_TABLE = """
+CREATE TABLE IF NOT EXISTS replica_watermarks (
+    table_name TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT NOT NULL
+)
+"""
+
+
+def _timestamp(value):
+    timestamp = datetime.fromisoformat(value)
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+class Replica:
+    def __init__(self, path, remote_client, on_change=None):
+        """``remote_client`` returns the Supabase client; ``on_change`` is called with the changed table names."""
+        self.conn = create_database(path, with_triggers=False)
+        # A mirror of rows the server already validated, pulled table by table
+        self.conn.execute('PRAGMA foreign_keys = OFF')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute(CREATE_WATERMARKS_TABLE)
+        self.conn.commit()
+        self.client = instrument_client(SQLiteClient(self.conn))
+        self.remote_client = remote_client
+        self.on_change = on_change
+        self.last_sync = None
+        self.last_error = None
+        self._columns = {
+            table: [row['name'] for row in self.conn.execute(f'PRAGMA table_info("{table}")')]
+            for table in REPLICA_TABLES
+        }
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        """Whether every table has completed its initial bulk pull."""
+        with self.client.lock:
+            synced = self.conn.execute('SELECT count(*) FROM replica_watermarks').fetchone()[0]
+        return synced == len(REPLICA_TABLES)
+
+    def watermark(self, table):
+        with self.client.lock:
+            row = self.conn.execute('SELECT watermark FROM replica_watermarks WHERE table_name = ?', (table,)).fetchone()
+        return row['watermark'] if row else None
+
+    def apply(self, table, rows):
+        """Upsert rows returned by Supabase into the replica; returns the number of rows that changed."""
+        if not rows:
+            return 0
+        columns = [column for column in self._columns[table] if column in rows[0]]
+        key = PRIMARY_KEYS.get(table, ('id',))
+        names = ', '.join(f'"{column}"' for column in columns)
+        values = [column for column in columns if column not in key]
+        if values:
+            # Rows re-read in the overlap window are left alone unless they differ
+            conflict = (
+                'UPDATE SET ' + ', '.join(f'"{column}" = excluded."{column}"' for column in values) +
+                f' WHERE ({", ".join(f"{table}.{column}" for column in values)}) IS NOT '
+                f'({", ".join(f"excluded.{column}" for column in values)})'
+            )
+        else:
+            conflict = 'NOTHING'
+        statement = (
+            f'INSERT INTO "{table}" ({names}) VALUES ({", ".join("?" * len(columns))}) '
+            f'ON CONFLICT ({", ".join(key)}) DO {conflict}'
+        )
+        with self.client.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(statement, [
+                [self.client.encode_row(table, row).get(column) for column in columns] for row in rows
+            ])
+            return self.conn.total_changes - before
+
+    def _pull(self, table, since):
+        # Keyset pages in primary key order, so rows inserted meanwhile cannot shift a page
+        client = self.remote_client()
+        key = PRIMARY_KEYS.get(table, ('id',))
+        cursor = None
+        while True:
+            conditions = []
+            if since is not None:
+                conditions.append('or(' + ','.join(f'{column}.gte.{quote(since)}' for column in REPLICA_TABLES[table]) + ')')
+            if cursor is not None:
+                conditions.append(after_key(key, cursor))
+            query = client.table(table).select(','.join(self._columns[table]))
+            if conditions:
+                query.params = query.params.add('and', f"({','.join(conditions)})")
+            query.params = query.params.add('order', ','.join(key))
+            rows = query.limit(SYNC_PAGE_SIZE).execute().data
+            yield rows
+            if len(rows) < SYNC_PAGE_SIZE:
+                return
+            cursor = [rows[-1][column] for column in key]
+
+    def sync_table(self, table):
+        """Pull the changes of one table and advance its watermark; returns the number of rows that changed."""
+        watermark = self.watermark(table)
+        since = None if watermark is None else (_timestamp(watermark) - SYNC_OVERLAP).isoformat()
+        changed = 0
+        latest = _timestamp(watermark) if watermark else None
+        for rows in self._pull(table, since):
+            changed += self.apply(table, rows)
+            for row in rows:
+                for column in REPLICA_TABLES[table]:
+                    if row.get(column) and (latest is None or _timestamp(row[column]) > latest):
+                        latest = _timestamp(row[column])
+
+        with self.client.lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO replica_watermarks (table_name, watermark, synced_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (table_name) DO UPDATE SET watermark = excluded.watermark, synced_at = excluded.synced_at',
+                (table, latest.isoformat() if latest else None, datetime.now(timezone.utc).isoformat()),
+            )
+        return changed
+
+    def sync(self):
+        """One delta pull of every table; returns the row counts of the tables that changed."""
+        with self._sync_lock:
+            changed = {}
+            for table in REPLICA_TABLES:
+                count = self.sync_table(table)
+                if count:
+                    changed[table] = count
+            self.last_sync = datetime.now(timezone.utc)
+            self.last_error = None
+        if changed and self.on_change:
+            self.on_change(*changed)
+        return changed
+
+    def request_sync(self):
+        self._wake.set()
+
+    def start(self, interval=SYNC_INTERVAL):
+        """Sync in a background thread now and then every ``interval`` seconds."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='replica-sync', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self, interval):
+        while True:
+            try:
+                changed = self.sync()
+                if changed:
+                    logger.info("replica pulled %s", changed)
+            except Exception as e:
+                # Offline or Supabase unreachable; the replica keeps serving what it has
+                self.last_error = str(e)
+                logger.warning("replica sync failed: %s", e)
+            self._wake.wait(interval)
+            self._wake.clear()
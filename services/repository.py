@@ -0,0 +1,865 @@
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+import streamlit as st
+from dotenv import load_dotenv
+from supabase import create_client
+
+from services.postgrest_filters import after_key
+from services.query_log import instrument_client
+from services.replica import Replica
+
+# Loaders are shared by every page and every coach, so results are kept for a
+# few minutes and the number of cached variants per loader is bounded.
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 128
+
+# Columns each view reads. Long free text (TEXT_COLUMNS) is left out and loaded
+# one record at a time; the generated search columns from
+# database/migrations/0003_player_search.sql stay server-side
+PLAYER_COLUMNS = 'id,first_name,last_name,birth_date,email,phone,level,age_group'
+TOURNAMENT_COLUMNS = 'id,name,start_date,end_date,location,type,level,age_group'
+SESSION_OPTION_COLUMNS = 'id,date,time,level'
+SESSION_COLUMNS = 'id,date,time,level,max_participants,notes'
+TRAINING_PLAN_COLUMNS = 'id,player_id,start_date,end_date,focus_area'
+TEXT_COLUMNS = {
+    'players': 'notes',
+    'tournaments': 'description',
+}
+
+PLAYER_LEVELS = ['Beginner', 'Intermediate', 'Advanced', 'Professional']
+AGE_GROUPS = ['U10', 'U12', 'U14', 'U16', 'U18', 'Senior']
+
+# Frame dtypes per table: enums as categoricals, dates parsed once, ids and text as strings
+FRAME_DTYPES = {
+    'players': {
+        'birth_date': 'datetime64[ns]',
+        'level': pd.CategoricalDtype(PLAYER_LEVELS),
+        'age_group': pd.CategoricalDtype(AGE_GROUPS),
+    },
+    'tournaments': {
+        'start_date': 'datetime64[ns]',
+        'end_date': 'datetime64[ns]',
+        'type': pd.CategoricalDtype(['Singles', 'Doubles', 'Mixed']),
+        'level': pd.CategoricalDtype(['Local', 'Regional', 'National', 'International']),
+        'age_group': pd.CategoricalDtype(AGE_GROUPS),
+    },
+    'group_training_sessions': {
+        'date': 'datetime64[ns]',
+        'level': pd.CategoricalDtype(PLAYER_LEVELS),
+        'max_participants': 'Int64',
+    },
+    'training_plans': {
+        'start_date': 'datetime64[ns]',
+        'end_date': 'datetime64[ns]',
+        'focus_area': pd.CategoricalDtype(['Technique', 'Fitness', 'Strategy', 'Mental Game', 'Match Practice']),
+    },
+    'group_session_waitlist': {
+        'position': 'Int64',
+    },
+}
+
+# Player List keyset order and page size
+PLAYER_SORT_KEY = ('last_name', 'first_name', 'id')
+PLAYER_PAGE_SIZE = 50
+
+# Upcoming Group Sessions page size
+SESSION_PAGE_SIZE = 20
+
+# Supabase caps every response at 1000 rows by default
+FETCH_PAGE_SIZE = 1000
+
+# Upper bound on ids per `in_` filter, keeping request URLs well under proxy limits
+IN_FILTER_CHUNK = 200
+TRAINING_SUMMARY_COLUMNS = 'player_id,bucket_start,session_count,total_pse,last_training_date'
+
+# One row per player and dated entry of their schedule; start and end are inclusive
+SCHEDULE_COLUMNS = ['player_id', 'kind', 'item_id', 'label', 'start', 'end']
+
+# Weeks of attendance the session allocator learns slot preferences from
+ALLOCATION_HISTORY_WEEKS = 8
+
+# Cached fetchers registered under the tables they read, keyed by qualified name
+# so that re-executing a page script does not register the same fetcher twice
+_table_caches = defaultdict(dict)
+
+# Loader errors collected on worker threads, which cannot draw st.error themselves
+_error_sink = threading.local()
+
+
+@st.cache_resource(show_spinner=False)
+def get_client():
+    # Check if running on Streamlit Cloud
+    if 'SUPABASE_URL' in st.secrets:
+        supabase_url = st.secrets['SUPABASE_URL']
+        supabase_key = st.secrets['SUPABASE_KEY']
+    else:
+        # Load local environment variables
+        load_dotenv()
+        supabase_url = os.getenv('SUPABASE_URL')
+        supabase_key = os.getenv('SUPABASE_KEY')
+
+    return instrument_client(create_client(supabase_url, supabase_key))
+
+
+@st.cache_resource(show_spinner=False)
+def get_replica():
+    # Opt in with LOCAL_REPLICA=<path of the SQLite file> for courts with poor connectivity
+    path = os.getenv('LOCAL_REPLICA')
+    if not path:
+        return None
+    return Replica(path, lambda: get_client(), on_change=invalidate).start()
+
+
+def read_client():
+    """The local replica once its first sync has completed, Supabase otherwise."""
+    replica = get_replica()
+    if replica is not None and replica.ready:
+        return replica.client
+    return get_client()
+
+
+def mirror_write(table, rows):
+    """Apply rows Supabase returned from a write to the replica, if there is one."""
+    replica = get_replica()
+    if replica is None:
+        return
+    try:
+        replica.apply(table, rows)
+    except Exception as e:
+        # The write itself succeeded; the next delta pull picks the rows up
+        replica.last_error = str(e)
+    # Server-side triggers may have changed other tables, e.g. player_training_summary
+    replica.request_sync()
+
+
+def cached_query(*tables):
+    """Cache a fetcher with the shared TTL and size bound.
+
+    The fetcher is registered under ``tables`` so that :func:`invalidate` clears
+    it whenever one of those tables is written.
+    """
+    def decorator(func):
+        cached = st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)(func)
+        for table in tables:
+            _table_caches[table][f"{func.__module__}.{func.__qualname__}"] = cached
+        return cached
+    return decorator
+
+
+def invalidate(*tables):
+    for table in tables:
+        for cached in _table_caches[table].values():
+            cached.clear()
+
+
+def select_in(table, column, values, columns='*', **eq_filters):
+    # One request per IN_FILTER_CHUNK ids instead of one request per id; a chunk
+    # matching more rows than one response holds is read in range pages
+    values = list(dict.fromkeys(values))
+    rows = []
+    for start in range(0, len(values), IN_FILTER_CHUNK):
+        def build_query(chunk=values[start:start + IN_FILTER_CHUNK]):
+            query = read_client().table(table).select(columns)
+            for eq_column, eq_value in eq_filters.items():
+                query = query.eq(eq_column, eq_value)
+            return order_by(query.in_(column, chunk), ('id',))
+
+        rows.extend(fetch_all(build_query))
+    return pd.DataFrame(rows)
+
+
+def iter_pages(build_query, page_size=FETCH_PAGE_SIZE):
+    """Yield the rows of a query one page at a time, fetched in consecutive range requests.
+
+    ``build_query`` must return a fresh query with a deterministic order on every call.
+    """
+    offset = 0
+    while True:
+        # range() end is exclusive in this client version
+        batch = build_query().range(offset, offset + page_size).execute().data
+        if batch:
+            yield batch
+        if len(batch) < page_size:
+            return
+        offset += len(batch)
+
+
+def fetch_all(build_query, page_size=FETCH_PAGE_SIZE):
+    """All rows of a query; see :func:`iter_pages`."""
+    return [row for page in iter_pages(build_query, page_size) for row in page]
+
+
+def _group_by(df, column):
+    if df.empty:
+        return {}
+    return {key: group for key, group in df.groupby(column, sort=False)}
+
+
+def order_by(query, columns, descending=False):
+    # Multiple .order() calls would send separate order params, so build one
+    direction = '.desc' if descending else ''
+    query.params = query.params.add('order', ','.join(f"{column}{direction}" for column in columns))
+    return query
+
+
+def typed_frame(rows, table, columns) -> pd.DataFrame:
+    """DataFrame of ``rows`` holding ``columns`` of ``table`` in the dtypes of FRAME_DTYPES.
+
+    Columns not listed there are stored as ``string``. ``rows`` may be a list of
+    dicts or a DataFrame.
+    """
+    columns = columns.split(',')
+    df = pd.DataFrame(rows, columns=columns)
+    dtypes = FRAME_DTYPES.get(table, {})
+    for column in columns:
+        dtype = dtypes.get(column, 'string')
+        if dtype == 'datetime64[ns]':
+            df[column] = pd.to_datetime(df[column], format='ISO8601')
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def build_player_index(players_df: pd.DataFrame) -> pd.DataFrame:
+    """Index players by id and add a ``display_name`` column for selectboxes.
+
+    Lookups become ``players_df.loc[player_id]`` instead of matching names row by
+    row. Players sharing a name get their birth date appended so labels stay unique.
+    A lowercase ``search_text`` column backs the offline player search. An
+    empty roster gets the same columns.
+    """
+    players_df = players_df.set_index(players_df['id'].rename(None))
+    display_name = players_df['first_name'].str.cat(players_df['last_name'], sep=' ')
+    shared = display_name.duplicated(keep=False)
+    display_name[shared] = display_name[shared] + ' (' + players_df.loc[shared, 'birth_date'].dt.strftime('%Y-%m-%d') + ')'
+    players_df['display_name'] = display_name
+    players_df['search_text'] = players_df['first_name'].str.cat(
+        players_df[['last_name', 'email', 'phone']], sep=' ', na_rep=''
+    ).str.lower()
+    return players_df
+
+
+@lru_cache(maxsize=None)
+def _empty_player_index() -> pd.DataFrame:
+    return build_player_index(typed_frame([], 'players', PLAYER_COLUMNS))
+
+
+def empty_players() -> pd.DataFrame:
+    """An empty roster with the columns of :func:`build_player_index`."""
+    # Building it takes milliseconds, and pages ask for one on every rerun
+    return _empty_player_index().copy()
+
+
+# Cached fetchers. These raise on failure so that errors are never cached;
+# the public load_* wrappers below turn them into an st.error and an empty frame.
+
+@cached_query('players')
+def _fetch_players() -> pd.DataFrame:
+    def build_query():
+        return order_by(read_client().table('players').select(PLAYER_COLUMNS), PLAYER_SORT_KEY)
+
+    return build_player_index(typed_frame(fetch_all(build_query), 'players', PLAYER_COLUMNS))
+
+
+@cached_query('tournaments')
+def _fetch_tournaments_in_range(start_date, end_date) -> pd.DataFrame:
+    # Tournaments overlapping [start_date, end_date), served by the GiST index
+    # on the date_range column from migration 0002
+    def build_query():
+        query = read_client().table('tournaments')\
+            .select(TOURNAMENT_COLUMNS)\
+            .filter('date_range', 'ov', f"[{start_date},{end_date})")
+        return order_by(query, ('start_date', 'name', 'id'))
+
+    return typed_frame(fetch_all(build_query), 'tournaments', TOURNAMENT_COLUMNS)
+
+
+@cached_query('group_training_sessions')
+def _fetch_group_sessions() -> pd.DataFrame:
+    def build_query():
+        return order_by(read_client().table('group_training_sessions').select(SESSION_OPTION_COLUMNS), ('date', 'time', 'id'))
+
+    return typed_frame(fetch_all(build_query), 'group_training_sessions', SESSION_OPTION_COLUMNS)
+
+
+@cached_query('training_plans')
+def _fetch_training_plans() -> pd.DataFrame:
+    def build_query():
+        return order_by(read_client().table('training_plans').select(TRAINING_PLAN_COLUMNS), ('start_date', 'id'))
+
+    return typed_frame(fetch_all(build_query), 'training_plans', TRAINING_PLAN_COLUMNS)
+
+
+@cached_query(*TEXT_COLUMNS)
+def _fetch_record_text(table, record_id) -> dict:
+    response = read_client().table(table).select(TEXT_COLUMNS[table]).eq('id', record_id).execute()
+    return response.data[0] if response.data else {}
+
+
+def _filter_players(query, level, age_group):
+    if level:
+        query = query.eq('level', level)
+    if age_group:
+        query = query.eq('age_group', age_group)
+    return query
+
+
+def _after_cursor(query, cursor, descending):
+    # Keyset condition for rows strictly after ``cursor`` in PLAYER_SORT_KEY order
+    query.params = query.params.add('and', f"({after_key(PLAYER_SORT_KEY, cursor, descending)})")
+    return query
+
+
+@cached_query('players')
+def _fetch_player_page(level, age_group, after, page_size, descending) -> pd.DataFrame:
+    query = _filter_players(read_client().table('players').select(PLAYER_COLUMNS), level, age_group)
+    if after:
+        query = _after_cursor(query, after, descending)
+    response = order_by(query, PLAYER_SORT_KEY, descending).limit(page_size).execute()
+    return build_player_index(typed_frame(response.data, 'players', PLAYER_COLUMNS))
+
+
+@cached_query('players')
+def _fetch_player_count(level, age_group) -> int:
+    query = _filter_players(read_client().table('players').select('id', count='exact'), level, age_group)
+    # A HEAD request would drop the count in this client version, so fetch one id instead
+    return query.limit(1).execute().count or 0
+
+
+@cached_query('group_training_sessions')
+def _fetch_session_window(start_date, end_date, offset, page_size):
+    query = read_client().table('group_training_sessions')\
+        .select(SESSION_COLUMNS, count='exact')\
+        .gte('date', start_date)\
+        .lte('date', end_date)
+    # range() end is exclusive in this client version
+    response = order_by(query, ('date', 'time', 'id')).range(offset, offset + page_size).execute()
+    return typed_frame(response.data, 'group_training_sessions', SESSION_COLUMNS), response.count or 0
+
+
+@cached_query('training_reports', 'player_pse_scores')
+def _fetch_session_details(session_id):
+    response = read_client().table('training_reports')\
+        .select('*')\
+        .eq('training_type', 'Group')\
+        .eq('session_id', session_id)\
+        .order('report_date')\
+        .execute()
+    reports_df = pd.DataFrame(response.data)
+    pse_df = select_in('player_pse_scores', 'report_id', reports_df['id']) if not reports_df.empty else pd.DataFrame()
+    return reports_df, _group_by(pse_df, 'report_id')
+
+
+@cached_query('group_training_sessions')
+def _fetch_session_slots(start_date, end_date) -> pd.DataFrame:
+    # Only the columns that identify a slot, read in (date, time) index order
+    def build_query():
+        query = read_client().table('group_training_sessions')\
+            .select('date,time,level')\
+            .gte('date', start_date)\
+            .lte('date', end_date)
+        return order_by(query, ('date', 'time', 'id'))
+
+    return pd.DataFrame(fetch_all(build_query), columns=['date', 'time', 'level'])
+
+
+# The summary is written by triggers on player_pse_scores and training_reports
+@cached_query('player_training_summary', 'player_pse_scores', 'training_reports')
+def _fetch_training_summary(bucket, start_date, end_date, player_id=None) -> pd.DataFrame:
+    def build_query():
+        query = read_client().table('player_training_summary')\
+            .select(TRAINING_SUMMARY_COLUMNS)\
+            .eq('bucket', bucket)\
+            .gte('bucket_start', start_date)\
+            .lte('bucket_start', end_date)
+        if player_id:
+            query = query.eq('player_id', player_id)
+        return order_by(query, ('bucket_start', 'player_id'))
+
+    return pd.DataFrame(fetch_all(build_query), columns=TRAINING_SUMMARY_COLUMNS.split(','))
+
+
+@cached_query('tournament_registrations')
+def _fetch_registrations(tournament_ids: tuple) -> dict:
+    reg_df = select_in('tournament_registrations', 'tournament_id', tournament_ids, 'tournament_id,player_id')
+    if reg_df.empty:
+        return {}
+    return reg_df.groupby('tournament_id', sort=False)['player_id'].agg(list).to_dict()
+
+
+@cached_query('tournaments', 'tournament_registrations', 'training_plans', 'group_training_sessions', 'group_training_attendance')
+def _fetch_schedule(start_date, end_date, player_ids=None) -> pd.DataFrame:
+    # Without player_ids every entry is compared with a registered tournament, so
+    # only the sessions held on a tournament day are looked up in the attendance
+    # table. With player_ids the players may be about to register for a
+    # tournament in the window, so all of their plans and sessions in it are read.
+    def tournaments_query():
+        query = read_client().table('tournaments')\
+            .select('id,name,start_date,end_date')\
+            .filter('date_range', 'ov', f"[{start_date},{end_date}]")
+        return order_by(query, ('start_date', 'id'))
+
+    def plans_query():
+        query = read_client().table('training_plans')\
+            .select(TRAINING_PLAN_COLUMNS)\
+            .lte('start_date', str(end_date))\
+            .gte('end_date', str(start_date))
+        return order_by(query, ('start_date', 'id'))
+
+    def sessions_query():
+        query = read_client().table('group_training_sessions')\
+            .select(SESSION_OPTION_COLUMNS)\
+            .gte('date', str(start_date))\
+            .lte('date', str(end_date))
+        return order_by(query, ('date', 'id'))
+
+    tournaments_df = typed_frame(fetch_all(tournaments_query), 'tournaments', 'id,name,start_date,end_date')
+    registrations_df = typed_frame(
+        select_in('tournament_registrations', 'tournament_id', tournaments_df['id'], 'tournament_id,player_id'),
+        'tournament_registrations', 'tournament_id,player_id'
+    )
+    if player_ids is not None:
+        registrations_df = registrations_df[registrations_df['player_id'].isin(player_ids)]
+    registered_df = tournaments_df.merge(registrations_df, left_on='id', right_on='tournament_id')
+    if player_ids is None and registered_df.empty:
+        # Nothing for the other entries to clash with
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+    entries = [pd.DataFrame({
+        'player_id': registered_df['player_id'],
+        'kind': 'tournament',
+        'item_id': registered_df['id'],
+        'label': registered_df['name'],
+        'start': registered_df['start_date'],
+        'end': registered_df['end_date'],
+    })]
+
+    if player_ids is None:
+        plans_df = typed_frame(fetch_all(plans_query), 'training_plans', TRAINING_PLAN_COLUMNS)
+    else:
+        plans_df = typed_frame(
+            select_in('training_plans', 'player_id', player_ids, TRAINING_PLAN_COLUMNS), 'training_plans', TRAINING_PLAN_COLUMNS
+        )
+        plans_df = plans_df[(plans_df['start_date'] <= pd.Timestamp(end_date)) & (plans_df['end_date'] >= pd.Timestamp(start_date))]
+    entries.append(pd.DataFrame({
+        'player_id': plans_df['player_id'],
+        'kind': 'plan',
+        'item_id': plans_df['id'],
+        'label': plans_df['focus_area'].astype('string') + ' plan',
+        'start': plans_df['start_date'],
+        'end': plans_df['end_date'],
+    }))
+
+    sessions_df = typed_frame(fetch_all(sessions_query), 'group_training_sessions', SESSION_OPTION_COLUMNS)
+    if player_ids is None:
+        tournament_days = pd.Series([
+            pd.date_range(start, end) for start, end in zip(registered_df['start_date'], registered_df['end_date'])
+        ], dtype=object).explode().unique()
+        sessions_df = sessions_df[sessions_df['date'].isin(tournament_days)]
+    attendance_df = typed_frame(
+        select_in('group_training_attendance', 'session_id', sessions_df['id'], 'session_id,player_id,attendance_status'),
+        'group_training_attendance', 'session_id,player_id,attendance_status'
+    )
+    attended = attendance_df['attendance_status'].ne('Absent').fillna(True).astype(bool)
+    if player_ids is not None:
+        attended &= attendance_df['player_id'].isin(player_ids)
+    attended_df = sessions_df.merge(attendance_df[attended], left_on='id', right_on='session_id')
+    entries.append(pd.DataFrame({
+        'player_id': attended_df['player_id'],
+        'kind': 'session',
+        'item_id': attended_df['id'],
+        'label': attended_df['level'].astype('string') + ' session ' + attended_df['time'],
+        'start': attended_df['date'],
+        'end': attended_df['date'],
+    }))
+
+    return pd.concat(entries, ignore_index=True).astype({
+        'player_id': 'string', 'kind': 'string', 'item_id': 'string', 'label': 'string',
+        'start': 'datetime64[ns]', 'end': 'datetime64[ns]',
+    })
+
+
+@cached_query('players', 'group_training_sessions', 'group_training_attendance', 'group_session_waitlist')
+def _fetch_allocation_inputs(week_start, week_end) -> dict:
+    history_start = (pd.Timestamp(week_start) - pd.Timedelta(weeks=ALLOCATION_HISTORY_WEEKS)).date()
+    history_end = (pd.Timestamp(week_start) - pd.Timedelta(days=1)).date()
+
+    def sessions_query(start_date, end_date, columns):
+        query = read_client().table('group_training_sessions')\
+            .select(columns)\
+            .gte('date', str(start_date))\
+            .lte('date', str(end_date))
+        return order_by(query, ('date', 'time', 'id'))
+
+    def players_query():
+        return order_by(read_client().table('players').select('id,level'), ('id',))
+
+    sessions_df = typed_frame(
+        fetch_all(lambda: sessions_query(week_start, week_end, 'id,date,time,level,max_participants')),
+        'group_training_sessions', 'id,date,time,level,max_participants'
+    )
+    players_df = typed_frame(fetch_all(players_query), 'players', 'id,level')
+    booked_df = typed_frame(
+        select_in('group_training_attendance', 'session_id', sessions_df['id'], 'session_id,player_id'),
+        'group_training_attendance', 'session_id,player_id'
+    )
+    # Players who left a waitlist keep their row with a NULL position
+    waitlist_df = typed_frame(
+        select_in('group_session_waitlist', 'session_id', sessions_df['id'], 'session_id,player_id,position'),
+        'group_session_waitlist', 'session_id,player_id,position'
+    ).dropna(subset='position')
+
+    # Slots attended in the weeks before, the basis of each player's preferences
+    past_sessions_df = typed_frame(
+        fetch_all(lambda: sessions_query(history_start, history_end, 'id,date,time')),
+        'group_training_sessions', 'id,date,time'
+    )
+    attendance_df = typed_frame(
+        select_in('group_training_attendance', 'session_id', past_sessions_df['id'], 'session_id,player_id,attendance_status'),
+        'group_training_attendance', 'session_id,player_id,attendance_status'
+    )
+    attended = attendance_df['attendance_status'].ne('Absent').fillna(True).astype(bool)
+    history_df = attendance_df[attended].merge(
+        past_sessions_df, left_on='session_id', right_on='id'
+    )[['player_id', 'date', 'time']]
+
+    return {
+        'sessions': sessions_df,
+        'players': players_df,
+        'booked': booked_df,
+        'waitlist': waitlist_df,
+        'history': history_df,
+    }
+
+
+def report_error(message):
+    errors = getattr(_error_sink, 'errors', None)
+    if errors is None:
+        st.error(message)
+    else:
+        errors.append(message)
+
+
+@contextmanager
+def collect_errors():
+    """Collect the loader errors raised on this thread instead of drawing them."""
+    _error_sink.errors = []
+    try:
+        yield _error_sink.errors
+    finally:
+        _error_sink.errors = None
+
+
+def _load(fetch, label, *args):
+    try:
+        return fetch(*args)
+    except Exception as e:
+        report_error(f"Error loading {label}: {str(e)}")
+        return pd.DataFrame()
+
+
+def load_players() -> pd.DataFrame:
+    players_df = _load(_fetch_players, "players")
+    if 'display_name' not in players_df:
+        # Failed loads still return the columns the pages index
+        return empty_players()
+    return players_df
+
+
+def load_tournaments_in_range(start_date, end_date) -> pd.DataFrame:
+    return _load(_fetch_tournaments_in_range, "tournaments", str(start_date), str(end_date))
+
+
+def load_group_sessions() -> pd.DataFrame:
+    return _load(_fetch_group_sessions, "group sessions")
+
+
+def load_training_plans() -> pd.DataFrame:
+    return _load(_fetch_training_plans, "training plans")
+
+
+def load_player_page(level=None, age_group=None, after=None, page_size=PLAYER_PAGE_SIZE, descending=False) -> pd.DataFrame:
+    """One Player List page in (last_name, first_name, id) order.
+
+    ``after`` is the :func:`page_cursor` of the previous page, or ``None`` for the first page.
+    """
+    return _load(_fetch_player_page, "players", level, age_group, after, page_size, descending)
+
+
+def page_cursor(page_df: pd.DataFrame) -> tuple:
+    return tuple(page_df.iloc[-1][list(PLAYER_SORT_KEY)])
+
+
+def count_players(level=None, age_group=None) -> int:
+    try:
+        return _fetch_player_count(level, age_group)
+    except Exception as e:
+        report_error(f"Error counting players: {str(e)}")
+        return 0
+
+
+def load_session_window(start_date, end_date, offset=0, page_size=SESSION_PAGE_SIZE):
+    """Group sessions dated within ``[start_date, end_date]``, ordered by date and time.
+
+    Returns ``(sessions_df, total)`` where ``total`` counts every session in the window.
+    """
+    try:
+        return _fetch_session_window(str(start_date), str(end_date), offset, page_size)
+    except Exception as e:
+        report_error(f"Error loading group sessions: {str(e)}")
+        return pd.DataFrame(), 0
+
+
+def load_session_slots(start_date, end_date):
+    """Date, time and level of every group session dated within ``[start_date, end_date]``.
+
+    Returns ``None`` if the sessions could not be loaded.
+    """
+    try:
+        return _fetch_session_slots(str(start_date), str(end_date))
+    except Exception as e:
+        report_error(f"Error loading group sessions: {str(e)}")
+        return None
+
+
+def load_session_details(session_id):
+    """Training reports of one group session and their PSE scores keyed by report id."""
+    try:
+        return _fetch_session_details(session_id)
+    except Exception as e:
+        report_error(f"Error loading training reports: {str(e)}")
+        return pd.DataFrame(), {}
+
+
+def load_training_summary(bucket, start_date, end_date, player_id=None) -> pd.DataFrame:
+    """Pre-aggregated ``'day'`` or ``'week'`` training buckets starting in the period.
+
+    Each row holds a player's ``session_count``, ``total_pse`` and
+    ``last_training_date`` for one bucket (see migration 0004).
+    """
+    return _load(_fetch_training_summary, "training summary", bucket, str(start_date), str(end_date), player_id)
+
+
+def load_record_text(table, record_id) -> dict:
+    """The long free-text columns (TEXT_COLUMNS) of one player or tournament."""
+    try:
+        return _fetch_record_text(table, record_id)
+    except Exception as e:
+        report_error(f"Error loading {table}: {str(e)}")
+        return {}
+
+
+def load_registrations(tournament_ids) -> dict:
+    """Registered player ids for the given tournaments, keyed by tournament id."""
+    try:
+        return _fetch_registrations(tuple(tournament_ids))
+    except Exception as e:
+        report_error(f"Error loading registrations: {str(e)}")
+        return {}
+
+
+def load_schedule(start_date, end_date, player_ids=None) -> pd.DataFrame:
+    """Every player's tournaments, training plans and attended group sessions that could
+    clash with a tournament between ``start_date`` and ``end_date`` (see SCHEDULE_COLUMNS).
+
+    With ``player_ids``, only those players' entries are loaded, including the plans
+    and sessions that no registered tournament overlaps yet, so that a registration
+    can be checked before it exists.
+    """
+    try:
+        return _fetch_schedule(start_date, end_date, None if player_ids is None else tuple(sorted(set(player_ids))))
+    except Exception as e:
+        report_error(f"Error loading schedule: {str(e)}")
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+
+def load_allocation_inputs(week_start, week_end):
+    """What the session allocator needs for the group sessions dated within ``[week_start, week_end]``.
+
+    A dict of frames: the week's ``sessions``, every player's level in
+    ``players``, the seats already ``booked`` and the current ``waitlist`` of
+    those sessions, and the slots each player attended in the
+    ALLOCATION_HISTORY_WEEKS before as ``history``. Returns ``None`` if they
+    could not be loaded.
+    """
+    try:
+        return _fetch_allocation_inputs(str(week_start), str(week_end))
+    except Exception as e:
+        report_error(f"Error loading allocation data: {str(e)}")
+        return None
+
+
+# Writes. Each one invalidates only the loaders reading the tables it changes.
+
+def save_player(player_data):
+    try:
+        response = get_client().table('players').insert(player_data).execute()
+        mirror_write('players', response.data)
+        invalidate('players')
+        st.success("Player added successfully!")
+        return True
+    except Exception as e:
+        st.error(f"Error saving player: {str(e)}")
+        return False
+
+
+def update_player(player_id, player_data):
+    try:
+        response = get_client().table('players').update(player_data).eq('id', player_id).execute()
+        mirror_write('players', response.data)
+        invalidate('players')
+        st.success("Player updated successfully!")
+        return True
+    except Exception as e:
+        st.error(f"Error updating player: {str(e)}")
+        return False
+
+
+def save_tournament(tournament_data):
+    try:
+        response = get_client().table('tournaments').insert(tournament_data).execute()
+        mirror_write('tournaments', response.data)
+        invalidate('tournaments')
+        st.success("Tournament added successfully!")
+        return True
+    except Exception as e:
+        st.error(f"Error saving tournament: {str(e)}")
+        return False
+
+
+def register_players(tournament_id, player_ids):
+    """Register several players for a tournament in a single upsert.
+
+    Rows that already exist are skipped by the ``UNIQUE(tournament_id, player_id)``
+    constraint instead of failing the batch. Returns ``(registered, already_registered)``
+    lists of player ids, or ``None`` if the request failed.
+    """
+    try:
+        registration_date = datetime.now().isoformat()
+        rows = [
+            {'tournament_id': tournament_id, 'player_id': player_id, 'registration_date': registration_date}
+            for player_id in dict.fromkeys(player_ids)
+        ]
+        response = get_client().table('tournament_registrations')\
+            .upsert(rows, ignore_duplicates=True, on_conflict='tournament_id,player_id')\
+            .execute()
+        mirror_write('tournament_registrations', response.data)
+        invalidate('tournament_registrations')
+        # With ignore-duplicates PostgREST only returns the rows it actually inserted
+        registered = [row['player_id'] for row in response.data]
+        inserted = set(registered)
+        already_registered = [row['player_id'] for row in rows if row['player_id'] not in inserted]
+        return registered, already_registered
+    except Exception as e:
+        st.error(f"Error registering players: {str(e)}")
+        return None
+
+
+def save_training_plan(plan_data):
+    try:
+        response = get_client().table('training_plans').insert(plan_data).execute()
+        mirror_write('training_plans', response.data)
+        invalidate('training_plans')
+        st.success("Training plan saved successfully!")
+        return True
+    except Exception as e:
+        st.error(f"Error saving training plan: {str(e)}")
+        return False
+
+
+def save_group_session(session_data):
+    try:
+        response = get_client().table('group_training_sessions').insert(session_data).execute()
+        mirror_write('group_training_sessions', response.data)
+        invalidate('group_training_sessions')
+        st.success("Group training session added successfully!")
+        return True
+    except Exception as e:
+        st.error(f"Error saving group session: {str(e)}")
+        return False
+
+
+def save_group_sessions(sessions):
+    """Insert several group sessions in one request; returns how many were added, or ``None`` on failure."""
+    try:
+        response = get_client().table('group_training_sessions').insert(sessions).execute()
+        mirror_write('group_training_sessions', response.data)
+        invalidate('group_training_sessions')
+        st.success(f"{len(sessions)} group training sessions added successfully!")
+        return len(sessions)
+    except Exception as e:
+        st.error(f"Error saving group sessions: {str(e)}")
+        return None
+
+
+def submit_training_reports(reports):
+    """Store training reports and their PSE scores in one request and one transaction.
+
+    Each report is a ``training_reports`` row with an optional ``pse_scores`` list
+    of ``{'player_id', 'pse_score'}`` dicts (see migration 0005). Either all of
+    them are stored or none is. Returns the new report ids in input order, or
+    ``None`` on failure.
+    """
+    try:
+        response = get_client().rpc('submit_training_reports', {'reports': reports}).execute()
+        inserted_reports = [result['training_report'] for result in response.data]
+        mirror_write('training_reports', inserted_reports)
+        mirror_write('player_pse_scores', [score for result in response.data for score in result['player_pse_scores']])
+        invalidate('training_reports', 'player_pse_scores')
+        st.success(f"{len(inserted_reports)} training report{'s' if len(inserted_reports) != 1 else ''} saved successfully!")
+        return [report['id'] for report in inserted_reports]
+    except Exception as e:
+        st.error(f"Error saving training reports: {str(e)}")
+        return None
+
+
+def save_allocation(assignments, waitlist, previous_waitlist):
+    """Book the allocator's seats and replace the waitlists of the allocated sessions.
+
+    ``assignments`` holds ``session_id`` and ``player_id`` rows and ``waitlist``
+    adds their ``position``. Both are written as one bulk upsert each: seats
+    somebody booked in the meantime are skipped by ``UNIQUE(session_id, player_id)``,
+    and players of ``previous_waitlist`` who are no longer waiting keep their
+    row with a ``NULL`` position (see migration 0006). Returns the number of new
+    seats, or ``None`` on failure.
+    """
+    try:
+        seat_rows = [
+            {'session_id': session_id, 'player_id': player_id}
+            for session_id, player_id in zip(assignments['session_id'], assignments['player_id'])
+        ]
+        updated_at = datetime.now().isoformat()
+        positions = {
+            (session_id, player_id): int(position)
+            for session_id, player_id, position in zip(waitlist['session_id'], waitlist['player_id'], waitlist['position'])
+        }
+        for key in zip(previous_waitlist['session_id'], previous_waitlist['player_id']):
+            positions.setdefault(key, None)
+        waitlist_rows = [
+            {'session_id': session_id, 'player_id': player_id, 'position': position, 'updated_at': updated_at}
+            for (session_id, player_id), position in positions.items()
+        ]
+
+        booked = []
+        if seat_rows:
+            response = get_client().table('group_training_attendance')\
+                .upsert(seat_rows, ignore_duplicates=True, on_conflict='session_id,player_id')\
+                .execute()
+            booked = response.data
+            mirror_write('group_training_attendance', booked)
+        if waitlist_rows:
+            response = get_client().table('group_session_waitlist')\
+                .upsert(waitlist_rows, on_conflict='session_id,player_id')\
+                .execute()
+            mirror_write('group_session_waitlist', response.data)
+        invalidate('group_training_attendance', 'group_session_waitlist')
+        st.success(f"{len(booked)} seat{'s' if len(booked) != 1 else ''} booked, {len(waitlist)} player{'s' if len(waitlist) != 1 else ''} on waitlists.")
+        return len(booked)
+    except Exception as e:
+        st.error(f"Error saving allocation: {str(e)}")
+        return None
@@ -0,0 +1,95 @@
+import heapq
+
+import pandas as pd
+
+from services.repository import SCHEDULE_COLUMNS
+
+KIND_LABELS = {'tournament': "Tournament", 'plan': "Training plan", 'session': "Group session"}
+
+CONFLICT_COLUMNS = [
+    'player_id',
+    'tournament_id', 'tournament', 'tournament_start', 'tournament_end',
+    'kind', 'item_id', 'label', 'start', 'end',
+    'overlap_start', 'overlap_end',
+]
+CONFLICT_DATE_COLUMNS = ['tournament_start', 'tournament_end', 'start', 'end', 'overlap_start', 'overlap_end']
+
+
+def find_conflicts(schedule: pd.DataFrame) -> pd.DataFrame:
+    """Every overlap between one of a player's tournaments and another entry of theirs.
+
+    ``schedule`` has SCHEDULE_COLUMNS with inclusive ``start`` and ``end``
+    dates. Each player's entries are swept in start order while the entries
+    still running are kept in heaps ordered by end date. That takes
+    O(n log n) plus one step per reported conflict. Plans and sessions are
+    only compared with tournaments, not with each other. The result has
+    CONFLICT_COLUMNS and one row per pair, with the tournament first. Two
+    overlapping tournaments are reported once, the earlier one first.
+    """
+    schedule = schedule.sort_values(['player_id', 'start', 'end'], kind='stable')
+    rows = list(zip(*(schedule[column].to_numpy() for column in SCHEDULE_COLUMNS)))
+
+    pairs = []
+    current_player = None
+    for sequence, row in enumerate(rows):
+        player_id, kind, _, _, start, end = row
+        if player_id != current_player:
+            current_player = player_id
+            # Entries of this player that started earlier, as (end, sequence, row)
+            running_tournaments, running_others = [], []
+        for running in (running_tournaments, running_others):
+            while running and running[0][0] < start:
+                heapq.heappop(running)
+
+        if kind == 'tournament':
+            pairs.extend((other, row) for _, _, other in running_tournaments)
+            pairs.extend((row, other) for _, _, other in running_others)
+            heapq.heappush(running_tournaments, (end, sequence, row))
+        else:
+            pairs.extend((tournament, row) for _, _, tournament in running_tournaments)
+            heapq.heappush(running_others, (end, sequence, row))
+
+    return pd.DataFrame([
+        (
+            tournament[0],
+            tournament[2], tournament[3], tournament[4], tournament[5],
+            other[1], other[2], other[3], other[4], other[5],
+            max(tournament[4], other[4]), min(tournament[5], other[5]),
+        )
+        for tournament, other in pairs
+    ], columns=CONFLICT_COLUMNS).astype({column: 'datetime64[ns]' for column in CONFLICT_DATE_COLUMNS})
+
+
+def registration_conflicts(schedule: pd.DataFrame, tournament, player_ids) -> pd.DataFrame:
+    """The conflicts registering ``player_ids`` for ``tournament`` would create.
+
+    ``tournament`` needs ``id``, ``name``, ``start_date`` and ``end_date``;
+    ``schedule`` must cover its dates and hold every entry of ``player_ids``
+    in them, as ``load_schedule(start, end, player_ids)`` does. Players
+    already registered for it are checked as they are.
+    """
+    registered = schedule[(schedule['kind'] == 'tournament') & (schedule['item_id'] == tournament['id'])]
+    new_player_ids = [player_id for player_id in dict.fromkeys(player_ids) if player_id not in set(registered['player_id'])]
+    candidate = pd.DataFrame({
+        'player_id': pd.Series(new_player_ids, dtype='string'),
+        'kind': 'tournament',
+        'item_id': tournament['id'],
+        'label': tournament['name'],
+        'start': pd.Timestamp(tournament['start_date']),
+        'end': pd.Timestamp(tournament['end_date']),
+    }).astype({'start': schedule['start'].dtype, 'end': schedule['end'].dtype})
+    player_ids = set(player_ids)
+    conflicts = find_conflicts(pd.concat([schedule[schedule['player_id'].isin(player_ids)], candidate], ignore_index=True))
+    involved = (conflicts['tournament_id'] == tournament['id']) | (conflicts['item_id'] == tournament['id'])
+    return conflicts[involved].reset_index(drop=True)
+
+
+def describe_conflicts(conflicts: pd.DataFrame, player_names: pd.Series) -> pd.DataFrame:
+    """Conflicts as a table for display, one row per conflict in player and date order."""
+    return pd.DataFrame({
+        'Player': conflicts['player_id'].map(player_names).fillna('Unknown player'),
+        'Tournament': conflicts['tournament'],
+        'Tournament Dates': conflicts['tournament_start'].dt.strftime('%Y-%m-%d') + ' - ' + conflicts['tournament_end'].dt.strftime('%Y-%m-%d'),
+        'Clashes With': conflicts['kind'].map(KIND_LABELS) + ': ' + conflicts['label'],
+        'Overlap': conflicts['overlap_start'].dt.strftime('%Y-%m-%d') + ' - ' + conflicts['overlap_end'].dt.strftime('%Y-%m-%d'),
+    }).sort_values(['Player', 'Overlap'], kind='stable').reset_index(drop=True)
@@ -0,0 +1,58 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from services.repository import (
+    PLAYER_COLUMNS, build_player_index, cached_query, load_players, read_client, report_error, select_in, typed_frame,
+)
+
+SEARCH_RESULT_LIMIT = 50
+
+# After a failed ranked search, searches use the local fallback this long before retrying
+SEARCH_RETRY_SECONDS = 30
+
+
+@cached_query('players')
+def _search_players_remote(search_term: str, limit: int) -> pd.DataFrame:
+    response = read_client().rpc('search_players', {
+        'search_query': search_term,
+        'result_limit': limit,
+    }).execute()
+    ranked_ids = [row['id'] for row in response.data]
+    players_df = select_in('players', 'id', ranked_ids, PLAYER_COLUMNS)
+    players_df = build_player_index(typed_frame(players_df, 'players', PLAYER_COLUMNS))
+    if players_df.empty:
+        return players_df
+    return players_df.loc[[player_id for player_id in ranked_ids if player_id in players_df.index]]
+
+
+def filter_players_locally(players_df: pd.DataFrame, search_term: str, limit: int = SEARCH_RESULT_LIMIT) -> pd.DataFrame:
+    """Substring match over the precomputed lowercase ``search_text`` column."""
+    if players_df.empty:
+        return players_df
+    matches = players_df['search_text'].str.contains(search_term.lower(), regex=False)
+    return players_df[matches].head(limit)
+
+
+def search_players(search_term: str, limit: int = SEARCH_RESULT_LIMIT) -> pd.DataFrame:
+    """Return up to ``limit`` players matching ``search_term``, best match first.
+
+    Uses the ranked ``search_players`` database function. If it fails (offline,
+    or migration 0003_player_search not applied yet) the error is reported and
+    the search falls back to :func:`filter_players_locally` over the whole
+    cached roster. The ranked search is tried again after SEARCH_RETRY_SECONDS.
+    """
+    search_term = search_term.strip()
+    if time.monotonic() >= st.session_state.get('player_search_retry_at', 0):
+        try:
+            return _search_players_remote(search_term, limit)
+        except Exception as e:
+            st.session_state.player_search_retry_at = time.monotonic() + SEARCH_RETRY_SECONDS
+            st.session_state.player_search_error = str(e)
+
+    report_error(
+        f"Ranked player search is unavailable ({st.session_state.get('player_search_error')}); "
+        "showing substring matches from the full player list instead."
+    )
+    return filter_players_locally(load_players(), search_term, limit)
@@ -0,0 +1,189 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class Allocation(NamedTuple):
+    # (session_id, player_id) seats to add to group_training_attendance
+    assignments: pd.DataFrame
+    # (session_id, player_id, position) for the players left without a seat, 1 = next in line
+    waitlist: pd.DataFrame
+
+
+def slot_preferences(history: pd.DataFrame) -> pd.DataFrame:
+    """Each player's share of past sessions per weekly slot.
+
+    ``history`` has one row per attended session with ``player_id``, ``date``
+    and ``time``. The result has ``player_id``, ``weekday``, ``time`` and
+    ``preference`` between 0 and 1.
+    """
+    if history.empty:
+        return pd.DataFrame(columns=['player_id', 'weekday', 'time', 'preference'])
+    counts = history.assign(weekday=pd.to_datetime(history['date']).dt.weekday)\
+        .groupby(['player_id', 'weekday', 'time'], observed=True)\
+        .size()\
+        .rename('count')\
+        .reset_index()
+    counts['preference'] = counts['count'] / counts.groupby('player_id')['count'].transform('sum')
+    return counts.drop(columns='count')
+
+
+def _without(candidates, pairs):
+    """``candidates`` minus the (session_id, player_id) pairs of ``pairs``."""
+    if pairs.empty:
+        return candidates
+    taken = pd.MultiIndex.from_frame(pairs[['player_id', 'session_id']])
+    return candidates[~pd.MultiIndex.from_frame(candidates[['player_id', 'session_id']]).isin(taken)]
+
+
+def _candidates(players, sessions, existing, preferences, past_sessions):
+    """Every (player, session) pair of the same level, with the player's preference for the slot."""
+    candidates = players[['id', 'level']].rename(columns={'id': 'player_id'}).merge(
+        sessions[['id', 'level', 'weekday', 'time']].rename(columns={'id': 'session_id'}), on='level'
+    )
+    candidates = _without(candidates, existing).merge(preferences, on=['player_id', 'weekday', 'time'], how='left')
+    candidates['preference'] = candidates['preference'].fillna(0.0)
+    # Players with fewer recent sessions go first when a session is contested
+    candidates['past_sessions'] = candidates['player_id'].map(past_sessions).fillna(0)
+    return candidates.drop(columns=['level', 'weekday', 'time'])
+
+
+def _deferred_acceptance(candidates: pd.DataFrame, caps: pd.Series) -> pd.DataFrame:
+    """Seat each player of ``candidates`` in at most one session with no more than ``caps`` players.
+
+    Every unseated player applies to their most preferred session that has
+    not turned them down yet. Each session keeps its best applicants up to its
+    cap and turns the rest down. This repeats until nobody is left to apply,
+    and no player and session then both prefer each other to what they got.
+    Players and sessions are integer codes, so a round is a few array
+    operations over the applicants rather than over every candidate pair.
+    """
+    candidates = candidates.sort_values(['player_id', 'preference', 'session_id'], ascending=[True, False, True])
+    player_codes, _ = pd.factorize(candidates['player_id'])
+    session_codes, session_ids = pd.factorize(candidates['session_id'])
+    session_caps = caps.reindex(session_ids).to_numpy(dtype=float)
+    # Each player's choices are a contiguous block of rows, best first
+    starts = np.flatnonzero(np.r_[True, player_codes[1:] != player_codes[:-1]])
+    choice_counts = np.diff(np.r_[starts, len(player_codes)])
+    # How sessions rank their applicants: preference, then fewer past sessions, then player id
+    session_rank = np.empty(len(candidates), dtype=np.int64)
+    session_rank[np.lexsort((
+        player_codes, candidates['past_sessions'].to_numpy(dtype=float), -candidates['preference'].to_numpy(dtype=float)
+    ))] = np.arange(len(candidates))
+
+    next_choice = np.zeros(len(starts), dtype=np.int64)
+    is_seated = np.zeros(len(starts), dtype=bool)
+    seated = np.empty(0, dtype=np.int64)
+    while True:
+        applying = np.flatnonzero(~is_seated & (next_choice < choice_counts))
+        if not len(applying):
+            return candidates.iloc[np.sort(seated)][['session_id', 'player_id']]
+
+        pool = np.concatenate([seated, starts[applying] + next_choice[applying]])
+        pool = pool[np.lexsort((session_rank[pool], session_codes[pool]))]
+        pool_sessions = session_codes[pool]
+        group_starts = np.flatnonzero(np.r_[True, pool_sessions[1:] != pool_sessions[:-1]])
+        places = np.arange(len(pool)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(pool)]))
+        kept = places < session_caps[pool_sessions]
+        seated = pool[kept]
+        next_choice[player_codes[pool[~kept]]] += 1
+        is_seated[:] = False
+        is_seated[player_codes[seated]] = True
+
+
+def allocate(players, sessions, existing, preferences, past_sessions=None, sessions_per_player=1, waitlisted=None) -> Allocation:
+    """Assign players to the group sessions of their level.
+
+    ``players`` has ``id`` and ``level``. ``sessions`` has ``id``, ``date``,
+    ``time``, ``level`` and ``max_participants``, where a missing capacity
+    means no limit. ``existing`` holds the ``session_id`` and ``player_id``
+    seats that are already taken. Those seats count against the session's
+    capacity and against the player's ``sessions_per_player``.
+    ``preferences`` comes from slot_preferences. ``past_sessions`` maps player
+    ids to a recent session count, used as the tie-break for contested seats.
+    ``waitlisted`` holds the previous ``session_id``, ``player_id`` and
+    ``position`` rows; players still waiting keep their place ahead of
+    newcomers.
+
+    Each round seats every player who still needs a session. It first caps
+    sessions at an even share of the round's players so that the load is
+    spread across a level's sessions, then fills the remaining capacity.
+    Players with no seat left at their level are waitlisted on the session
+    they prefer most.
+    """
+    past_sessions = past_sessions if past_sessions is not None else pd.Series(dtype=float)
+    waitlisted = waitlisted if waitlisted is not None else pd.DataFrame(columns=['session_id', 'player_id', 'position'])
+    players = players.assign(level=players['level'].astype('string'))
+    sessions = sessions.assign(
+        level=sessions['level'].astype('string'),
+        weekday=pd.to_datetime(sessions['date']).dt.weekday,
+    )
+    existing = existing[['session_id', 'player_id']]
+
+    capacity = sessions.set_index('id')['max_participants'].astype(float).fillna(np.inf)
+    remaining = (capacity - existing['session_id'].value_counts().reindex(capacity.index, fill_value=0)).clip(lower=0)
+    needed = (sessions_per_player - existing['player_id'].value_counts().reindex(players['id'], fill_value=0)).clip(lower=0)
+
+    candidates = _candidates(players, sessions, existing, preferences, past_sessions)
+    session_levels = sessions.set_index('id')['level']
+    assigned = []
+    for round_number in range(sessions_per_player):
+        round_candidates = candidates[candidates['player_id'].map(needed).to_numpy() > round_number]
+        if assigned:
+            round_candidates = _without(round_candidates, pd.concat(assigned))
+        if round_candidates.empty:
+            break
+
+        # An even share of the round's players per session of their level
+        round_players = round_candidates.drop_duplicates('player_id').merge(
+            players[['id', 'level']], left_on='player_id', right_on='id'
+        )['level'].value_counts()
+        level_sessions = session_levels[remaining > 0].value_counts()
+        even_share = np.ceil(session_levels.map(round_players).fillna(0) / session_levels.map(level_sessions).fillna(1))
+        first_pass = _deferred_acceptance(round_candidates, np.minimum(remaining, even_share))
+        remaining = remaining - first_pass['session_id'].value_counts().reindex(remaining.index, fill_value=0)
+
+        unseated = round_candidates[~round_candidates['player_id'].isin(first_pass['player_id'])]
+        second_pass = _deferred_acceptance(unseated, remaining)
+        remaining = remaining - second_pass['session_id'].value_counts().reindex(remaining.index, fill_value=0)
+        assigned.extend([first_pass, second_pass])
+
+    assignments = pd.concat(assigned, ignore_index=True) if assigned else pd.DataFrame(columns=['session_id', 'player_id'])
+    seats = assignments['player_id'].value_counts().reindex(needed.index, fill_value=0)
+    still_needed = needed.index[(needed > seats).to_numpy()]
+
+    # Waitlist each player without a full set of seats on their favourite session
+    waiting = _without(candidates[candidates['player_id'].isin(still_needed)], assignments)\
+        .sort_values(['player_id', 'preference', 'session_id'], ascending=[True, False, True])\
+        .drop_duplicates('player_id')\
+        .merge(waitlisted[['session_id', 'player_id', 'position']], on=['session_id', 'player_id'], how='left')\
+        .rename(columns={'position': 'previous_position'})
+    waiting = waiting.sort_values(
+        ['session_id', 'previous_position', 'preference', 'past_sessions', 'player_id'],
+        ascending=[True, True, False, True, True],
+        na_position='last'
+    )
+    waiting['position'] = waiting.groupby('session_id').cumcount() + 1
+    return Allocation(
+        assignments.sort_values(['session_id', 'player_id'], ignore_index=True),
+        waiting[['session_id', 'player_id', 'position']].reset_index(drop=True),
+    )
+
+
+def allocation_summary(sessions, existing, allocation: Allocation) -> pd.DataFrame:
+    """Per-session seats before and after the allocation, and the waitlist length."""
+    counts = pd.DataFrame({
+        'already_booked': existing['session_id'].value_counts(),
+        'new_seats': allocation.assignments['session_id'].value_counts(),
+        'waitlist': allocation.waitlist['session_id'].value_counts(),
+    }).reindex(sessions['id']).fillna(0).astype(int)
+    return pd.DataFrame({
+        'date': pd.to_datetime(sessions['date']).dt.strftime('%Y-%m-%d').to_numpy(),
+        'time': sessions['time'].to_numpy(),
+        'level': sessions['level'].astype('string').to_numpy(),
+        'capacity': sessions['max_participants'].to_numpy(),
+        'already_booked': counts['already_booked'].to_numpy(),
+        'new_seats': counts['new_seats'].to_numpy(),
+        'waitlist': counts['waitlist'].to_numpy(),
+    })
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pandas as pd
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# One weekly slot per template row
+TEMPLATE_COLUMNS = ['level', 'weekday', 'time', 'max_participants', 'notes']
+
+SLOT_KEY = ['date', 'time', 'level']
+
+
+def _time_text(value):
+    # st.data_editor returns datetime.time; files and the database use "HH:MM:SS"
+    if pd.isna(value):
+        return None
+    if isinstance(value, str):
+        return pd.to_datetime(value, format='mixed').strftime('%H:%M:%S')
+    return value.strftime('%H:%M:%S')
+
+
+def expand_occurrences(templates: pd.DataFrame, start_date, end_date, every_weeks=1, excluded_dates=()) -> pd.DataFrame:
+    """Every session the weekly ``templates`` produce from ``start_date`` to ``end_date``.
+
+    Each template row (see TEMPLATE_COLUMNS) repeats on its weekday. With
+    ``every_weeks`` > 1 only every n-th week, counted from the week of
+    ``start_date``, is used. Days in ``excluded_dates`` are skipped. The result
+    has one row per ``(date, time, level)`` in date and time order.
+    """
+    templates = templates.dropna(subset=['level', 'weekday', 'time'])
+    days = pd.date_range(start_date, end_date, freq='D')
+    if templates.empty or days.empty:
+        return pd.DataFrame(columns=[*SLOT_KEY, 'max_participants', 'notes'])
+
+    first_monday = days[0] - pd.Timedelta(days=days[0].weekday())
+    in_week = ((days - first_monday).days // 7) % every_weeks == 0
+    excluded = days.isin(pd.to_datetime(list(excluded_dates)))
+    days = days[in_week & ~excluded]
+
+    calendar = pd.DataFrame({'date': days.strftime('%Y-%m-%d'), 'weekday': days.day_name()})
+    occurrences = templates.assign(time=templates['time'].map(_time_text)).merge(calendar, on='weekday')
+    return occurrences[[*SLOT_KEY, 'max_participants', 'notes']]\
+        .drop_duplicates(SLOT_KEY)\
+        .sort_values(SLOT_KEY, kind='stable')\
+        .reset_index(drop=True)
+
+
+def mark_existing(occurrences: pd.DataFrame, existing: pd.DataFrame) -> pd.Series:
+    """Whether each occurrence's ``(date, time, level)`` slot is already taken by an existing session."""
+    if occurrences.empty or existing.empty:
+        return pd.Series(False, index=occurrences.index)
+    taken = pd.MultiIndex.from_frame(existing[SLOT_KEY].astype(str))
+    return pd.Series(pd.MultiIndex.from_frame(occurrences[SLOT_KEY].astype(str)).isin(taken), index=occurrences.index)
+
+
+def session_rows(occurrences: pd.DataFrame) -> list:
+    """Insert payload for ``group_training_sessions``, one dict per occurrence."""
+    created_at = datetime.now().isoformat()
+    return [
+        {
+            'date': row.date,
+            'time': row.time,
+            'level': row.level,
+            'max_participants': None if pd.isna(row.max_participants) else int(row.max_participants),
+            'notes': None if pd.isna(row.notes) else row.notes,
+            'created_at': created_at,
+        }
+        for row in occurrences.itertuples(index=False)
+    ]
@@ -0,0 +1,583 @@
+"""PostgREST requests answered from SQLite.
+
+:class:`SQLiteClient` keeps the real postgrest-py client and only replaces its
+HTTP transport with a handler that translates PostgREST requests (filters,
+logic trees, order, Range, counts, upserts and RPCs) into SQLite statements.
+The SQLite schema mirrors ``database/database_setup.sql`` and the migrations,
+so the loaders in :mod:`services.repository` run unchanged against it.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+BASE_URL = 'http://sqlite.local/rest/v1'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id TEXT PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    email TEXT UNIQUE,
+    phone TEXT,
+    level TEXT CHECK (level IN ('Beginner', 'Intermediate', 'Advanced', 'Professional')),
+    age_group TEXT CHECK (age_group IN ('U10', 'U12', 'U14', 'U16', 'U18', 'Senior')),
+    notes TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    location TEXT NOT NULL,
+    type TEXT CHECK (type IN ('Singles', 'Doubles', 'Mixed')),
+    level TEXT CHECK (level IN ('Local', 'Regional', 'National', 'International')),
+    age_group TEXT CHECK (age_group IN ('U10', 'U12', 'U14', 'U16', 'U18', 'Senior')),
+    description TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    -- CHECK from migration 0007
+    CONSTRAINT tournaments_end_after_start CHECK (end_date >= start_date)
+);
+
+CREATE TABLE IF NOT EXISTS tournament_registrations (
+    id TEXT PRIMARY KEY,
+    tournament_id TEXT REFERENCES tournaments(id) ON DELETE CASCADE,
+    player_id TEXT REFERENCES players(id) ON DELETE CASCADE,
+    registration_date TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (tournament_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS training_plans (
+    id TEXT PRIMARY KEY,
+    player_id TEXT REFERENCES players(id) ON DELETE CASCADE,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    focus_area TEXT CHECK (focus_area IN ('Technique', 'Fitness', 'Strategy', 'Mental Game', 'Match Practice')),
+    intensity INTEGER CHECK (intensity BETWEEN 1 AND 5),
+    technical_goal TEXT,
+    fitness_goal TEXT,
+    tactical_goal TEXT,
+    schedule TEXT,
+    notes TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS group_training_sessions (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    level TEXT CHECK (level IN ('Beginner', 'Intermediate', 'Advanced', 'Professional')),
+    max_participants INTEGER,
+    notes TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS group_training_attendance (
+    id TEXT PRIMARY KEY,
+    session_id TEXT REFERENCES group_training_sessions(id) ON DELETE CASCADE,
+    player_id TEXT REFERENCES players(id) ON DELETE CASCADE,
+    attendance_status TEXT CHECK (attendance_status IN ('Present', 'Absent', 'Late')),
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (session_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS training_reports (
+    id TEXT PRIMARY KEY,
+    training_type TEXT CHECK (training_type IN ('Group', 'Individual')),
+    session_id TEXT REFERENCES group_training_sessions(id) ON DELETE CASCADE,
+    training_plan_id TEXT REFERENCES training_plans(id) ON DELETE CASCADE,
+    report_date TEXT NOT NULL,
+    performance_rating INTEGER CHECK (performance_rating BETWEEN 1 AND 5),
+    attendance TEXT,
+    achievements TEXT,
+    areas_for_improvement TEXT,
+    coach_notes TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    CHECK (
+        (training_type = 'Group' AND session_id IS NOT NULL AND training_plan_id IS NULL) OR
+        (training_type = 'Individual' AND training_plan_id IS NOT NULL AND session_id IS NULL)
+    )
+);
+
+CREATE TABLE IF NOT EXISTS player_pse_scores (
+    id TEXT PRIMARY KEY,
+    player_id TEXT REFERENCES players(id),
+    report_id TEXT REFERENCES training_reports(id),
+    pse_score INTEGER CHECK (pse_score BETWEEN 1 AND 10),
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS player_training_summary (
+    player_id TEXT REFERENCES players(id) ON DELETE CASCADE,
+    bucket TEXT CHECK (bucket IN ('day', 'week')),
+    bucket_start TEXT NOT NULL,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    total_pse INTEGER NOT NULL DEFAULT 0,
+    last_training_date TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, bucket, bucket_start)
+);
+
+-- Table from migration 0006
+CREATE TABLE IF NOT EXISTS group_session_waitlist (
+    id TEXT PRIMARY KEY,
+    session_id TEXT REFERENCES group_training_sessions(id) ON DELETE CASCADE,
+    player_id TEXT REFERENCES players(id) ON DELETE CASCADE,
+    position INTEGER CHECK (position > 0),
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (session_id, player_id)
+);
+
+-- Indexes from migration 0001
+CREATE INDEX IF NOT EXISTS idx_training_reports_session_id ON training_reports (session_id);
+CREATE INDEX IF NOT EXISTS idx_training_reports_training_plan_id ON training_reports (training_plan_id);
+CREATE INDEX IF NOT EXISTS idx_player_pse_scores_report_id ON player_pse_scores (report_id);
+CREATE INDEX IF NOT EXISTS idx_player_pse_scores_player_id ON player_pse_scores (player_id);
+CREATE INDEX IF NOT EXISTS idx_tournament_registrations_player_id ON tournament_registrations (player_id);
+CREATE INDEX IF NOT EXISTS idx_group_training_attendance_player_id ON group_training_attendance (player_id);
+CREATE INDEX IF NOT EXISTS idx_training_plans_player_id ON training_plans (player_id);
+CREATE INDEX IF NOT EXISTS idx_group_training_sessions_date_time ON group_training_sessions (date, time);
+CREATE INDEX IF NOT EXISTS idx_players_name ON players (last_name, first_name, id);
+CREATE INDEX IF NOT EXISTS idx_tournaments_dates ON tournaments (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_player_training_summary_bucket ON player_training_summary (bucket, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_group_session_waitlist_player_id ON group_session_waitlist (player_id);
+"""
+
+# Only score inserts are mirrored; the app never updates or deletes scores
+SUMMARY_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS update_player_training_summary
+AFTER INSERT ON player_pse_scores
+WHEN NEW.player_id IS NOT NULL
+BEGIN
+    INSERT INTO player_training_summary (player_id, bucket, bucket_start, session_count, total_pse, last_training_date)
+    SELECT NEW.player_id, 'day', r.report_date, 1, coalesce(NEW.pse_score, 0), r.report_date
+    FROM training_reports r WHERE r.id = NEW.report_id
+    ON CONFLICT (player_id, bucket, bucket_start) DO UPDATE SET
+        session_count = session_count + 1,
+        total_pse = total_pse + excluded.total_pse,
+        last_training_date = max(last_training_date, excluded.last_training_date);
+
+    INSERT INTO player_training_summary (player_id, bucket, bucket_start, session_count, total_pse, last_training_date)
+    SELECT NEW.player_id, 'week', date(r.report_date, '-6 days', 'weekday 1'), 1, coalesce(NEW.pse_score, 0), r.report_date
+    FROM training_reports r WHERE r.id = NEW.report_id
+    ON CONFLICT (player_id, bucket, bucket_start) DO UPDATE SET
+        session_count = session_count + 1,
+        total_pse = total_pse + excluded.total_pse,
+        last_training_date = max(last_training_date, excluded.last_training_date);
+END;
+"""
+
+# Same as rebuild_player_training_summary() in migration 0004
+REBUILD_SUMMARY = """
+INSERT INTO player_training_summary (player_id, bucket, bucket_start, session_count, total_pse, last_training_date)
+SELECT p.player_id, b.bucket, b.bucket_start, count(*), sum(coalesce(p.pse_score, 0)), max(r.report_date)
+FROM player_pse_scores p
+JOIN training_reports r ON r.id = p.report_id
+JOIN (
+    SELECT id, 'day' AS bucket, report_date AS bucket_start FROM training_reports
+    UNION ALL
+    SELECT id, 'week', date(report_date, '-6 days', 'weekday 1') FROM training_reports
+) b ON b.id = r.id
+WHERE p.player_id IS NOT NULL
+GROUP BY p.player_id, b.bucket, b.bucket_start
+"""
+
+# Columns holding Postgres arrays or JSONB, stored as JSON text
+JSON_COLUMNS = {
+    'training_reports': {'attendance'},
+    'training_plans': {'schedule'},
+}
+
+# Range columns generated by migrations, as (lower, upper) inclusive bounds
+RANGE_COLUMNS = {
+    'tournaments': {'date_range': ('start_date', 'end_date')},
+}
+
+# Timestamp columns defaulting to now(), filled in ISO format like PostgREST returns them
+TIMESTAMP_DEFAULTS = {'created_at', 'registration_date'}
+
+# Query parameters that are not filters
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+
+class PostgrestError(Exception):
+    def __init__(self, status, message, code=''):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def create_database(path=':memory:', with_triggers=True) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    # LIKE is case-sensitive in Postgres; ilike is handled with lower()
+    conn.execute('PRAGMA case_sensitive_like = ON')
+    conn.executescript(SCHEMA)
+    if with_triggers:
+        conn.executescript(SUMMARY_TRIGGER)
+    return conn
+
+
+def rebuild_training_summary(conn: sqlite3.Connection) -> int:
+    with conn:
+        conn.execute('DELETE FROM player_training_summary')
+        return conn.execute(REBUILD_SUMMARY).rowcount
+
+
+def install_triggers(conn: sqlite3.Connection):
+    conn.executescript(SUMMARY_TRIGGER)
+
+
+def _split_top_level(text):
+    # Split on commas outside double quotes and parentheses
+    parts, current, depth, quoted, escaped = [], [], 0, False, False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == '\\' and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char in '([':
+            depth += 1
+        elif not quoted and char in ')]':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+class _SqlBuilder:
+    """Compiles PostgREST filters for one table into a SQLite WHERE clause."""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.ranges = RANGE_COLUMNS.get(table, {})
+
+    def column(self, name):
+        if name not in self.columns:
+            raise PostgrestError(400, f'column {self.table}.{name} does not exist', '42703')
+        return f'"{name}"'
+
+    def logic(self, operator, body, negate=False):
+        if not (body.startswith('(') and body.endswith(')')):
+            raise PostgrestError(400, f'malformed logic tree: {body}', 'PGRST100')
+        clauses, args = [], []
+        for item in _split_top_level(body[1:-1]):
+            clause, item_args = self.condition(item)
+            clauses.append(clause)
+            args.extend(item_args)
+        sql = '(' + f' {operator.upper()} '.join(clauses) + ')'
+        return (f'NOT {sql}' if negate else sql), args
+
+    def condition(self, text):
+        # ``col.op.value`` or a nested ``and(...)`` / ``or(...)``
+        for prefix, negate in (('not.', True), ('', False)):
+            for operator in ('and', 'or'):
+                if text.startswith(f'{prefix}{operator}('):
+                    return self.logic(operator, text[len(prefix) + len(operator):], negate)
+        name, _, expression = text.partition('.')
+        return self.filter(name, expression)
+
+    def filter(self, name, expression):
+        negate = expression.startswith('not.')
+        if negate:
+            expression = expression[4:]
+        operator, _, value = expression.partition('.')
+        sql, args = self._operator(name, operator, value)
+        return (f'NOT ({sql})' if negate else sql), args
+
+    def _operator(self, name, operator, value):
+        comparisons = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+        if operator in comparisons:
+            return f'{self.column(name)} {comparisons[operator]} ?', [_unquote(value)]
+        if operator == 'like':
+            return f'{self.column(name)} LIKE ?', [_unquote(value).replace('*', '%')]
+        if operator == 'ilike':
+            return f'lower({self.column(name)}) LIKE lower(?)', [_unquote(value).replace('*', '%')]
+        if operator == 'is':
+            checks = {'null': 'IS NULL', 'true': '= 1', 'false': '= 0'}
+            return f'{self.column(name)} {checks[value.lower()]}', []
+        if operator == 'in':
+            values = [_unquote(item) for item in _split_top_level(value[1:-1])] if value != '()' else []
+            return f'{self.column(name)} IN ({",".join("?" * len(values))})', values
+        if operator == 'ov' and name in self.ranges:
+            lower_column, upper_column = self.ranges[name]
+            lower, upper = _split_top_level(value[1:-1])
+            # The generated range is inclusive on both ends
+            upper_check = '<' if value.endswith(')') else '<='
+            lower_check = '>=' if value.startswith('[') else '>'
+            return (
+                f'"{lower_column}" {upper_check} ? AND "{upper_column}" {lower_check} ?',
+                [_unquote(upper), _unquote(lower)],
+            )
+        raise PostgrestError(400, f'operator {operator} on {self.table}.{name} is not supported by the fake', 'PGRST100')
+
+    def where(self, params):
+        clauses, args = [], []
+        for key, value in params.multi_items():
+            if key in RESERVED_PARAMS:
+                continue
+            if key in ('or', 'and', 'not.or', 'not.and'):
+                clause, clause_args = self.logic(key.split('.')[-1], value, key.startswith('not.'))
+            else:
+                clause, clause_args = self.filter(key, value)
+            clauses.append(clause)
+            args.extend(clause_args)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), args
+
+    def order(self, params):
+        terms = []
+        for value in params.get_list('order'):
+            for term in value.split(','):
+                name, *modifiers = term.split('.')
+                direction = 'DESC' if 'desc' in modifiers else 'ASC'
+                # Postgres sorts NULLs last ascending and first descending
+                if 'nullsfirst' in modifiers:
+                    nulls = 'NULLS FIRST'
+                elif 'nullslast' in modifiers:
+                    nulls = 'NULLS LAST'
+                else:
+                    nulls = 'NULLS FIRST' if direction == 'DESC' else 'NULLS LAST'
+                terms.append(f'{self.column(name)} {direction} {nulls}')
+        return ' ORDER BY ' + ', '.join(terms) if terms else ''
+
+    def select(self, params):
+        columns = params.get('select', '*')
+        if columns == '*':
+            return '*'
+        return ', '.join(self.column(name.strip()) for name in columns.split(','))
+
+
+class SQLiteClient:
+    """Supabase client look-alike exposing ``table()``, ``from_()`` and ``rpc()`` over SQLite.
+
+    ``max_rows`` caps every response like PostgREST's db-max-rows; ``None`` means no cap.
+    """
+
+    def __init__(self, conn, max_rows=None):
+        self.conn = conn
+        self.max_rows = max_rows
+        self.lock = threading.RLock()
+        self._columns = {
+            table: {row['name'] for row in self.conn.execute(f'PRAGMA table_info("{table}")')}
+            for (table,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        self.rpcs = {
+            'search_players': self._search_players,
+            'submit_training_reports': self._submit_training_reports,
+        }
+        self.postgrest = SyncPostgrestClient(BASE_URL)
+        self.postgrest.session = httpx.Client(
+            base_url=BASE_URL,
+            headers=self.postgrest.session.headers,
+            transport=httpx.MockTransport(self._handle),
+        )
+
+    def table(self, table_name):
+        return self.postgrest.from_(table_name)
+
+    def from_(self, table_name):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn, params):
+        return self.postgrest.rpc(fn, params)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        return self._respond(request)[0]
+
+    def _respond(self, request):
+        # The response and the number of rows it carries
+        resource = request.url.path.split('/rest/v1/', 1)[1]
+        try:
+            with self.lock:
+                status, data, headers = self._dispatch(request, resource)
+            body = b'' if data is None else json.dumps(data, default=str).encode()
+        except PostgrestError as e:
+            status, headers = e.status, {}
+            body = json.dumps({'message': str(e), 'code': e.code, 'details': None, 'hint': None}).encode()
+            data = None
+        response = httpx.Response(status, content=body, headers={'content-type': 'application/json', **headers})
+        return response, len(data) if isinstance(data, list) else 0
+
+    def _dispatch(self, request, resource):
+        try:
+            return self._dispatch_request(request, resource)
+        except sqlite3.IntegrityError as e:
+            message = str(e)
+            if 'UNIQUE' in message:
+                raise PostgrestError(409, message, '23505')
+            if 'FOREIGN KEY' in message:
+                raise PostgrestError(409, message, '23503')
+            raise PostgrestError(400, message, '23514')
+
+    def _dispatch_request(self, request, resource):
+        body = json.loads(request.content) if request.content else None
+        if resource.startswith('rpc/'):
+            function = self.rpcs.get(resource[4:])
+            if function is None:
+                raise PostgrestError(404, f'Could not find the function {resource[4:]}', 'PGRST202')
+            return 200, function(**(body or {})), {}
+
+        if resource not in self._columns:
+            raise PostgrestError(404, f'relation "{resource}" does not exist', '42P01')
+        sql = _SqlBuilder(resource, self._columns[resource] | set(RANGE_COLUMNS.get(resource, {})))
+        params = request.url.params
+        prefer = request.headers.get('prefer', '')
+        returning = 'return=minimal' not in prefer
+
+        if request.method in ('GET', 'HEAD'):
+            return self._select(request, resource, sql, params, prefer)
+        if request.method == 'POST':
+            rows = self._insert(resource, sql, body, params, prefer)
+            return 201, rows if returning else None, {}
+        if request.method == 'PATCH':
+            where, args = sql.where(params)
+            values = self.encode_row(resource, body)
+            assignments = ', '.join(f'{sql.column(name)} = ?' for name in values)
+            with self.conn:
+                rows = self.conn.execute(
+                    f'UPDATE "{resource}" SET {assignments}{where} RETURNING *', [*values.values(), *args]
+                ).fetchall()
+            return 200, [self._decode(resource, row) for row in rows] if returning else None, {}
+        if request.method == 'DELETE':
+            where, args = sql.where(params)
+            with self.conn:
+                rows = self.conn.execute(f'DELETE FROM "{resource}"{where} RETURNING *', args).fetchall()
+            return 200, [self._decode(resource, row) for row in rows] if returning else None, {}
+        raise PostgrestError(405, f'{request.method} is not supported', 'PGRST117')
+
+    def _select(self, request, resource, sql, params, prefer):
+        where, args = sql.where(params)
+        offset = int(params.get('offset', 0))
+        limit = int(params['limit']) if 'limit' in params else None
+        if 'range' in request.headers:
+            first, last = request.headers['range'].split('-')
+            offset = int(first)
+            limit = int(last) - int(first) + 1 if last else None
+        if self.max_rows is not None:
+            limit = self.max_rows if limit is None else min(limit, self.max_rows)
+
+        rows = self.conn.execute(
+            f'SELECT {sql.select(params)} FROM "{resource}"{where}{sql.order(params)} LIMIT ? OFFSET ?',
+            [*args, -1 if limit is None else limit, offset],
+        ).fetchall()
+        data = [self._decode(resource, row) for row in rows]
+
+        total = '*'
+        if 'count=' in prefer:
+            total = self.conn.execute(f'SELECT count(*) FROM "{resource}"{where}', args).fetchone()[0]
+        content_range = f'{offset}-{offset + len(data) - 1}/{total}' if data else f'*/{total}'
+        return 200, (None if request.method == 'HEAD' else data), {'content-range': content_range}
+
+    def _insert(self, resource, sql, body, params, prefer):
+        rows = body if isinstance(body, list) else [body]
+        conflict = params.get('on_conflict')
+        if 'resolution=ignore-duplicates' in prefer:
+            on_conflict = f' ON CONFLICT ({conflict}) DO NOTHING' if conflict else ' ON CONFLICT DO NOTHING'
+        elif 'resolution=merge-duplicates' in prefer:
+            target = conflict or 'id'
+            on_conflict = f' ON CONFLICT ({target}) DO UPDATE SET ' + '{updates}'
+        else:
+            on_conflict = ''
+
+        with self.conn:
+            return self._insert_rows(resource, sql, rows, on_conflict)
+
+    def _insert_rows(self, resource, sql, rows, on_conflict=''):
+        # Runs in the caller's transaction
+        inserted = []
+        columns = self._columns[resource]
+        now = datetime.now(timezone.utc).isoformat()
+        for row in rows:
+            values = self.encode_row(resource, row)
+            if 'id' in columns:
+                values.setdefault('id', str(uuid.uuid4()))
+            for name in (TIMESTAMP_DEFAULTS & columns) - values.keys():
+                values[name] = now
+            names = ', '.join(sql.column(name) for name in values)
+            # Like PostgREST, a merge only updates the columns of the payload, not generated ids or defaults
+            clause = on_conflict.format(updates=', '.join(f'"{name}" = excluded."{name}"' for name in row))
+            result = self.conn.execute(
+                f'INSERT INTO "{resource}" ({names}) VALUES ({",".join("?" * len(values))}){clause} RETURNING *',
+                list(values.values()),
+            ).fetchone()
+            if result is not None:
+                inserted.append(self._decode(resource, result))
+        return inserted
+
+    def encode_row(self, resource, row):
+        json_columns = JSON_COLUMNS.get(resource, set())
+        return {
+            name: json.dumps(value) if name in json_columns and value is not None else value
+            for name, value in row.items()
+        }
+
+    def _decode(self, resource, row):
+        data = dict(row)
+        for name in JSON_COLUMNS.get(resource, ()):
+            if data.get(name) is not None:
+                data[name] = json.loads(data[name])
+        return data
+
+    def _submit_training_reports(self, reports):
+        # Same as submit_training_reports() in migration 0005: all reports and scores in one transaction
+        reports_sql = _SqlBuilder('training_reports', self._columns['training_reports'])
+        scores_sql = _SqlBuilder('player_pse_scores', self._columns['player_pse_scores'])
+        results = []
+        with self.conn:
+            for report in reports:
+                report = dict(report)
+                scores = report.pop('pse_scores', None) or []
+                [inserted_report] = self._insert_rows('training_reports', reports_sql, [report])
+                results.append({
+                    'training_report': inserted_report,
+                    'player_pse_scores': self._insert_rows('player_pse_scores', scores_sql, [
+                        {'player_id': score['player_id'], 'report_id': inserted_report['id'], 'pse_score': score['pse_score']}
+                        for score in scores
+                    ]),
+                })
+        return results
+
+    def _search_players(self, search_query, result_limit=50):
+        # Substring match ranked by name prefix; approximates the trigram ranking of migration 0003
+        term = search_query.strip().lower()
+        rows = self.conn.execute(
+            """
+            SELECT id,
+                   CASE
+                       WHEN lower(first_name || ' ' || last_name) LIKE ? THEN 1.0
+                       WHEN lower(last_name) LIKE ? THEN 0.9
+                       ELSE 0.5
+                   END AS rank
+            FROM players
+            WHERE lower(first_name || ' ' || last_name || ' ' || coalesce(email, '') || ' ' ||
+                        coalesce(phone, '') || ' ' || coalesce(notes, '')) LIKE ?
+            ORDER BY rank DESC, last_name, first_name, id
+            LIMIT ?
+            """,
+            [f'{term}%', f'{term}%', f'%{term}%', result_limit],
+        ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from services.repository import cached_query
+
+AGE_GROUP_COLORS = {
+    "U10": "#FF9999",  # Light red
+    "U12": "#99FF99",  # Light green
+    "U14": "#9999FF",  # Light blue
+    "U16": "#FFFF99",  # Light yellow
+    "U18": "#FF99FF",  # Light purple
+    "Senior": "#99FFFF"  # Light cyan
+}
+DEFAULT_COLOR = "#DDDDDD"
+
+CALENDAR_VIEWS = {
+    "Month": "dayGridMonth",
+    "Week": "timeGridWeek",
+    "Day": "timeGridDay",
+}
+
+
+def visible_range(view: str, anchor: date):
+    """Dates shown by FullCalendar for ``view`` around ``anchor`` as ``[start, end)``.
+
+    Month grids start on the Sunday on or before the 1st and always show six weeks.
+    """
+    if view == "Month":
+        first = anchor.replace(day=1)
+        start = first - timedelta(days=(first.weekday() + 1) % 7)
+        return start, start + timedelta(weeks=6)
+    if view == "Week":
+        start = anchor - timedelta(days=(anchor.weekday() + 1) % 7)
+        return start, start + timedelta(weeks=1)
+    return anchor, anchor + timedelta(days=1)
+
+
+def shift_anchor(view: str, anchor: date, steps: int) -> date:
+    if view == "Month":
+        month = anchor.month - 1 + steps
+        return date(anchor.year + month // 12, month % 12 + 1, 1)
+    if view == "Week":
+        return anchor + timedelta(weeks=steps)
+    return anchor + timedelta(days=steps)
+
+
+@cached_query()
+def build_calendar_events(tournaments_df: pd.DataFrame) -> list:
+    """FullCalendar event dicts built with column operations.
+
+    Cached on the frame's contents, so revisiting a period reuses its payload.
+    """
+    if tournaments_df.empty:
+        return []
+    colors = tournaments_df['age_group'].astype(object).map(AGE_GROUP_COLORS).fillna(DEFAULT_COLOR)
+    events = pd.DataFrame({
+        'title': tournaments_df['name'].astype(object),
+        'start': tournaments_df['start_date'].dt.strftime('%Y-%m-%d'),
+        'end': tournaments_df['end_date'].dt.strftime('%Y-%m-%d'),
+        'description': 'Type: ' + tournaments_df['type'].astype(str)
+        + '\nLevel: ' + tournaments_df['level'].astype(str)
+        + '\nLocation: ' + tournaments_df['location'].astype(str),
+        'backgroundColor': colors,
+        'borderColor': colors,
+    })
+    return events.to_dict('records')
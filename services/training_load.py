@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# Acute:chronic workload ratio bands used to flag players
+ACWR_LOW = 0.8
+ACWR_HIGH = 1.3
+ACWR_DANGER = 1.5
+
+LOAD_COLUMNS = ['daily_load', 'acute_load', 'chronic_load', 'acwr', 'monotony', 'strain']
+
+
+def _trailing_sum(values: np.ndarray, window: int) -> np.ndarray:
+    # Sum of the last ``window`` days for every day (columns), via cumulative sums
+    cumulative = np.cumsum(values, axis=1)
+    result = cumulative.copy()
+    result[:, window:] -= cumulative[:, :-window]
+    return result
+
+
+def compute_training_load(scores_df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """Daily training load indicators for every player from ``start_date`` to ``end_date``.
+
+    ``scores_df`` needs ``player_id``, ``report_date`` and ``pse_score`` columns; a
+    player's daily load is the sum of their PSE scores on that day. The result is
+    indexed by ``(player_id, date)`` and holds:
+
+    - ``acute_load``: load over the last 7 days
+    - ``chronic_load``: average weekly load over the last 28 days
+    - ``acwr``: acute / chronic, NaN without chronic load
+    - ``monotony``: mean / standard deviation of the last 7 daily loads
+    - ``strain``: acute load x monotony
+
+    All players are computed at once on a players x days matrix. Indicators for
+    the first 27 days only see part of their window, so callers should load
+    history from ``CHRONIC_DAYS - 1`` days before the period they display.
+    """
+    days = pd.date_range(start_date, end_date, freq='D')
+    if scores_df.empty or days.empty:
+        return pd.DataFrame(columns=LOAD_COLUMNS, index=pd.MultiIndex.from_arrays([[], []], names=['player_id', 'date']))
+
+    player_codes, player_ids = pd.factorize(scores_df['player_id'])
+    day_offsets = (pd.to_datetime(scores_df['report_date']) - days[0]).dt.days.to_numpy()
+    in_range = (day_offsets >= 0) & (day_offsets < len(days))
+
+    # Scatter the scores into a dense players x days matrix in one pass
+    cells = player_codes[in_range] * len(days) + day_offsets[in_range]
+    daily = np.bincount(
+        cells,
+        weights=scores_df['pse_score'].to_numpy(dtype=float)[in_range],
+        minlength=len(player_ids) * len(days)
+    ).reshape(len(player_ids), len(days))
+
+    acute = _trailing_sum(daily, ACUTE_DAYS)
+    chronic = _trailing_sum(daily, CHRONIC_DAYS) / (CHRONIC_DAYS / ACUTE_DAYS)
+    mean = acute / ACUTE_DAYS
+    variance = np.clip(_trailing_sum(daily ** 2, ACUTE_DAYS) / ACUTE_DAYS - mean ** 2, 0, None)
+    std = np.sqrt(variance)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acwr = np.where(chronic > 0, acute / chronic, np.nan)
+        monotony = np.where(std > 0, mean / std, np.nan)
+    strain = acute * monotony
+
+    index = pd.MultiIndex.from_product([player_ids, days], names=['player_id', 'date'])
+    return pd.DataFrame({
+        'daily_load': daily.ravel(),
+        'acute_load': acute.ravel(),
+        'chronic_load': chronic.ravel(),
+        'acwr': acwr.ravel(),
+        'monotony': monotony.ravel(),
+        'strain': strain.ravel(),
+    }, index=index)
+
+
+def load_status(acwr: pd.Series) -> pd.Series:
+    """Label each ACWR value with its load band."""
+    labels = np.select(
+        [acwr.isna(), acwr > ACWR_DANGER, acwr > ACWR_HIGH, acwr < ACWR_LOW],
+        ["No chronic load", "High risk", "Elevated", "Low"],
+        default="Optimal"
+    )
+    return pd.Series(labels, index=acwr.index)
@@ -0,0 +1,15 @@
+import pytest
+import streamlit as st
+
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.run import use_client
+
+
+@pytest.fixture
+def client():
+    """An empty SQLite-backed Supabase stand-in serving every services module."""
+    client = FakeSupabase()
+    use_client(client)
+    st.cache_data.clear()
+    st.session_state.clear()
+    return client
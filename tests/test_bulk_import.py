@@ -0,0 +1,22 @@
+import pandas as pd
+
+from services.bulk_import import IMPORT_SPECS, validate_chunk
+
+
+def test_time_columns_accept_only_times():
+    chunk = pd.DataFrame({
+        'date': '2026-01-05',
+        'time': ['18:00', '18:30:15', '2026-01-05', '6pm', '25:00'],
+    })
+    records, errors = validate_chunk(chunk, IMPORT_SPECS['group_training_sessions'], first_row=2)
+
+    assert [(record['row'], record['time']) for record in records] == [(2, '18:00:00'), (3, '18:30:15')]
+    assert list(errors['row']) == [4, 5, 6]
+    assert set(errors['column']) == {'time'}
+
+
+def test_specs_without_choices_validate():
+    chunk = pd.DataFrame({'first_name': ["Ana"], 'last_name': ["Silva"], 'birth_date': ["2010-01-01"]})
+    spec = IMPORT_SPECS['players']._replace(choices=None)
+    records, errors = validate_chunk(chunk, spec, first_row=2)
+    assert len(records) == 1 and errors.empty
@@ -0,0 +1,27 @@
+import threading
+import time
+
+from services.page_data import PREFETCH_WORKERS, load_page_data, prefetch, query, wait_for_prefetch
+
+
+def test_prefetch_backlog_does_not_delay_page_reads(client):
+    release = threading.Event()
+
+    def load(number):
+        # The first reads hold every prefetch worker until released
+        if number < PREFETCH_WORKERS:
+            release.wait(10)
+        return number
+
+    prefetch(*(query(load, number) for number in range(PREFETCH_WORKERS + 1)))
+    started = time.monotonic()
+    try:
+        # One read of the page is new, the other is still queued as a prefetch
+        results = load_page_data(timeout=5, page=query(lambda: 'ready'), queued=query(load, PREFETCH_WORKERS))
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+        wait_for_prefetch()
+
+    assert results == {'page': 'ready', 'queued': PREFETCH_WORKERS}
+    assert elapsed < 1
@@ -0,0 +1,50 @@
+from benchmarks.fake_supabase import MAX_ROWS
+from services.repository import fetch_all, load_group_sessions, load_player_page, order_by, page_cursor, read_client
+
+SESSION_COUNT = 2 * MAX_ROWS + 10
+
+
+def add_sessions(client):
+    client.table('group_training_sessions').insert([
+        {'id': f's{number:05d}', 'date': '2026-01-05', 'time': '18:00:00', 'level': 'Beginner'}
+        for number in range(SESSION_COUNT)
+    ]).execute()
+
+
+def test_fetch_all_reads_past_the_response_cap(client):
+    add_sessions(client)
+
+    def build_query():
+        return order_by(read_client().table('group_training_sessions').select('id'), ('id',))
+
+    assert len(build_query().execute().data) == MAX_ROWS
+    rows = fetch_all(build_query)
+    assert [row['id'] for row in rows] == [f's{number:05d}' for number in range(SESSION_COUNT)]
+
+
+def test_loaders_return_every_row(client):
+    add_sessions(client)
+    assert len(load_group_sessions()) == SESSION_COUNT
+
+
+def test_player_pages_follow_the_sort_key(client):
+    # Tied names and reserved characters exercise every branch of the keyset filter
+    last_names = ['Ng', 'O"Brien, Jr.', 'Smith (B)']
+    client.table('players').insert([
+        {'id': f'p{number:03d}', 'first_name': 'Sam' if number % 2 else 'Alex',
+         'last_name': last_names[number % 3], 'birth_date': '2010-01-01', 'level': 'Beginner'}
+        for number in range(30)
+    ]).execute()
+    expected = sorted(
+        (last_names[number % 3], 'Sam' if number % 2 else 'Alex', f'p{number:03d}') for number in range(30)
+    )
+
+    for descending in (False, True):
+        seen, after = [], None
+        while True:
+            page = load_player_page(after=after, page_size=4, descending=descending)
+            if page.empty:
+                break
+            seen.extend(page['id'])
+            after = page_cursor(page)
+        assert seen == [key[2] for key in sorted(expected, reverse=descending)]
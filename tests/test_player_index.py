@@ -0,0 +1,20 @@
+from services.page_data import load_page_data, query
+from services.repository import PLAYER_COLUMNS, build_player_index, empty_players, typed_frame
+
+INDEX_COLUMNS = {'display_name', 'search_text'}
+
+
+def test_empty_roster_has_index_columns():
+    players_df = build_player_index(typed_frame([], 'players', PLAYER_COLUMNS))
+    assert players_df.empty
+    assert INDEX_COLUMNS <= set(players_df.columns)
+    assert players_df[['id', 'display_name']].empty
+
+
+def test_failed_page_read_returns_indexed_roster(client):
+    def failing_load():
+        raise RuntimeError("network down")
+
+    players_df = load_page_data(players=query(failing_load, empty=empty_players()))['players']
+    assert players_df.empty
+    assert INDEX_COLUMNS <= set(players_df.columns)
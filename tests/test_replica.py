@@ -0,0 +1,18 @@
+from benchmarks.fake_supabase import MAX_ROWS
+from services.replica import Replica
+
+PLAYER_COUNT = MAX_ROWS + 10
+
+
+def test_sync_pulls_past_the_response_cap(client, tmp_path):
+    client.table('players').insert([
+        {'id': f'p{number:05d}', 'first_name': 'Sam', 'last_name': 'Ng', 'birth_date': '2010-01-01', 'level': 'Beginner'}
+        for number in range(PLAYER_COUNT)
+    ]).execute()
+    replica = Replica(tmp_path / 'replica.db', lambda: client)
+
+    assert replica.sync_table('players') == PLAYER_COUNT
+    rows = replica.client.table('players').select('id').order('id').limit(2 * MAX_ROWS).execute().data
+    assert [row['id'] for row in rows] == [f'p{number:05d}' for number in range(PLAYER_COUNT)]
+    # A second pull re-reads the overlap window without changing anything
+    assert replica.sync_table('players') == 0
@@ -0,0 +1,57 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from services.repository import load_schedule
+from services.schedule_conflicts import registration_conflicts
+
+TOURNAMENT = pd.Series({
+    'id': 't1', 'name': "Autumn Open", 'start_date': pd.Timestamp('2026-11-02'), 'end_date': pd.Timestamp('2026-11-05'),
+})
+
+
+@pytest.fixture
+def schedule(client):
+    client.table('players').insert([
+        {'id': player_id, 'first_name': player_id, 'last_name': "Player", 'birth_date': '2010-01-01', 'level': 'Advanced'}
+        for player_id in ('p1', 'p2')
+    ]).execute()
+    client.table('tournaments').insert({
+        'id': 't1', 'name': "Autumn Open", 'start_date': '2026-11-02', 'end_date': '2026-11-05',
+        'location': "Porto", 'type': 'Singles', 'level': 'Regional', 'age_group': 'U16',
+    }).execute()
+    client.table('training_plans').insert({
+        'id': 'plan1', 'player_id': 'p1', 'start_date': '2026-10-20', 'end_date': '2026-11-20', 'focus_area': 'Fitness',
+    }).execute()
+    client.table('group_training_sessions').insert({
+        'id': 's1', 'date': '2026-11-03', 'time': '18:00:00', 'level': 'Advanced', 'max_participants': 8,
+    }).execute()
+    client.table('group_training_attendance').insert({
+        'session_id': 's1', 'player_id': 'p1', 'attendance_status': 'Present',
+    }).execute()
+    return client
+
+
+def conflicts_for(player_ids):
+    schedule = load_schedule(date(2026, 11, 2), date(2026, 11, 5), player_ids)
+    return registration_conflicts(schedule, TOURNAMENT, player_ids)
+
+
+def test_first_registrant_conflicts_are_found(schedule):
+    conflicts = conflicts_for(['p1'])
+    assert sorted(conflicts['item_id']) == ['plan1', 's1']
+    assert set(conflicts['tournament_id']) == {'t1'}
+
+
+def test_conflicts_do_not_depend_on_other_registrations(schedule):
+    before = conflicts_for(['p1'])
+    schedule.table('tournament_registrations').insert({'tournament_id': 't1', 'player_id': 'p2'}).execute()
+    st.cache_data.clear()
+    after = conflicts_for(['p1'])
+    assert sorted(after['item_id']) == sorted(before['item_id']) == ['plan1', 's1']
+
+
+def test_player_without_other_entries_has_no_conflicts(schedule):
+    assert conflicts_for(['p2']).empty
@@ -0,0 +1,39 @@
+from services import search
+
+
+def add_players(client):
+    client.table('players').insert([
+        {'id': 'p1', 'first_name': "Ana", 'last_name': "Silva", 'birth_date': '2010-01-01'},
+        {'id': 'p2', 'first_name': "Bruno", 'last_name': "Costa", 'birth_date': '2011-01-01'},
+    ]).execute()
+
+
+def test_failed_ranked_search_falls_back_and_retries(client, monkeypatch):
+    add_players(client)
+    ranked_search = client.rpcs['search_players']
+    clock = [1000.0]
+    monkeypatch.setattr(search.time, 'monotonic', lambda: clock[0])
+    errors = []
+    monkeypatch.setattr(search, 'report_error', errors.append)
+
+    def unavailable(**params):
+        raise RuntimeError("timeout")
+
+    client.rpcs['search_players'] = unavailable
+    assert list(search.search_players("silva").index) == ['p1']
+    assert len(errors) == 1 and "timeout" in errors[0]
+
+    # Within the retry window the RPC is not called again
+    client.rpcs['search_players'] = ranked_search
+    calls = len(client.requests)
+    assert list(search.search_players("costa").index) == ['p2']
+    assert not any(record.table.startswith('rpc/') for record in client.requests[calls:])
+
+    # Afterwards the ranked search is used again, without an error
+    clock[0] += search.SEARCH_RETRY_SECONDS
+    errors.clear()
+    calls = len(client.requests)
+    assert list(search.search_players("costa").index) == ['p2']
+    assert any(record.table.startswith('rpc/') for record in client.requests[calls:])
+    assert not errors
+